@@ -0,0 +1,64 @@
+"""Arquivo local das páginas de jogos baixadas pelo scraper.
+
+O HTML bruto é gravado comprimido (gzip) e endereçado pelo SHA-256 do
+conteúdo em objects/<2 primeiros hex>/<resto>.html.gz, então páginas
+idênticas ocupam espaço uma única vez. O index.jsonl registra, uma linha
+por download, qual objeto corresponde a cada URL; a última linha de uma
+URL é a versão mais recente. Com isso o catálogo pode ser reconstruído
+a partir do disco (modo reextract) sem baixar as páginas de novo.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+INDEX_FILENAME = "index.jsonl"
+
+
+class PageArchive:
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+
+    def object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], f"{digest[2:]}.html.gz")
+
+    def store(self, url, content):
+        """Grava o HTML de `url` (se ainda não existir) e registra no índice. Retorna o hash."""
+        raw = content.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+        line = json.dumps({"url": url, "sha256": digest, "fetched_at": datetime.now().isoformat()}) + "\n"
+        # Uma única escrita em modo append por linha, para que vários processos possam compartilhar o índice
+        with self.lock, open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(line)
+        return digest
+
+    def load(self, digest):
+        with gzip.open(self.object_path(digest), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def latest(self):
+        """Retorna {url: entrada do índice} com a versão mais recente de cada URL."""
+        entries = {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Linha truncada por um processo interrompido
+                    entries[entry["url"]] = entry
+        except FileNotFoundError:
+            pass
+        return entries
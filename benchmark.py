@@ -0,0 +1,276 @@
+"""Micro-benchmarks dos caminhos críticos do scraper e do validador.
+
+Mede o custo por chamada das funções de parsing/normalização e o custo por
+catálogo (10k, 100k e 1M jogos sintéticos) de deduplicação e agrupamento.
+O script sai com código 1 quando o tempo de um benchmark de catálogo
+cresce mais rápido que o de uma carga linear de referência medida no mesmo
+processo (crescimento superlinear); essa verificação não depende da máquina
+e reprova o CI. Os resultados também são comparados com um baseline salvo
+em BASELINE_JSON, mas tempos absolutos só são comparáveis na mesma máquina:
+o baseline é local, e no CI --report-only só mostra essa comparação.
+
+Uso:
+    python benchmark.py                       # compara com o baseline
+    python benchmark.py --sizes 10000 100000  # catálogos menores
+    python benchmark.py --save-baseline       # grava os resultados atuais
+    python benchmark.py --report-only         # não falha pela comparação com o baseline
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import dedupe
+import records
+import scraper
+import rework_scraper
+
+BASELINE_JSON = "benchmark_baseline.json"
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_THRESHOLD = 1.5  # Falha quando o resultado fica 50% pior que o baseline
+SCALING_SLACK = 2.0      # Tolerância sobre o crescimento da referência linear entre tamanhos
+REFERENCE = "reference.linear"  # Carga linear que mede o efeito de cache e memória de cada tamanho
+PER_CALL_SAMPLES = 10_000
+DUPLICATE_LOOKUPS = 200
+
+BASE_WORDS = [
+    "Dark", "Souls", "Farm", "Simulator", "Space", "Station", "Racing", "Legends",
+    "Shadow", "Quest", "Dungeon", "Tycoon", "Zombie", "Island", "Knight", "City",
+]
+TITLE_SUFFIXES = [
+    "", " Free Download", " v1.2.3", " (v1.0.5 & ALL DLC)", " Build 15623", " (Build 1234)",
+    " Deluxe Edition", " P2P", " GOG", " Repack", " (Multiplayer)", " 0xdeadcode", " TENOKE",
+]
+HOST_LINKS = [
+    "https://1fichier.com/?{id}",
+    "https://datanodes.to/{id}/file.rar",
+    "https://gofile.io/d/{id}",
+    "https://www.mediafire.com/file/{id}/file.rar/file",
+    "https://qiwi.gg/file/{id}-Game",
+    "https://qiwi.gg/folder/{id}",
+    "https://pixeldrain.com/u/{id}",
+]
+NOISE_LINKS = [
+    "https://repack-games.com/category/action-games/",
+    "https://repack-games.com/how-to-install/",
+    "https://discord.gg/repack",
+    "#comments",
+]
+RELATIVE_DATES = ["3 hours ago", "2 days ago", "1 week ago", "5 months ago", "1 year ago", "just now"]
+CATEGORY_URLS = [
+    "https://repack-games.com/category/emulator-games/game",
+    "https://repack-games.com/category/multiplayer-games/game",
+    "https://repack-games.com/category/vr-games/game",
+    "https://repack-games.com/category/action-games/game",
+]
+
+
+def make_title(rng, base_count):
+    base_id = rng.randrange(base_count)
+    words = [BASE_WORDS[(base_id >> shift) % len(BASE_WORDS)] for shift in (0, 4, 8)]
+    return f"{' '.join(words)} {base_id}{rng.choice(TITLE_SUFFIXES)}"
+
+
+def make_catalog(size, seed=1):
+    """Gera um catálogo sintético com ~3 cópias por título, no formato do shisuyssource.json."""
+    rng = random.Random(seed)
+    base_count = max(1, size // 3)
+    start = datetime(2024, 1, 1)
+    games = []
+    for i in range(size):
+        uris = [rng.choice(HOST_LINKS).format(id=f"{i:x}{j}") for j in range(rng.randint(1, 4))]
+        games.append({
+            "title": make_title(rng, base_count),
+            "uris": uris,
+            "fileSize": f"{rng.uniform(0.1, 90):.2f} GB",
+            "uploadDate": (start + timedelta(minutes=rng.randrange(500_000))).isoformat(),
+            "repackLinkSource": f"https://repack-games.com/game-{i}/",
+        })
+    return games
+
+
+def make_page_hrefs(rng):
+    """Simula os hrefs de uma página de detalhes: links de download misturados com navegação."""
+    hrefs = [rng.choice(NOISE_LINKS) for _ in range(40)]
+    hrefs += [rng.choice(HOST_LINKS).format(id=rng.randrange(10 ** 6)) for _ in range(8)]
+    rng.shuffle(hrefs)
+    return hrefs
+
+
+def best_of(func, repeat):
+    """Executa func `repeat` vezes e retorna o menor tempo em segundos."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def per_call(func, inputs, repeat=5):
+    """Tempo médio por chamada (segundos) de func sobre uma lista de argumentos."""
+    def run():
+        for args in inputs:
+            func(*args)
+    return best_of(run, repeat) / len(inputs)
+
+
+def run_per_call_benchmarks():
+    rng = random.Random(7)
+    titles = [(make_title(rng, 5_000),) for _ in range(PER_CALL_SAMPLES)]
+    dates = [(rng.choice(RELATIVE_DATES),) for _ in range(PER_CALL_SAMPLES)]
+    specials = [(make_title(rng, 5_000), rng.choice(CATEGORY_URLS)) for _ in range(PER_CALL_SAMPLES)]
+    pages = [(make_page_hrefs(rng),) for _ in range(PER_CALL_SAMPLES // 10)]
+    sample = [records.GameRecord.from_dict(game) for game in make_catalog(PER_CALL_SAMPLES, seed=3)]
+    raw_games = [(game,) for game in make_catalog(PER_CALL_SAMPLES // 10, seed=5)]
+    pairs = [(sample[i], sample[-i - 1]) for i in range(len(sample) // 2)]
+
+    return {
+        "per_call.dedupe.normalize_title": per_call(dedupe.normalize_title.__wrapped__, titles),
+        "per_call.dedupe.normalize_title_cached": per_call(dedupe.normalize_title, titles),
+        "per_call.scraper.parse_relative_date": per_call(scraper.parse_relative_date, dates),
+        "per_call.scraper.mark_special_categories": per_call(scraper.mark_special_categories, specials),
+        "per_call.scraper.filter_download_links": per_call(scraper.filter_download_links, pages),
+        "per_call.scraper.listing_filter": per_call(scraper.LISTING_FILTER.match,
+                                                    [(url, title) for title, url in specials]),
+        "per_call.rework.decide_game_to_keep": per_call(rework_scraper.decide_game_to_keep, pairs),
+        "per_call.records.from_dict": per_call(records.GameRecord.from_dict, raw_games),
+        "per_call.records.to_dict": per_call(records.GameRecord.to_dict, [(game,) for game in sample]),
+    }
+
+
+def run_catalog_benchmarks(size):
+    games = make_catalog(size)
+    data = {"downloads": games}
+    rng = random.Random(size)
+    # Metade dos lookups acerta um jogo existente, metade é um jogo novo (pior caso)
+    lookups = [games[rng.randrange(size)]["repackLinkSource"] for _ in range(DUPLICATE_LOOKUPS // 2)]
+    lookups += [f"https://repack-games.com/new-game-{i}/" for i in range(DUPLICATE_LOOKUPS // 2)]
+    repeat = 3 if size <= 100_000 else 1
+
+    def find_duplicates():
+        for link in lookups:
+            scraper.find_duplicate_game(data, link)
+
+    def linear_reference():
+        # Um dict de listas por título, como o agrupamento exato, sem nada do código medido
+        index = {}
+        for game in games:
+            index.setdefault(game["title"].lower(), []).append(game)
+
+    return {
+        f"{REFERENCE}[{size}]": best_of(linear_reference, repeat),
+        f"catalog.scraper.find_duplicate_game[{size}]": best_of(find_duplicates, repeat),
+        f"catalog.dedupe.group_games_exact[{size}]": best_of(
+            lambda: dedupe.group_games(games, fuzzy=False), repeat),
+        f"catalog.dedupe.group_games_fuzzy[{size}]": best_of(
+            lambda: dedupe.group_games(games), repeat),
+    }
+
+
+def check_scaling(results, sizes):
+    """Detecta crescimento superlinear comparando o mesmo benchmark entre tamanhos.
+
+    O limite é o crescimento da referência linear entre os mesmos tamanhos
+    (ou a razão dos tamanhos, sem referência) vezes SCALING_SLACK: código
+    linear cresce como a referência, código quadrático cresce N vezes mais.
+    """
+    problems = []
+    ordered = sorted(sizes)
+    names = {key.split("[")[0] for key in results if key.startswith("catalog.")}
+    for name in sorted(names):
+        for small, large in zip(ordered, ordered[1:]):
+            t_small = results.get(f"{name}[{small}]")
+            t_large = results.get(f"{name}[{large}]")
+            if not t_small or not t_large:
+                continue
+            ref_small = results.get(f"{REFERENCE}[{small}]")
+            ref_large = results.get(f"{REFERENCE}[{large}]")
+            growth = t_large / t_small
+            linear = ref_large / ref_small if ref_small and ref_large else large / small
+            allowed = max(linear, large / small) * SCALING_SLACK
+            if growth > allowed:
+                problems.append(f"{name}: {small} -> {large} cresceu {growth:.1f}x (limite {allowed:.1f}x)")
+    return problems
+
+
+def compare_with_baseline(results, baseline, threshold):
+    problems = []
+    for key, value in sorted(results.items()):
+        previous = baseline.get(key)
+        if previous and value > previous * threshold:
+            problems.append(f"{key}: {format_seconds(value)} vs baseline {format_seconds(previous)} "
+                            f"({value / previous:.2f}x)")
+    return problems
+
+
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def load_baseline(filename):
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_results(filename, results):
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, sort_keys=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks do scraper e do validador.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Tamanhos dos catálogos sintéticos.")
+    parser.add_argument("--baseline", default=BASELINE_JSON, help="Arquivo de baseline.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Razão máxima aceita entre o resultado atual e o baseline.")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Grava os resultados atuais como novo baseline.")
+    parser.add_argument("--results-file", help="Grava os resultados atuais neste arquivo (formato do baseline).")
+    parser.add_argument("--report-only", action="store_true",
+                        help="Mostra as regressões em relação ao baseline sem falhar "
+                             "(o crescimento superlinear continua falhando).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_per_call_benchmarks()
+    for size in args.sizes:
+        print(f"Benchmarking catalog with {size} games...")
+        results.update(run_catalog_benchmarks(size))
+
+    for key, value in results.items():
+        print(f"{key:<55} {format_seconds(value)}")
+
+    if args.results_file:
+        save_results(args.results_file, results)
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    scaling = check_scaling(results, args.sizes)
+    for problem in scaling:
+        print(f"[REGRESSION] {problem}")
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"No baseline in {args.baseline}: skipping the baseline comparison")
+    regressions = compare_with_baseline(results, baseline, args.threshold)
+    for problem in regressions:
+        print(f"[{'REPORT' if args.report_only else 'REGRESSION'}] {problem}")
+    return 1 if scaling or (regressions and not args.report_only) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Circuit breakers por host (e para o caminho via Tor) na validação.
+
+Quando um host ou o Tor cai, cada link ainda passaria pelo ciclo completo
+de tentativas do validador (timeouts e backoff) e terminaria gravado como
+inválido, derrubando jogos do catálogo. Os validadores agora levantam
+HostUnavailable para falhas de rede, timeouts e respostas 429/5xx, e cada
+host tem um breaker com três estados:
+
+- closed: tudo passa; com taxa de erro acima de ERROR_RATE nas últimas
+  WINDOW chamadas (e pelo menos MIN_CALLS), abre;
+- open: as chamadas falham na hora com HostUnavailable, sem rede;
+- half_open: passado COOLDOWN, uma chamada de teste por vez; sucesso fecha,
+  erro reabre.
+
+HostUnavailable significa "status desconhecido", nunca "inválido".
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+
+import metrics
+from log_config import get_logger, log_event
+
+WINDOW = 20  # Últimas chamadas consideradas na taxa de erro
+MIN_CALLS = 5  # Chamadas mínimas na janela antes de abrir
+ERROR_RATE = 0.5
+COOLDOWN = 60  # Segundos aberto antes de testar de novo
+HOST_ERROR_STATUSES = frozenset({429, 500, 502, 503, 504, 520, 521, 522, 523, 524})
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+logger = get_logger("circuit_breaker")
+
+
+class HostUnavailable(Exception):
+    """O host (ou o caminho até ele) falhou: o resultado da validação é desconhecido."""
+
+
+def is_host_error(error):
+    """Falhas de rede e timeouts, em oposição a respostas do host."""
+    if isinstance(error, (HostUnavailable, OSError, asyncio.TimeoutError)):
+        return True
+    import httpx
+    return isinstance(error, httpx.TransportError) or type(error).__name__ == "ProxyError"
+
+
+def raise_if_host_error(error):
+    """Chamado no `except` dos validadores: propaga como HostUnavailable o que não é culpa do link."""
+    if isinstance(error, HostUnavailable):
+        raise error
+    if is_host_error(error):
+        raise HostUnavailable(str(error) or type(error).__name__) from error
+
+
+def check_status(status_code):
+    if status_code in HOST_ERROR_STATUSES:
+        raise HostUnavailable(f"Status code {status_code}")
+
+
+class CircuitBreaker:
+    def __init__(self, name, window=WINDOW, min_calls=MIN_CALLS, error_rate=ERROR_RATE, cooldown=COOLDOWN):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self.outcomes = deque(maxlen=window)  # True = sucesso
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.trial = False  # Chamada de teste do half_open em andamento
+
+    def transition(self, state):
+        self.state = state
+        metrics.inc("validator_breaker_transitions_total", breaker=self.name, state=state)
+        log_event(logger, "BREAKER", "Circuit %s is %s", self.name, state,
+                  level=logging.WARNING if state == OPEN else logging.INFO, breaker=self.name, state=state)
+
+    def allow(self):
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            self.transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self.trial:
+                return False
+            self.trial = True
+            return True
+        return self.state == CLOSED
+
+    def record(self, ok):
+        if self.state == HALF_OPEN:
+            self.trial = False
+            if ok:
+                self.outcomes.clear()
+                self.transition(CLOSED)
+            else:
+                self.open()
+            return
+        self.outcomes.append(ok)
+        errors = self.outcomes.count(False)
+        if self.state == CLOSED and len(self.outcomes) >= self.min_calls and \
+                errors / len(self.outcomes) >= self.error_rate:
+            self.open()
+
+    def open(self):
+        self.opened_at = time.monotonic()
+        self.transition(OPEN)
+
+    def release(self):
+        """A chamada foi cancelada sem resultado."""
+        if self.state == HALF_OPEN:
+            self.trial = False
+
+
+BREAKERS = {}
+
+
+def get_breaker(name):
+    breaker = BREAKERS.get(name)
+    if breaker is None:
+        breaker = BREAKERS[name] = CircuitBreaker(name)
+    return breaker
+
+
+async def guarded(name, call):
+    """Executa `call()` pelo breaker `name`.
+
+    Com o circuito aberto levanta HostUnavailable sem chamar nada;
+    HostUnavailable de `call` conta como erro e qualquer resultado como
+    sucesso (um link inválido é uma resposta normal do host).
+    """
+    breaker = get_breaker(name)
+    if not breaker.allow():
+        metrics.inc("validator_breaker_rejections_total", breaker=name)
+        raise HostUnavailable(f"{name} circuit open")
+    try:
+        result = await call()
+    except HostUnavailable:
+        breaker.record(False)
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record(True)
+    return result
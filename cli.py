@@ -0,0 +1,136 @@
+"""Ponto de entrada único das ferramentas.
+
+    python cli.py crawl [opções do scraper.py]
+    python cli.py crawl --validate     (valida cada jogo novo durante o crawl)
+    python cli.py crawl --detect-updates  (atualiza jogos conhecidos cujos sinais mudaram)
+    python cli.py validate [opções do rework_scraper.py]
+    python cli.py publish --target DIR
+    python cli.py stats [--json]
+
+Cada subcomando importa só o módulo de que precisa, e esses módulos
+importam as dependências pesadas (cloudscraper, bs4, httpx, selenium, stem)
+só quando uma função que as usa é chamada. Assim publish e stats, e as
+execuções agendadas curtas, não pagam o custo de carregar o navegador e os
+clientes HTTP. tests/test_imports.py garante que a carga não as puxa.
+"""
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+
+SOURCE_JSON = "shisuyssource.json"
+BLACKLIST_JSON = "blacklist.json"
+VALID_LINKS_JSON = "valid_links.json"
+INVALID_LINKS_JSON = "invalid_links.json"
+MIN_PUBLISH_RATIO = 0.5  # Recusa publicar um catálogo com menos da metade dos jogos do publicado
+
+
+def load_json(filename, default):
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def run_crawl(argv):
+    import scraper
+    scraper.main(argv)
+    return 0
+
+
+def run_validate(argv):
+    import asyncio
+    import rework_scraper
+    asyncio.run(rework_scraper.main(argv))
+    return 0
+
+
+def run_publish(argv):
+    parser = argparse.ArgumentParser(prog="cli.py publish", description="Copia o catálogo para o repositório publicado.")
+    parser.add_argument("--source", default=SOURCE_JSON, help="Catálogo a publicar.")
+    parser.add_argument("--target", required=True, help="Diretório do repositório publicado.")
+    parser.add_argument("--force", action="store_true", help="Publica mesmo se o catálogo encolheu demais.")
+    args = parser.parse_args(argv)
+
+    data = load_json(args.source, None)
+    if not isinstance(data, dict) or not isinstance(data.get("downloads"), list):
+        print(f"[PUBLISH] {args.source} is missing or invalid", file=sys.stderr)
+        return 1
+    broken = [game for game in data["downloads"] if not game.get("title") or not isinstance(game.get("uris"), list)]
+    if broken:
+        print(f"[PUBLISH] {len(broken)} entries without title or uris", file=sys.stderr)
+        return 1
+
+    target_path = os.path.join(args.target, SOURCE_JSON)
+    published = load_json(target_path, {}).get("downloads", [])
+    if not args.force and len(data["downloads"]) < len(published) * MIN_PUBLISH_RATIO:
+        print(f"[PUBLISH] Refusing to replace {len(published)} games with {len(data['downloads'])} "
+              f"(use --force)", file=sys.stderr)
+        return 1
+
+    os.makedirs(args.target, exist_ok=True)
+    tmp_path = f"{target_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    os.replace(tmp_path, target_path)
+    print(f"[PUBLISH] {len(data['downloads'])} games -> {target_path} (was {len(published)})")
+    return 0
+
+
+def catalog_stats(games):
+    import hosts
+    from records import format_size, parse_date, parse_size
+
+    host_counts = Counter()
+    for game in games:
+        for link in game.get("uris", []):
+            handler = hosts.classify(link)
+            host_counts[handler.name if handler else "other"] += 1
+    dates = [game.get("uploadDate") for game in games if game.get("uploadDate")]
+    return {
+        "games": len(games),
+        "games_without_links": sum(1 for game in games if not game.get("uris")),
+        "links_by_host": dict(host_counts.most_common()),
+        "total_size": format_size(sum(parse_size(game.get("fileSize")) for game in games)),
+        "newest_upload": max(dates, key=parse_date) if dates else None,
+    }
+
+
+def run_stats(argv):
+    parser = argparse.ArgumentParser(prog="cli.py stats", description="Resumo do catálogo e dos caches.")
+    parser.add_argument("--source", default=SOURCE_JSON)
+    parser.add_argument("--json", action="store_true", help="Imprime o resumo em JSON.")
+    args = parser.parse_args(argv)
+
+    stats = catalog_stats(load_json(args.source, {}).get("downloads", []))
+    stats["blacklisted"] = len(load_json(BLACKLIST_JSON, {}).get("removed", []))
+    stats["cached_valid_links"] = len(load_json(VALID_LINKS_JSON, {}))
+    stats["cached_invalid_links"] = len(load_json(INVALID_LINKS_JSON, {}))
+    if args.json:
+        print(json.dumps(stats, indent=4))
+    else:
+        for key, value in stats.items():
+            print(f"{key:<22} {value}")
+    return 0
+
+
+COMMANDS = {
+    "crawl": run_crawl,
+    "validate": run_validate,
+    "publish": run_publish,
+    "stats": run_stats,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scraper e validador do Shisuy's source.")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Opções do subcomando (use COMANDO --help).")
+    args = parser.parse_args(argv)
+    return COMMANDS[args.command](args.args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
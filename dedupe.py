@@ -0,0 +1,148 @@
+"""Normalização de títulos e agrupamento de jogos duplicados.
+
+`normalize_title` é o normalizador único usado pelo scraper e pelo
+validador: as expressões são compiladas uma vez e o resultado é memoizado,
+já que o mesmo título aparece várias vezes no catálogo.
+
+`DuplicateIndex` agrupa títulos quase iguais sem comparar todos os pares:
+a similaridade é o Jaccard dos trigramas de caracteres, e cada título novo
+só é comparado com os títulos que contêm algum dos seus trigramas mais
+raros (prefix filtering sobre os próprios trigramas, então nenhum par
+acima do limiar é perdido). Títulos com números ou marcadores diferentes
+(sequências, versões VR/multiplayer) nunca são unidos.
+"""
+import math
+import re
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
+
+SIMILARITY_THRESHOLD = 0.8  # Jaccard mínimo entre os trigramas de dois títulos
+
+# Parênteses com informação de versão/build: "(v1.2.3 & ALL DLC)", "(Build 123)"
+VERSION_IN_PARENS = re.compile(
+    r"\s*\([^)]*(?:v\d+(?:\.\d+){1,}|Build \d+|R\d+\.\d+|Ch\.\s*\d+\s*v\d+(?:\.\d+)?|"
+    r"Executive Edition Free Download)[^)]*\)", re.IGNORECASE)
+# Versões, builds e tags de release fora de parênteses
+RELEASE_TAGS = re.compile(
+    r"\b(?:free download|v\d+(?:\.\d+)*[a-z0-9\-]*|build \d+|p2p|gog|repack|flt|tenoke|"
+    r"(?:digital |deluxe |ultimate |gold |goty |complete |definitive |premium |standard |"
+    r"enhanced |anniversary |special |collector['’]?s )*edition\b.*)", re.IGNORECASE)
+APOSTROPHES = re.compile(r"['’]")  # Removidos sem virar espaço: "Baldur's" == "Baldurs"
+PUNCTUATION = re.compile(r"[^\w]+")
+NUMBER_TOKENS = re.compile(r"^(?:\d+|i{1,3}|iv|vi{0,3}|ix|x)$")
+MARKER_TOKENS = frozenset({"multiplayer", "vr", "emulator", "0xdeadcode", "0xdeadc0de"})
+
+
+@lru_cache(maxsize=131072)
+def normalize_title(title):
+    """Chave de agrupamento de um título: minúscula, sem versão, tags de release nem pontuação."""
+    title = VERSION_IN_PARENS.sub("", title)
+    title = RELEASE_TAGS.sub(" ", title)
+    return " ".join(PUNCTUATION.sub(" ", APOSTROPHES.sub("", title.lower())).split())
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def signature(tokens):
+    """Números e marcadores de um título; precisam ser idênticos para unir dois títulos."""
+    return frozenset(token for token in tokens if token in MARKER_TOKENS or NUMBER_TOKENS.match(token))
+
+
+class DuplicateIndex:
+    """Índice incremental (union-find) de grupos de títulos quase duplicados."""
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD, fuzzy=True):
+        self.threshold = threshold
+        self.fuzzy = fuzzy
+        self.parent = {}
+        self.items = defaultdict(list)
+        self.members = {}  # raiz -> chaves do grupo
+        self.postings = defaultdict(lambda: defaultdict(list))  # assinatura -> trigrama -> chaves
+        self.features = {}
+
+    def find(self, key):
+        root = key
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[key] != root:  # Compressão de caminho
+            self.parent[key], key = root, self.parent[key]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # A menor chave vira a raiz, para o nome do grupo não depender da ordem de inserção
+            if root_b < root_a:
+                root_a, root_b = root_b, root_a
+            self.parent[root_b] = root_a
+            self.members[root_a].extend(self.members.pop(root_b))
+        return root_a
+
+    def add(self, title, item):
+        """Adiciona `item` com o título dado e retorna a chave do grupo em que ele caiu."""
+        key = normalize_title(title)
+        self.items[key].append(item)
+        if key not in self.parent:
+            self.parent[key] = key
+            self.members[key] = [key]
+            if self.fuzzy and key:
+                self.link_similar(key)
+        return self.find(key)
+
+    def link_similar(self, key):
+        grams = trigrams(key)
+        sig = signature(key.split())
+        self.features[key] = grams
+
+        # Prefix filtering: Jaccard(x, y) >= t implica |x & y| >= t|x|, então y contém
+        # pelo menos um de quaisquer |x| - ceil(t|x|) + 1 trigramas de x. Como cada
+        # título é indexado por todos os seus trigramas, basta olhar os mais raros. As
+        # listas são separadas por assinatura, que precisa ser igual para unir.
+        by_gram = self.postings[sig]
+        postings = [by_gram[gram] for gram in grams]
+        postings.sort(key=len)
+        prefix_length = len(grams) - math.ceil(self.threshold * len(grams) - 1e-9) + 1
+        candidates = {}
+        for posting in postings[:prefix_length]:
+            candidates.update(dict.fromkeys(posting))
+        for posting in postings:
+            posting.append(key)
+
+        for other in candidates:
+            other_grams = self.features[other]
+            if self.find(other) == self.find(key):
+                continue
+            smaller, larger = sorted((len(grams), len(other_grams)))
+            if smaller < self.threshold * larger:
+                continue  # Nem com sobreposição total o Jaccard chegaria ao limiar
+            shared = len(grams & other_grams)
+            if shared / (len(grams) + len(other_grams) - shared) >= self.threshold:
+                self.union(key, other)
+
+    def group(self, key):
+        """Itens do grupo de `key`, sem recalcular os demais grupos."""
+        return [item for member in self.members[self.find(key)] for item in self.items[member]]
+
+    def remove(self, title, item):
+        """Tira `item` do índice; a chave do título continua no grupo."""
+        items = self.items[normalize_title(title)]
+        items[:] = [other for other in items if other is not item]
+
+    def groups(self):
+        """Retorna {chave do grupo: itens}, com os itens na ordem de inserção de cada chave."""
+        grouped = {}
+        for key, items in self.items.items():
+            grouped.setdefault(self.find(key), []).extend(items)
+        return grouped
+
+
+def group_games(games, fuzzy=True, get_title=itemgetter("title")):
+    """Agrupa os jogos do catálogo por título (quase) igual."""
+    index = DuplicateIndex(fuzzy=fuzzy)
+    for game in games:
+        index.add(get_title(game), game)
+    return index.groups()
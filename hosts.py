@@ -0,0 +1,117 @@
+"""Registro dos hosts de download suportados.
+
+Cada host declara, em um só lugar, o que o scraper e o validador precisam
+saber sobre ele: prioridade entre os links de uma página, padrão extra que
+o link precisa ter para ser extraído, função de validação (registrada pelo
+validador), quantas validações simultâneas ele aguenta e se aceita
+consultas em lote. A busca é feita pelo netloc do link em um dict, uma vez
+por link, em vez de cadeias de `"host" in link`.
+"""
+import asyncio
+import re
+from functools import lru_cache
+
+DEFAULT_CONCURRENCY = 8
+
+
+class HostHandler:
+    __slots__ = ("name", "domains", "priority", "pattern", "validator", "probe", "concurrency", "batching",
+                 "proxied", "semaphore")
+
+    def __init__(self, name, domains, priority, pattern=None, concurrency=DEFAULT_CONCURRENCY, batching=False,
+                 proxied=True):
+        self.name = name
+        self.domains = domains
+        self.priority = priority  # Menor = preferido na hora de escolher os links de uma página
+        self.pattern = re.compile(pattern) if pattern else None
+        self.validator = None  # async (link, client) -> (válido, tamanho)
+        self.probe = None  # Versão barata do validador; retorna None quando não consegue decidir
+        self.concurrency = concurrency
+        self.batching = batching  # A API do host aceita vários arquivos por requisição
+        self.proxied = proxied  # O validador usa o cliente recebido, então pode sair por um proxy (--proxies)
+        self.semaphore = None
+
+    def accepts(self, link):
+        """Se o link deve ser extraído de uma página (além de ser deste host)."""
+        return self.pattern is None or self.pattern.search(link) is not None
+
+    def limiter(self):
+        """Semáforo que limita as validações simultâneas neste host (criado no loop em uso)."""
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+        return self.semaphore
+
+
+HANDLERS = {}
+DOMAINS = {}
+HOST_CACHE = {}  # netloc -> HostHandler ou None
+MAX_HOST_CACHE = 4096
+
+
+def register(name, domains, priority, **options):
+    handler = HostHandler(name, domains, priority, **options)
+    HANDLERS[name] = handler
+    for domain in domains:
+        DOMAINS[domain] = handler
+    HOST_CACHE.clear()
+    download_handler.cache_clear()
+    return handler
+
+
+def set_validator(name, validator, probe=None):
+    HANDLERS[name].validator = validator
+    HANDLERS[name].probe = probe
+
+
+def handler_for_netloc(netloc):
+    """HostHandler de um netloc, inclusive de subdomínios (download1.mediafire.com)."""
+    try:
+        return HOST_CACHE[netloc]
+    except KeyError:
+        handler = None
+        domain = re.split(r"[?#]", netloc, 1)[0].rpartition("@")[2].partition(":")[0].lower()
+        while domain and handler is None:
+            handler = DOMAINS.get(domain)
+            domain = domain.partition(".")[2]
+        if len(HOST_CACHE) < MAX_HOST_CACHE:
+            HOST_CACHE[netloc] = handler
+    return handler
+
+
+def classify(link):
+    """Retorna o HostHandler do link ou None se o host não é suportado.
+
+    Operações de string em vez de urlsplit: é chamado para cada href das páginas.
+    """
+    _, separator, rest = link.partition("://")
+    if not separator:
+        return None
+    return handler_for_netloc(rest.split("/", 1)[0])
+
+
+@lru_cache(maxsize=65536)
+def download_handler(href):
+    """HostHandler de um href de página se ele é um link de download extraível, senão None.
+
+    Memoizado: os links de navegação se repetem em todas as páginas.
+    """
+    handler = classify(href)
+    return handler if handler is not None and handler.accepts(href) else None
+
+
+def select_download_links(hrefs):
+    """Um link por host suportado (o último da página), ordenados pela prioridade do host."""
+    chosen = {}
+    for href in hrefs:
+        handler = download_handler(href)
+        if handler is not None:
+            chosen[handler] = href
+    return [chosen[handler] for handler in sorted(chosen, key=lambda handler: handler.priority)]
+
+
+register("1fichier", ("1fichier.com",), 0)
+register("datanodes", ("datanodes.to",), 1)
+register("gofile", ("gofile.io",), 2, concurrency=4, proxied=False)  # Validado via Tor
+register("mediafire", ("mediafire.com",), 3, concurrency=3, proxied=False)  # Selenium: um WebDriver do pool por validação
+register("qiwi", ("qiwi.gg",), 4, pattern=r"^(?!.*/folder/).*/file/")
+register("pixeldrain", ("pixeldrain.com",), 5, batching=True)  # /api/file/<id1>,<id2>/info
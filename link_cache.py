@@ -0,0 +1,97 @@
+"""Cache de validação de links, vivo em memória durante a execução.
+
+Antes, cada jogo carregava um retrato dos arquivos valid_links.json e
+invalid_links.json e gravava esse retrato (mais um link) a cada resultado,
+então tasks concorrentes sobrescreviam os resultados umas das outras e um
+link repetido em vários grupos era validado várias vezes. Aqui há um único
+dicionário por execução: o resultado entra no cache assim que sai, quem
+usa o cache grava os arquivos periodicamente (`dirty`), e pedidos
+simultâneos para o mesmo link (normalizado) compartilham uma única
+validação. Links cujo host estava fora do ar (HostUnavailable) ficam como
+desconhecidos por UNKNOWN_TTL segundos, só em memória.
+"""
+import asyncio
+import time
+import metrics
+from circuit_breaker import HostUnavailable
+from urllib.parse import urlsplit, urlunsplit
+
+UNKNOWN_TTL = 300  # Segundos até um link de status desconhecido ser tentado de novo
+
+
+def normalize_link(link):
+    """Chave do cache: esquema e host em minúsculas, sem fragmento nem espaços/barra final."""
+    try:
+        parts = urlsplit(link.strip())
+    except ValueError:
+        return link
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/") or "/",
+                       parts.query, ""))
+
+
+class LinkCache:
+    def __init__(self, valid_links, invalid_links):
+        self.valid = {normalize_link(link): size for link, size in valid_links.items()}
+        self.invalid = {normalize_link(link): size for link, size in invalid_links.items()}
+        self.unknown = {}  # chave -> quando o status desconhecido expira (time.monotonic)
+        self.in_flight = {}  # chave -> [task, número de interessados]
+        self.dirty = False  # Há resultados ainda não gravados em disco
+
+    def lookup(self, link):
+        """Retorna (True, tamanho), (False, ""), (None, "") se o status é desconhecido
+        ou None se o link ainda não foi validado."""
+        key = normalize_link(link)
+        if key in self.valid:
+            return True, self.valid[key]
+        if key in self.invalid:
+            return False, ""
+        expires = self.unknown.get(key)
+        if expires is not None:
+            if expires > time.monotonic():
+                return None, ""
+            del self.unknown[key]
+        return None
+
+    def record(self, link, is_valid, file_size):
+        key = normalize_link(link)
+        self.unknown.pop(key, None)
+        if is_valid:
+            self.valid[key] = file_size
+            self.invalid.pop(key, None)
+        else:
+            self.invalid[key] = ""
+        self.dirty = True
+
+    async def validate(self, link, start):
+        """Valida o link uma única vez, mesmo com vários pedidos simultâneos.
+
+        `start()` cria a corrotina de validação; só o primeiro pedido a
+        chama. A validação é cancelada quando todos os interessados desistem
+        (por exemplo, validação especulativa cancelada).
+        """
+        key = normalize_link(link)
+        flight = self.in_flight.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(start())
+            flight = self.in_flight[key] = [task, 0]
+            task.add_done_callback(lambda done: self.finish(link, key, done))
+        else:
+            metrics.inc("validator_links_total", result="coalesced")
+        flight[1] += 1
+        try:
+            return await asyncio.shield(flight[0])
+        finally:
+            flight[1] -= 1
+            if flight[1] == 0 and not flight[0].done():
+                flight[0].cancel()
+
+    def finish(self, link, key, task):
+        self.in_flight.pop(key, None)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is None:
+            is_valid, file_size = task.result()
+            self.record(link, is_valid, file_size)
+        elif isinstance(error, HostUnavailable):
+            self.unknown[key] = time.monotonic() + UNKNOWN_TTL
@@ -0,0 +1,213 @@
+"""Logs do scraper e do validador.
+
+Os eventos por item (jogo novo, link validado, progresso...) passam por um
+filtro de amostragem e são contados; a cada intervalo é emitida uma linha de
+resumo com os totais. A escrita acontece em uma thread separada
+(QueueHandler/QueueListener) com buffer, para que o loop de eventos nunca
+bloqueie no stdout. Cores só são usadas quando a saída é um terminal, e o
+modo JSON lines gera um objeto por linha para análise posterior.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from datetime import datetime
+
+LOGGER_NAME = "shisuy"
+
+# Eventos repetitivos que são amostrados (os demais sempre são emitidos)
+SAMPLED_EVENTS = {
+    "SKIPPED", "IGNORED", "CACHED_VALID", "CACHED_INVALID", "VALID_LINK",
+    "INVALID_LINK", "LINK_PROGRESS", "GAME_VALIDATED", "PROGRESS",
+}
+DEFAULT_SAMPLE_RATE = 100      # Emite 1 a cada N eventos amostrados
+DEFAULT_SUMMARY_INTERVAL = 30  # Segundos entre as linhas de resumo
+BUFFER_CAPACITY = 500          # Registros acumulados antes de escrever no stdout
+FLUSH_INTERVAL = 5             # Segundos máximos que um registro fica no buffer sem resumo
+
+EVENT_COLORS = {
+    "NEW": "GREEN", "VALID_LINK": "GREEN", "CACHED_VALID": "GREEN",
+    "UPDATED": "YELLOW", "RETRY": "YELLOW",
+    "IGNORED": "CYAN", "SKIPPED": "CYAN", "PROGRESS": "CYAN", "LINK_PROGRESS": "CYAN",
+    "NO_LINKS": "RED", "INVALID_LINK": "RED", "CACHED_INVALID": "RED",
+    "GAME_VALIDATED": "BLUE", "TOR": "BLUE", "SUMMARY": "MAGENTA",
+}
+LEVEL_COLORS = {logging.WARNING: "YELLOW", logging.ERROR: "RED", logging.CRITICAL: "RED"}
+
+
+def get_logger(name):
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def log_event(logger, event, message, *args, level=logging.INFO, **fields):
+    """Registra um evento nomeado; `fields` vão para o JSON e para os contadores."""
+    logger.log(level, message, *args, extra={"event": event, "fields": fields})
+
+
+class SamplingFilter(logging.Filter):
+    """Conta todos os eventos e deixa passar só uma amostra dos repetitivos."""
+
+    def __init__(self, sample_rate):
+        super().__init__()
+        self.sample_rate = max(1, sample_rate)
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        event = getattr(record, "event", None)
+        if event is None or event == "SUMMARY":
+            return True
+        with self.lock:
+            count = self.counts.get(event, 0) + 1
+            self.counts[event] = count
+        if event not in SAMPLED_EVENTS or record.levelno > logging.INFO:
+            return True
+        return (count - 1) % self.sample_rate == 0
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.counts)
+
+
+class ColorFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(message)s")
+        from colorama import Fore, init
+        init()
+        self.fore = Fore
+
+    def format(self, record):
+        message = super().format(record)
+        color = EVENT_COLORS.get(getattr(record, "event", None)) or LEVEL_COLORS.get(record.levelno)
+        if color:
+            return f"{getattr(self.fore, color)}{message}{self.fore.RESET}"
+        return message
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SummaryThread(threading.Thread):
+    """Emite periodicamente os contadores de eventos e descarrega o buffer."""
+
+    def __init__(self, sampling, buffer, interval):
+        super().__init__(name="log-summary", daemon=True)
+        self.sampling = sampling
+        self.buffer = buffer
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.last_counts = {}
+
+    def run(self):
+        while not self.stopped.wait(self.interval or FLUSH_INTERVAL):
+            self.emit_summary()
+            self.buffer.flush()
+
+    def emit_summary(self):
+        if not self.interval:
+            return
+        counts = self.sampling.snapshot()
+        delta = {event: count - self.last_counts.get(event, 0) for event, count in counts.items()
+                 if count != self.last_counts.get(event, 0)}
+        self.last_counts = counts
+        if delta:
+            text = ", ".join(f"{event}={count}" for event, count in sorted(delta.items()))
+            log_event(logging.getLogger(LOGGER_NAME), "SUMMARY", "[SUMMARY] Last %ss: %s",
+                      self.interval, text, **{f"count_{event.lower()}": count for event, count in delta.items()})
+
+    def stop(self):
+        self.stopped.set()
+
+
+_listener = None
+_summary_thread = None
+_fallback_handler = None  # Escrita síncrona usada depois de shutdown_logging
+
+
+def setup_logging(level="INFO", json_lines=False, sample_rate=DEFAULT_SAMPLE_RATE,
+                  summary_interval=DEFAULT_SUMMARY_INTERVAL, stream=None):
+    """Configura o logger raiz das ferramentas; pode ser chamada mais de uma vez."""
+    global _listener, _summary_thread, _fallback_handler
+    shutdown_logging()
+    stream = stream or sys.stdout
+
+    if json_lines:
+        formatter = JsonFormatter()
+    elif stream.isatty():
+        formatter = ColorFormatter()
+    else:
+        formatter = logging.Formatter("%(message)s")
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(formatter)
+    buffer = logging.handlers.MemoryHandler(BUFFER_CAPACITY, flushLevel=logging.WARNING, target=stream_handler)
+
+    sampling = SamplingFilter(sample_rate)
+    queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(sampling)
+    _fallback_handler = logging.StreamHandler(stream)
+    _fallback_handler.setFormatter(formatter)
+    _fallback_handler.addFilter(sampling)
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.handlers[:] = [queue_handler]
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, buffer)
+    _listener.start()
+    _summary_thread = SummaryThread(sampling, buffer, max(0, summary_interval or 0))
+    _summary_thread.start()
+    return logger
+
+
+def shutdown_logging():
+    """Emite o último resumo e descarrega tudo que ainda está no buffer.
+
+    Depois disso a escrita passa a ser síncrona: registros emitidos mais
+    tarde (no fim do main ou em outro atexit) não se perdem na fila.
+    """
+    global _listener, _summary_thread
+    if _summary_thread is not None:
+        _summary_thread.stop()
+        _summary_thread.emit_summary()
+        _summary_thread = None
+    if _listener is not None:
+        # Troca o handler antes de parar a thread: nenhum registro fica na fila sem leitor
+        logging.getLogger(LOGGER_NAME).handlers[:] = [_fallback_handler]
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def add_logging_arguments(parser):
+    group = parser.add_argument_group("logging")
+    group.add_argument("--log-level", default="INFO", help="Nível mínimo de log (DEBUG, INFO, WARNING...).")
+    group.add_argument("--log-json", action="store_true", help="Emite os logs como JSON lines.")
+    group.add_argument("--log-sample", type=int, default=DEFAULT_SAMPLE_RATE,
+                       help="Emite 1 a cada N eventos repetitivos (1 desativa a amostragem).")
+    group.add_argument("--log-summary-interval", type=float, default=DEFAULT_SUMMARY_INTERVAL,
+                       help="Segundos entre as linhas de resumo (0 desativa).")
+
+
+def setup_logging_from_args(args):
+    sample_rate = 1 if args.log_level.upper() == "DEBUG" else args.log_sample
+    return setup_logging(args.log_level, args.log_json, sample_rate, args.log_summary_interval)
@@ -0,0 +1,172 @@
+"""Métricas de execução do scraper e do validador.
+
+Contadores e histogramas ficam em memória durante a execução e são
+exportados no formato texto do Prometheus (para o textfile collector do
+node_exporter ou para inspeção manual) e como um resumo JSON da execução.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+# Limites (em segundos) dos buckets de latência
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def host_of(url):
+    """Retorna o host de uma URL sem o prefixo www."""
+    host = urlparse(str(url)).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def metric_key(name, labels):
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class MetricsRegistry:
+    """Registro de contadores e histogramas identificados por nome e labels."""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()  # A validação do MediaFire roda em threads
+        self.started_at = datetime.now()
+        self.start_time = time.perf_counter()
+
+    def inc(self, name, amount=1, **labels):
+        key = metric_key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS, **labels):
+        key = metric_key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Mede a duração do bloco e registra no histograma `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def render_prometheus(self):
+        lines = []
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+        declared = set()
+        for (name, labels), value in counters:
+            if name not in declared:
+                lines.append(f"# TYPE {name} counter")
+                declared.add(name)
+            lines.append(f"{name}{format_labels(labels)} {value}")
+        for (name, labels), histogram in histograms:
+            if name not in declared:
+                lines.append(f"# TYPE {name} histogram")
+                declared.add(name)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{format_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+            lines.append(f"{name}_sum{format_labels(labels)} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self, **extra):
+        """Resumo da execução em formato serializável para JSON."""
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(time.perf_counter() - self.start_time, 3),
+            "counters": [{"name": name, "labels": dict(labels), "value": value}
+                         for (name, labels), value in counters],
+            "histograms": [{
+                "name": name,
+                "labels": dict(labels),
+                "count": histogram.count,
+                "sum": round(histogram.sum, 6),
+                "avg": round(histogram.sum / histogram.count, 6) if histogram.count else 0,
+                "max": round(histogram.max, 6),
+            } for (name, labels), histogram in histograms],
+            **extra,
+        }
+
+    def write_prometheus(self, filename):
+        write_atomic(filename, self.render_prometheus())
+
+    def write_summary(self, filename, **extra):
+        write_atomic(filename, json.dumps(self.summary(**extra), ensure_ascii=False, indent=4))
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def write_atomic(filename, content):
+    """Grava em um arquivo temporário e renomeia, para o coletor nunca ler um arquivo pela metade."""
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_filename, filename)
+
+
+REGISTRY = MetricsRegistry()
+inc = REGISTRY.inc
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+
+
+def httpx_event_hooks(prefix):
+    """Event hooks do httpx.AsyncClient que registram latência, status e bytes por host."""
+    async def on_request(request):
+        request.extensions["metrics_start"] = time.perf_counter()
+
+    async def on_response(response):
+        host = host_of(response.request.url)
+        start = response.request.extensions.get("metrics_start")
+        if start is not None:
+            observe(f"{prefix}_request_seconds", time.perf_counter() - start, host=host)
+        inc(f"{prefix}_requests_total", host=host, status=response.status_code)
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdigit():
+            inc(f"{prefix}_bytes_total", int(content_length), host=host)
+
+    return {"request": [on_request], "response": [on_response]}
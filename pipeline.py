@@ -0,0 +1,173 @@
+"""Validação contínua durante o crawl (scraper.py --validate).
+
+Sem este modo o scraper grava o catálogo inteiro e só numa execução
+separada o validador recarrega o arquivo e revalida todos os grupos. Aqui
+cada jogo novo encontrado por `process_page` entra numa fila e o grupo de
+títulos (quase) iguais em que ele caiu é validado logo em seguida, só ele.
+O catálogo em disco é regravado periodicamente com as decisões já tomadas,
+então um jogo novo chega validado ao arquivo publicado em minutos.
+"""
+import asyncio
+from time import time
+
+import metrics
+import rework_scraper
+import tracing
+from dedupe import DuplicateIndex
+from log_config import get_logger, log_event
+from records import GameRecord
+from time_budget import finish_within
+
+PIPELINE_WORKERS = 8  # Grupos validados ao mesmo tempo
+PUBLISH_INTERVAL = 30  # Segundos entre gravações do catálogo
+
+logger = get_logger("pipeline")
+
+
+class ValidationPipeline:
+    """Valida os grupos afetados por jogos novos enquanto o crawl continua.
+
+    `data` é o catálogo do scraper (o mesmo dict, compartilhado): jogos
+    mantidos são atualizados no lugar e os removidos saem da lista em
+    `flush`, que chama `save(data, removidos)` para gravar o catálogo e a
+    blacklist. Com `deadline` (--time-budget), grupos que chegam à vez depois
+    que o orçamento parou de aceitar trabalho ficam sem validar, como estão.
+    """
+
+    def __init__(self, data, save, deadline=None):
+        self.data = data
+        self.save = save
+        self.deadline = deadline
+        self.index = DuplicateIndex()
+        for game in data["downloads"]:
+            self.index.add(game["title"], game)
+        self.queue = None
+        self.queued = set()  # Raízes na fila
+        # Chaves (títulos normalizados) dos grupos em validação: um jogo novo pode unir o grupo
+        # a outro e mudar a raiz no meio da validação, mas as chaves continuam as mesmas
+        self.active = set()
+        self.deferred = set()  # Chaves de grupos que mudaram enquanto estavam em validação
+        self.submitted = {}  # raiz -> quando o primeiro jogo novo ainda não validado chegou
+        self.decided = []  # Horários de chegada dos grupos decididos e ainda não gravados
+        self.removed = []
+        self.client = None
+        self.tracker = None
+        self.tasks = []
+
+    async def start(self):
+        import httpx
+        rework_scraper.open_link_cache()
+        self.queue = asyncio.Queue()
+        self.client = httpx.AsyncClient(follow_redirects=True, event_hooks=metrics.httpx_event_hooks("validator"))
+        self.tracker = rework_scraper.ProgressTracker(0)
+        self.tasks = [asyncio.ensure_future(self.worker()) for _ in range(PIPELINE_WORKERS)]
+        self.tasks.append(asyncio.ensure_future(self.publish_periodically()))
+
+    def submit(self, game, previous_title=None):
+        """Recebe um jogo novo do scraper (já adicionado a `data`) ou, com `previous_title`,
+        uma entrada existente que foi atualizada."""
+        if previous_title is not None:
+            self.index.remove(previous_title, game)
+        root = self.index.add(game["title"], game)
+        self.submitted.setdefault(root, time())
+        metrics.inc("pipeline_games_total")
+        self.schedule(root)
+
+    def busy(self, root):
+        return any(key in self.active for key in self.index.members[root])
+
+    def schedule(self, root):
+        if self.busy(root):
+            self.deferred.add(root)
+        elif root not in self.queued:
+            self.queued.add(root)
+            self.queue.put_nowait(root)
+
+    async def worker(self):
+        while True:
+            key = await self.queue.get()
+            self.queued.discard(key)
+            root = self.index.find(key)  # O grupo pode ter sido unido a outro enquanto esperava
+            try:
+                if self.busy(root):
+                    self.deferred.add(root)
+                    continue
+                if self.deadline is not None and not self.deadline.accepting():
+                    self.submitted.pop(root, None)
+                    metrics.inc("pipeline_groups_total", outcome="skipped")
+                    continue
+                keys = list(self.index.members[root])
+                self.active.update(keys)
+                try:
+                    await self.validate_group(root)
+                finally:
+                    self.active.difference_update(keys)
+                    self.reschedule_deferred(root)
+            except Exception as e:
+                logger.error("Error validating group %s: %s", root, e)
+            finally:
+                self.queue.task_done()
+
+    def reschedule_deferred(self, root):
+        """Valida de novo o grupo se chegaram jogos durante a validação (talvez unindo-o a outro)."""
+        root = self.index.find(root)
+        changed = {key for key in self.deferred if self.index.find(key) == root}
+        if changed:
+            self.deferred -= changed
+            self.schedule(root)
+
+    async def validate_group(self, root):
+        games = self.index.group(root)
+        if not games:
+            return
+        submitted = self.submitted.pop(root, None)
+        records = [GameRecord.from_dict(game) for game in games]
+        origin = {id(record): game for record, game in zip(records, games)}
+        self.tracker.total += len(records)
+        with metrics.timer("pipeline_group_seconds"), \
+                tracing.span("group", "validate", title=records[0].title, size=len(records)):
+            kept, removed = await rework_scraper.validate_game_group(records, self.client, self.tracker)
+
+        for record in kept:
+            game = origin[id(record)]
+            game.clear()
+            game.update(record.to_dict())
+        for record in removed:
+            game = origin[id(record)]
+            self.index.remove(game["title"], game)
+            self.removed.append(game)
+        if submitted is not None:
+            self.decided.append(submitted)
+        metrics.inc("pipeline_groups_total", outcome="kept" if kept else "removed")
+        log_event(logger, "VALIDATED", "Group %s: kept %s, removed %s", root, len(kept), len(removed),
+                  group=root, kept=len(kept), removed=len(removed))
+
+    async def publish_periodically(self):
+        while True:
+            await asyncio.sleep(PUBLISH_INTERVAL)
+            if self.decided or self.removed:
+                self.flush()
+
+    def flush(self):
+        """Tira os jogos removidos do catálogo e grava catálogo, blacklist e cache de links."""
+        if self.removed:
+            removed = {id(game) for game in self.removed}
+            self.data["downloads"][:] = [game for game in self.data["downloads"] if id(game) not in removed]
+        self.save(self.data, self.removed)
+        rework_scraper.flush_link_cache(self.tracker.current if self.tracker else 0)
+        now = time()
+        for submitted in self.decided:
+            metrics.observe("pipeline_publish_latency_seconds", now - submitted)
+        self.decided = []
+        self.removed = []
+
+    async def close(self):
+        """Espera os grupos pendentes, para os workers e grava o resultado final."""
+        if self.queue is not None:
+            await finish_within(self.deadline, self.queue.join())
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.client is not None:
+            await self.client.aclose()
+        self.flush()
@@ -0,0 +1,64 @@
+"""Sondagens baratas de links, tentadas antes da validação completa (--tiered).
+
+Os validadores completos baixam a página inteira e montam a árvore do
+BeautifulSoup só para ler o nome e o tamanho do arquivo, que quase sempre
+estão nos primeiros KB do HTML. Uma sonda lê o corpo em streaming e para
+assim que encontra os marcadores do host; quando não consegue decidir
+(status inesperado, marcador ausente, HTML em outro formato) retorna None
+e quem chamou escala para o validador completo.
+"""
+import re
+
+PROBE_BYTES = 96 * 1024  # Máximo lido antes de desistir e escalar
+PROBE_TIMEOUT = 10
+DEAD_STATUSES = frozenset({404, 410})
+TORRENT_MARKERS = re.compile(r"trnt\.rar|\.torrent|bittorrent", re.IGNORECASE)
+
+
+class PageRule:
+    """Marcadores de uma página de download: o nome e o tamanho do arquivo."""
+    __slots__ = ("name", "size")
+
+    def __init__(self, name, size):
+        self.name = re.compile(name, re.IGNORECASE | re.DOTALL)
+        self.size = re.compile(size, re.IGNORECASE)
+
+
+QIWI_RULE = PageRule(
+    name=r"<h1[^>]*page_TextHeading[^>]*>(.*?)</h1>",
+    size=r">\s*Download\s+(\d+(?:\.\d+)?\s*(?:GB|MB))\s*<")
+DATANODES_RULE = PageRule(
+    name=r"<span[^>]*class=\"block truncate w-auto\"[^>]*>(.*?)</span>",
+    size=r"<small[^>]*class=\"m-0 text-xs text-gray-500 font-bold\"[^>]*>\s*([^<]+?)\s*</small>")
+
+
+async def probe_page(client, link, rule):
+    """Lê o começo da página até achar nome e tamanho. Retorna (válido, tamanho) ou None."""
+    async with client.stream("GET", link, timeout=PROBE_TIMEOUT) as response:
+        if response.status_code in DEAD_STATUSES:
+            return False, None
+        if response.status_code != 200:
+            return None
+        buffer = ""
+        async for chunk in response.aiter_text():
+            buffer += chunk
+            name = rule.name.search(buffer)
+            size = rule.size.search(buffer)
+            if name and size:
+                if TORRENT_MARKERS.search(name.group(1)):
+                    return False, None
+                return True, size.group(1).strip()
+            if len(buffer) >= PROBE_BYTES:
+                break
+    return None
+
+
+async def probe_redirect(client, link, dead_marker):
+    """Segue só o primeiro redirecionamento: hosts como o MediaFire mandam arquivos removidos
+    para uma página de erro. Retorna (False, "") nesse caso, senão None."""
+    response = await client.head(link, timeout=PROBE_TIMEOUT, follow_redirects=False)
+    if response.status_code in DEAD_STATUSES:
+        return False, ""
+    if response.is_redirect and dead_marker in response.headers.get("location", ""):
+        return False, ""
+    return None
@@ -0,0 +1,197 @@
+"""Pool de proxies com pontuação de saúde, para espalhar o crawl e a validação.
+
+Os proxies vêm da API do proxyscrape (`--proxies proxyscrape`) ou de um
+arquivo com um proxy por linha. Todos são sondados ao mesmo tempo antes do
+uso; depois cada proxy acumula a latência média (EWMA) e a taxa de sucesso
+das requisições reais, e a pontuação é sucesso / latência. `choose` devolve
+o mesmo proxy para o mesmo host e faixa enquanto ele estiver saudável (a
+sessão do Cloudflare fica presa ao IP); faixas diferentes espalham as
+requisições de um host por vários IPs. Proxies com falhas seguidas saem do
+pool.
+"""
+import asyncio
+import random
+import zlib
+from operator import attrgetter
+from time import perf_counter
+
+import metrics
+from log_config import get_logger, log_event
+
+PROXY_API_URL = "https://api.proxyscrape.com/v4/free-proxy-list/get?request=display_proxies&protocol=http&proxy_format=protocolipport&format=text&anonymity=Elite,Anonymous&timeout=1019"
+PROBE_URL = "https://www.gstatic.com/generate_204"
+PROBE_TIMEOUT = 8
+PROBE_CONCURRENCY = 64
+LATENCY_ALPHA = 0.3  # Peso da latência mais recente na média
+MAX_CONSECUTIVE_FAILURES = 3  # Falhas seguidas até o proxy ser descartado
+TOP_CHOICES = 4  # Uma faixa nova recebe um dos N proxies mais bem pontuados
+DEFAULT_LANES = 8  # Faixas (IPs) usadas ao mesmo tempo por host
+
+logger = get_logger("proxy_pool")
+
+
+class ProxyStats:
+    __slots__ = ("url", "latency", "successes", "failures", "streak")
+
+    def __init__(self, url):
+        self.url = url
+        self.latency = None
+        self.successes = 0
+        self.failures = 0
+        self.streak = 0  # Falhas seguidas
+
+    def record(self, ok, latency=None):
+        if ok:
+            self.successes += 1
+            self.streak = 0
+            if latency is not None:
+                self.latency = latency if self.latency is None else \
+                    LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency
+        else:
+            self.failures += 1
+            self.streak += 1
+
+    @property
+    def score(self):
+        success_rate = (self.successes + 1) / (self.successes + self.failures + 2)
+        return success_rate / (self.latency or PROBE_TIMEOUT)
+
+
+def parse_proxies(text):
+    """Um proxy por linha ("host:porta" ou URL); linhas vazias e comentários são ignorados."""
+    proxies = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            proxies.append(line if "://" in line else f"http://{line}")
+    return proxies
+
+
+async def fetch_proxies():
+    """Obtém uma lista de proxies HTTP do formato texto retornado pela API."""
+    import httpx
+    retries = 3  # Número máximo de tentativas
+    for attempt in range(retries):
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:  # Timeout de 10 segundos
+                response = await client.get(PROXY_API_URL)
+                if response.status_code == 200:
+                    proxies = parse_proxies(response.text)
+                    if proxies:
+                        return proxies
+                raise Exception("Failed to fetch proxies: No proxies in response")
+        except (httpx.ReadTimeout, httpx.RequestError):
+            await asyncio.sleep(2 ** attempt)  # Backoff exponencial
+    raise Exception("Failed to fetch proxies after multiple attempts")
+
+
+class ProxyPool:
+    def __init__(self, proxies, lanes=DEFAULT_LANES):
+        self.proxies = {url: ProxyStats(url) for url in proxies}
+        self.lanes = lanes
+        self.sticky = {}  # (host, faixa) -> proxy
+        self.clients = {}  # proxy -> httpx.AsyncClient
+        self.retired = []  # Clientes de proxies descartados, fechados em aclose()
+
+    @classmethod
+    async def load(cls, source, **options):
+        """Carrega os proxies da API ("proxyscrape") ou de um arquivo."""
+        if source == "proxyscrape":
+            proxies = await fetch_proxies()
+        else:
+            with open(source, "r", encoding="utf-8") as f:
+                proxies = parse_proxies(f.read())
+        return cls(proxies, **options)
+
+    async def probe_all(self, url=PROBE_URL, timeout=PROBE_TIMEOUT, concurrency=PROBE_CONCURRENCY):
+        """Sonda todos os proxies ao mesmo tempo e descarta os que não responderam."""
+        import httpx
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def probe(stats):
+            async with semaphore:
+                start = perf_counter()
+                try:
+                    async with httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(proxy=httpx.Proxy(stats.url)),
+                                                 timeout=timeout) as client:
+                        response = await client.get(url)
+                    ok = response.status_code < 400
+                except Exception:
+                    ok = False
+                stats.record(ok, perf_counter() - start)
+
+        total = len(self.proxies)
+        await asyncio.gather(*(probe(stats) for stats in list(self.proxies.values())))
+        for stats in list(self.proxies.values()):
+            if not stats.successes:
+                self.evict(stats.url)
+        log_event(logger, "PROXIES", "%s of %s proxies alive", len(self.proxies), total,
+                  alive=len(self.proxies), total=total)
+
+    def choose(self, host, key=""):
+        """Proxy para uma requisição ao host (None se o pool está vazio).
+
+        `key` (a URL, por exemplo) escolhe a faixa; a mesma faixa do mesmo
+        host recebe o mesmo proxy enquanto ele estiver no pool.
+        """
+        lane = (host, zlib.crc32(key.encode()) % self.lanes)
+        url = self.sticky.get(lane)
+        if url in self.proxies:
+            return url
+        if not self.proxies:
+            return None
+        best = sorted(self.proxies.values(), key=attrgetter("score"), reverse=True)[:TOP_CHOICES]
+        url = self.sticky[lane] = random.choice(best).url
+        return url
+
+    def report(self, url, ok, latency=None):
+        """Registra o resultado de uma requisição feita pelo proxy."""
+        stats = self.proxies.get(url)
+        if stats is None:
+            return
+        stats.record(ok, latency)
+        metrics.inc("proxy_requests_total", outcome="ok" if ok else "error")
+        if stats.streak >= MAX_CONSECUTIVE_FAILURES:
+            self.evict(url)
+
+    def evict(self, url):
+        stats = self.proxies.pop(url, None)
+        if stats is None:
+            return
+        self.sticky = {lane: proxy for lane, proxy in self.sticky.items() if proxy != url}
+        if url in self.clients:
+            self.retired.append(self.clients.pop(url))
+        metrics.inc("proxy_evictions_total")
+        log_event(logger, "PROXY_EVICTED", "Evicted proxy %s (%s ok, %s failed)", url, stats.successes,
+                  stats.failures, proxy=url)
+
+    @staticmethod
+    def requests_proxies(url):
+        """Dict `proxies` do requests/cloudscraper para o proxy."""
+        return {"http": url, "https": url}
+
+    def client(self, url, **options):
+        """httpx.AsyncClient que sai pelo proxy, reaproveitado entre requisições."""
+        import httpx
+        if url not in self.clients:
+            self.clients[url] = httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(proxy=httpx.Proxy(url)),
+                                                  **options)
+        return self.clients[url]
+
+    async def aclose(self):
+        clients = list(self.clients.values()) + self.retired
+        self.clients = {}
+        self.retired = []
+        for client in clients:
+            await client.aclose()
+
+
+async def open_pool(source):
+    """Carrega e sonda o pool. Retorna None se não sobrou nenhum proxy: quem chama segue sem proxy."""
+    try:
+        pool = await ProxyPool.load(source)
+        await pool.probe_all()
+    except Exception as e:
+        logger.error("Error loading proxies from %s: %s", source, e)
+        return None
+    return pool if pool.proxies else None
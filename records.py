@@ -0,0 +1,112 @@
+"""Registro compacto de um jogo do catálogo.
+
+No JSON um jogo é um dict com tamanho ("1.82 GB") e data (ISO) em texto.
+Dentro do validador cada jogo vira um GameRecord com __slots__: tamanho em
+bytes (int), data em segundos desde 1970 (float) e os hosts dos links
+internados, então ordenar e comparar não re-interpreta strings e cada
+registro ocupa bem menos memória que um dict. A conversão acontece só na
+entrada (`from_dict`) e na saída (`to_dict`); tamanho e data que não
+mudaram saem com o texto original, então a ida e volta não altera o JSON.
+"""
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+SIZE_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?)\s*(TB|GB|MB|KB|B)\b", re.IGNORECASE)
+EPOCH = datetime(1970, 1, 1)  # As datas do catálogo são ingênuas (sem fuso)
+MISSING = object()  # Campo ausente no JSON de origem
+
+
+def parse_size(text):
+    """Converte "1.82 GB" em bytes; 0 quando não há tamanho."""
+    match = SIZE_PATTERN.search(text or "")
+    if not match:
+        return 0
+    return round(float(match.group(1).replace(",", ".")) * SIZE_UNITS[match.group(2).upper()])
+
+
+def format_size(size_bytes):
+    """Formata um tamanho em bytes como no catálogo ("1.82 GB"); "" quando desconhecido."""
+    if size_bytes <= 0:
+        return ""
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    if size_bytes < 1024 ** 2:
+        return f"{size_bytes / 1024:.2f} KB"
+    if size_bytes < 1024 ** 3:
+        return f"{size_bytes / (1024 ** 2):.2f} MB"
+    return f"{size_bytes / (1024 ** 3):.2f} GB"
+
+
+def parse_date(text):
+    """Converte uma data ISO em segundos desde 1970; 0 quando ausente ou inválida."""
+    if not text:
+        return 0.0
+    try:
+        date = datetime.fromisoformat(text)
+    except ValueError:
+        return 0.0
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc).replace(tzinfo=None)
+    return (date - EPOCH).total_seconds()
+
+
+def format_date(timestamp):
+    return (EPOCH + timedelta(seconds=timestamp)).isoformat() if timestamp else ""
+
+
+def link_host(link):
+    """Host do link sem "www.", internado: links do mesmo host compartilham a mesma string."""
+    host = urlsplit(link).netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return sys.intern(host)
+
+
+class GameRecord:
+    __slots__ = ("title", "uris", "hosts", "size_bytes", "upload_ts", "source", "multiplayer", "extra",
+                 "unknown", "unchecked", "original")
+
+    def __init__(self, title, uris, size_bytes=0, upload_ts=0.0, source=None, extra=None):
+        self.title = title
+        self.set_uris(uris)
+        self.size_bytes = size_bytes
+        self.upload_ts = upload_ts
+        self.source = source
+        self.extra = extra  # Campos do JSON que o registro não modela, preservados na saída
+        self.unknown = ()  # Links de status desconhecido na última validação (host fora do ar)
+        self.unchecked = ()  # Links que a última validação não chegou a verificar (--first-valid)
+        self.original = None  # (fileSize, tamanho, uploadDate, data) como vieram do JSON
+        lowered = title.lower()
+        self.multiplayer = "multiplayer" in lowered or "0xdeadcode" in lowered
+
+    def set_uris(self, uris):
+        self.uris = list(uris)
+        self.hosts = tuple(link_host(link) for link in self.uris)
+
+    @classmethod
+    def from_dict(cls, game):
+        known = ("title", "uris", "fileSize", "uploadDate", "repackLinkSource")
+        extra = {key: value for key, value in game.items() if key not in known} or None
+        file_size, upload_date = game.get("fileSize", MISSING), game.get("uploadDate", MISSING)
+        record = cls(game["title"], game.get("uris", []), parse_size(None if file_size is MISSING else file_size),
+                     parse_date(None if upload_date is MISSING else upload_date), game.get("repackLinkSource"), extra)
+        record.original = (file_size, record.size_bytes, upload_date, record.upload_ts)
+        return record
+
+    def to_dict(self):
+        game = {"title": self.title, "uris": list(self.uris)}
+        file_size, size_bytes, upload_date, upload_ts = self.original or (MISSING, None, MISSING, None)
+        file_size = file_size if self.size_bytes == size_bytes else format_size(self.size_bytes)
+        upload_date = upload_date if self.upload_ts == upload_ts else format_date(self.upload_ts)
+        if file_size is not MISSING:
+            game["fileSize"] = file_size
+        if upload_date is not MISSING:
+            game["uploadDate"] = upload_date
+        if self.source is not None:
+            game["repackLinkSource"] = self.source
+        if self.extra:
+            game.update(self.extra)
+        return game
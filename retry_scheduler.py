@@ -0,0 +1,136 @@
+"""Retentativas atrasadas por URL, em paralelo com o trabalho novo.
+
+Antes, cada jogo que falhava colocava a página de listagem inteira numa
+lista, e no fim da categoria essas páginas eram reprocessadas uma a uma.
+Aqui a unidade é a URL exata que falhou: ela entra num min-heap ordenado
+pelo horário da próxima tentativa (backoff exponencial com jitter, para as
+retentativas não saírem todas juntas), um loop em segundo plano dispara as
+que venceram sem esperar as outras, e depois de MAX_ATTEMPTS tentativas a
+URL é abandonada.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+
+import metrics
+from log_config import get_logger, log_event
+
+MAX_ATTEMPTS = 4  # Contando a tentativa original
+BASE_DELAY = 5  # Segundos até a primeira retentativa
+MAX_DELAY = 120
+JITTER = 0.5  # O atraso varia ±50%
+
+logger = get_logger("retry_scheduler")
+
+
+class RetryScheduler:
+    """Agenda `handler(url, payload)` de novo até ele terminar sem exceção.
+
+    `payload` é o que o handler precisa para refazer o trabalho (o catálogo
+    e a página de origem, por exemplo) e é guardado junto com a URL. Só as
+    exceções de `retry_on` agendam outra tentativa; as outras são erros que
+    se repetiriam e a URL é abandonada na hora.
+    """
+
+    def __init__(self, handler, max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY, max_delay=MAX_DELAY,
+                 retry_on=Exception):
+        self.handler = handler
+        self.retry_on = retry_on
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.heap = []  # (horário da próxima tentativa, ordem, url)
+        self.order = itertools.count()
+        self.attempts = {}  # url -> tentativas já feitas
+        self.payloads = {}  # url -> payload, enquanto a URL está pendente
+        self.running = set()
+        self.wakeup = None
+        self.loop_task = None
+
+    def start(self):
+        self.wakeup = asyncio.Event()
+        self.loop_task = asyncio.ensure_future(self.run())
+
+    def delay(self, attempt):
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * random.uniform(1 - JITTER, 1 + JITTER)
+
+    def schedule(self, url, payload=None):
+        """Registra uma falha de `url`. Retorna False se a URL foi abandonada."""
+        if url in self.payloads:
+            return True  # Já pendente: uma tentativa basta
+        attempt = self.attempts.get(url, 0) + 1
+        self.attempts[url] = attempt
+        if attempt >= self.max_attempts:
+            metrics.inc("scraper_retries_abandoned_total")
+            log_event(logger, "RETRY_ABANDONED", "Giving up on %s after %s attempts", url, attempt,
+                      level=logging.ERROR, url=url, attempts=attempt)
+            return False
+        self.payloads[url] = payload
+        heapq.heappush(self.heap, (time.monotonic() + self.delay(attempt), next(self.order), url))
+        metrics.inc("scraper_retries_scheduled_total")
+        if self.wakeup is not None:
+            self.wakeup.set()
+        return True
+
+    async def run(self):
+        while True:
+            if not self.heap:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+            due, _, url = self.heap[0]
+            wait = due - time.monotonic()
+            if wait > 0:
+                self.wakeup.clear()
+                try:
+                    # Acorda antes se uma retentativa mais próxima for agendada
+                    await asyncio.wait_for(self.wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self.heap)
+            task = asyncio.ensure_future(self.attempt(url, self.payloads.pop(url)))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+    async def attempt(self, url, payload):
+        log_event(logger, "RETRY", "Retrying %s (attempt %s)", url, self.attempts[url] + 1,
+                  level=logging.WARNING, url=url, attempt=self.attempts[url] + 1)
+        try:
+            await self.handler(url, payload)
+        except asyncio.CancelledError:
+            raise
+        except self.retry_on as e:
+            logger.warning("Retry failed for %s: %s", url, e)
+            self.schedule(url, payload)
+        except Exception:
+            self.attempts.pop(url, None)
+            metrics.inc("scraper_retries_abandoned_total")
+            logger.exception("Retry of %s failed with a non-retryable error", url)
+        else:
+            self.attempts.pop(url, None)
+            metrics.inc("scraper_retries_succeeded_total")
+
+    def pending(self):
+        return len(self.heap) + len(self.running)
+
+    async def drain(self):
+        """Espera as retentativas pendentes (inclusive as que ainda vão falhar e voltar)."""
+        while self.pending():
+            if self.running:
+                await asyncio.wait(set(self.running))
+            else:
+                await asyncio.sleep(max(0.0, self.heap[0][0] - time.monotonic()) + 0.01)
+
+    async def close(self):
+        """Para o loop e cancela as retentativas em andamento (as pendentes são descartadas)."""
+        tasks = list(self.running) + ([self.loop_task] if self.loop_task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.heap = []
+        self.payloads = {}
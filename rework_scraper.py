@@ -1,32 +1,39 @@
+import argparse
+import hashlib
 import json
+import logging
 import random
 import re
 from datetime import datetime
-from colorama import Fore, init
-import httpx  # Para requisições HTTP
-from bs4 import BeautifulSoup  # Corrigido para importar de bs4
+# httpx, bs4, selenium, stem e httpx_socks são importados dentro das funções que os usam,
+# para que o CLI (stats, publish) e os benchmarks carreguem este módulo rapidamente.
 import asyncio
 from concurrent.futures import ThreadPoolExecutor  # Import necessário para ThreadPoolExecutor
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
 from queue import Queue
 from typing import List, Tuple  # Adicionado para corrigir o erro de tipagem
 import subprocess  # Adicionado para executar comandos do sistema
-from stem import Signal
-from stem.control import Controller
-from httpx_socks import AsyncProxyTransport
 import os
+import shutil
+import sys
+import threading
 from time import time
 import math
 from datetime import timedelta
-
-init(autoreset=True)
+from operator import attrgetter
+import hosts
+import metrics
+import probes
+import tracing
+from circuit_breaker import HOST_ERROR_STATUSES, HostUnavailable, check_status, guarded, is_host_error, \
+    raise_if_host_error
+from proxy_pool import open_pool
+from dedupe import group_games
+from link_cache import LinkCache
+from records import GameRecord, format_size, parse_size
+from time_budget import Deadline, add_time_budget_argument, finish_within
+from log_config import add_logging_arguments, get_logger, log_event, setup_logging_from_args
+
+logger = get_logger("validator")
 
 SOURCE_JSON = "shisuyssource.json"
 BLACKLIST_JSON = "blacklist.json"
@@ -35,8 +42,15 @@ GOFILE_TIMEOUTS_JSON = "gofile_timeouts.json"
 VALID_LINKS_JSON = "valid_links.json"
 INVALID_LINKS_JSON = "invalid_links.json"
 PROGRESS_JSON = "validation_progress.json"
-# Updated title normalization regex to remove version/build info
-REGEX_TITLE_NORMALIZATION = r"\s*\([^)]*(?:v\d+(?:\.\d+){1,}|Build \d+|R\d+\.\d+|Ch\.\s*\d+\s*v\d+(?:\.\d+)?|Executive Edition Free Download)[^)]*\)"
+VALIDATED_GROUPS_JSON = "validated_groups.json"  # Quando cada grupo de títulos foi validado pela última vez
+VALIDATION_SHARDS_DIR = "validation_shards"
+TIERED_PROBES = False  # --tiered: sondas baratas antes dos validadores completos
+SPECULATIVE_CANDIDATES = 0  # --speculative K: candidatos de um grupo validados ao mesmo tempo
+FIRST_VALID = False  # --first-valid: para no primeiro link válido de cada candidato
+CACHE_FLUSH_INTERVAL = 10  # Segundos entre gravações do cache de validação
+LINK_CACHE = None  # LinkCache da execução, criado por open_link_cache
+PROXY_POOL = None  # ProxyPool (--proxies) usado pelos validadores dos hosts com `proxied`
+DEADLINE = None  # Deadline da execução (--time-budget)
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, Gecko) Chrome/121.0.0.0 Safari/537.36",
@@ -49,9 +63,6 @@ HEADERS = {
     "Pragma": "no-cache"
 }
 
-def normalize_title(title):
-    return re.sub(REGEX_TITLE_NORMALIZATION, "", title, flags=re.IGNORECASE).strip().lower()
-
 def load_json(filename):
     """Carrega um arquivo JSON."""
     try:
@@ -68,13 +79,15 @@ def save_json(filename, data):
         json.dump(data, f, ensure_ascii=False, indent=4)
 
 def is_valid_link(link):
-    """Verifica se o link é válido."""
-    return any(domain in link for domain in ["1fichier.com", "gofile.io", "pixeldrain.com", "mediafire.com", "datanodes.to", "qiwi.gg"])
+    """Verifica se o link é de um host suportado."""
+    return hosts.classify(link) is not None
 
 async def is_valid_qiwi_link(link, client):
     """Verifica se o link do Qiwi é válido e extrai o tamanho do arquivo."""
+    from bs4 import BeautifulSoup
     try:
         response = await client.get(link, timeout=10)
+        check_status(response.status_code)
         if response.status_code != 200:  # Verifica se o status HTTP é válido
             return False, None
 
@@ -95,13 +108,16 @@ async def is_valid_qiwi_link(link, client):
 
         # Invalidate the link if file size is not found
         return False, None
-    except Exception:
+    except Exception as e:
+        raise_if_host_error(e)
         return False, None
 
 async def is_valid_datanodes_link(link, client):
     """Verifica se o link do Datanodes é válido e extrai o tamanho do arquivo."""
+    from bs4 import BeautifulSoup
     try:
         response = await client.get(link, timeout=10)
+        check_status(response.status_code)
         if response.status_code != 200:  # Verifica se o status HTTP é válido
             return False, None
 
@@ -122,7 +138,8 @@ async def is_valid_datanodes_link(link, client):
 
         # Invalidate the link if file size is not found
         return False, None
-    except Exception:
+    except Exception as e:
+        raise_if_host_error(e)
         return False, None
 
 async def is_valid_pixeldrain_link(link, client):
@@ -134,6 +151,7 @@ async def is_valid_pixeldrain_link(link, client):
 
         # Fazer a requisição para a API do Pixeldrain
         response = await client.get(api_url, timeout=10)
+        check_status(response.status_code)
         if response.status_code != 200:  # Verifica se o status HTTP é válido
             return False, None
 
@@ -150,13 +168,12 @@ async def is_valid_pixeldrain_link(link, client):
         # Extrair o tamanho do arquivo
         file_size_bytes = file_info.get("size", 0)
         if file_size_bytes > 0:
-            # Converter o tamanho do arquivo para MB ou GB
-            file_size = f"{file_size_bytes / (1024 ** 2):.2f} MB" if file_size_bytes < (1024 ** 3) else f"{file_size_bytes / (1024 ** 3):.2f} GB"
-            return True, file_size
+            return True, format_size(file_size_bytes)
 
         # Invalidate the link if file size is not found
         return False, None
-    except Exception:
+    except Exception as e:
+        raise_if_host_error(e)
         return False, None
 
 def extract_mediafire_key(url):
@@ -174,7 +191,8 @@ def extract_mediafire_key(url):
 
 def check_mediafire_link(link):
     """Verifica se o link do MediaFire é válido usando WebDriver."""
-    driver = driver_pool.get_driver()
+    driver = get_driver_pool().get_driver()
+    start = time()
     try:
         driver.set_page_load_timeout(10)
         driver.get(link)
@@ -192,29 +210,38 @@ def check_mediafire_link(link):
             return None
 
         return link
-    except Exception:
+    except Exception as e:
+        from selenium.common.exceptions import WebDriverException
+        if isinstance(e, WebDriverException):  # Timeout ou erro de rede do navegador
+            raise HostUnavailable(str(e).strip() or type(e).__name__) from e
         return None
     finally:
-        driver_pool.return_driver(driver)
+        metrics.observe("validator_tier_seconds", time() - start, tier="mediafire_webdriver")
+        get_driver_pool().return_driver(driver)
 
 async def validate_mediafire_link(session, link):
-    """Valida um link do MediaFire usando WebDriver e, em seguida, a API para obter informações."""
+    """Valida um link do MediaFire usando WebDriver e, em seguida, a API para obter informações.
+
+    Arquivo removido ou bloqueado é (False, ""); host fora do ar levanta HostUnavailable.
+    """
+    import httpx
     # Primeiro, validar o link com WebDriver
     loop = asyncio.get_event_loop()
     with ThreadPoolExecutor(max_workers=3) as executor:
         result = await loop.run_in_executor(executor, check_mediafire_link, link)
         if not result:
-            return None, ""
+            return False, ""
 
     # Se o WebDriver validar, usar a API para obter informações
     quick_key = extract_mediafire_key(link)
     if not quick_key:
-        return None, ""
+        return False, ""
 
     api_url = f"https://www.mediafire.com/api/1.1/file/get_info.php?quick_key={quick_key}&response_format=json"
     try:
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(event_hooks=metrics.httpx_event_hooks("validator")) as client:
             response = await client.get(api_url, headers=HEADERS)
+            check_status(response.status_code)
             if response.status_code == 200:
                 data = response.json()
                 if data.get("response", {}).get("result") == "Success":
@@ -224,47 +251,21 @@ async def validate_mediafire_link(session, link):
 
                     # Verificar se o nome do arquivo contém ".torrent"
                     if ".torrent" in file_name:
-                        return None, ""
+                        return False, ""
 
                     # Invalidate the link if file size is not found
                     if not file_size or int(file_size) <= 0:
-                        return None, ""
+                        return False, ""
 
                     formatted_size = format_size(int(file_size))
                     return link, formatted_size
                 else:
-                    return None, ""
+                    return False, ""
             else:
-                return None, ""
-    except Exception:
-        return None, ""
-
-def format_size(size_in_bytes):
-    """Formata o tamanho do arquivo em MB ou GB."""
-    if size_in_bytes < 1024 ** 2:
-        return f"{size_in_bytes / 1024:.2f} KB"
-    elif size_in_bytes < 1024 ** 3:
-        return f"{size_in_bytes / (1024 ** 2):.2f} MB"
-    else:
-        return f"{size_in_bytes / (1024 ** 3):.2f} GB"
-
-PROXY_API_URL = "https://api.proxyscrape.com/v4/free-proxy-list/get?request=display_proxies&protocol=http&proxy_format=protocolipport&format=text&anonymity=Elite,Anonymous&timeout=1019"
-
-async def fetch_proxies() -> List[str]:
-    """Obtém uma lista de proxies HTTP do formato texto retornado pela API."""
-    retries = 3  # Número máximo de tentativas
-    for attempt in range(retries):
-        try:
-            async with httpx.AsyncClient(timeout=10) as client:  # Timeout de 10 segundos
-                response = await client.get(PROXY_API_URL)
-                if response.status_code == 200:
-                    proxies = response.text.strip().split("\n")
-                    if proxies:
-                        return [f"http://{proxy}" for proxy in proxies]  # Adicionar prefixo http://
-                raise Exception("Failed to fetch proxies: No proxies in response")
-        except (httpx.ReadTimeout, httpx.RequestError):
-            await asyncio.sleep(2 ** attempt)  # Backoff exponencial
-    raise Exception("Failed to fetch proxies after multiple attempts")
+                return False, ""
+    except Exception as e:
+        raise_if_host_error(e)
+        return False, ""
 
 def fetch_page(scraper, url, retries=3):
     # Updated fetch_page logging with colorama
@@ -273,82 +274,196 @@ def fetch_page(scraper, url, retries=3):
             response = scraper.get(url, headers=HEADERS, timeout=10)
             if response.status_code == 200:
                 return response.text
-            print(f"{Fore.YELLOW}Attempt {attempt + 1} failed for {url} with status {response.status_code}")
+            logger.warning("Attempt %s failed for %s with status %s", attempt + 1, url, response.status_code)
         except Exception as e:
-            print(f"{Fore.RED}Attempt {attempt + 1} failed for {url}: {str(e)}")
+            logger.warning("Attempt %s failed for %s: %s", attempt + 1, url, e)
         asyncio.sleep(2 ** attempt)
-    print(f"{Fore.RED}Failed to fetch {url} after {retries} retries")
+    logger.error("Failed to fetch %s after %s retries", url, retries)
     return None
 
-async def validate_links(game, total_games, current_index):
-    """Valida os links de um jogo e atualiza o tamanho do arquivo."""
-    valid_links_dict, invalid_links_dict, _ = load_progress()  # Load progress once
-    valid_links = []
-    invalid_links = []
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        tasks = []
-        link_mapping = {}  # Mapeia índices para links para exibir logs
-        for index, link in enumerate(game["uris"]):
-            # Skip links already validated
-            if link in valid_links_dict:
-                print(f"{Fore.GREEN}[SKIPPED] {link} - Already in valid_links.json")
-                valid_links.append(link)
-                continue
-            if link in invalid_links_dict:
-                print(f"{Fore.RED}[SKIPPED] {link} - Already in invalid_links.json")
-                invalid_links.append(link)
-                continue
+async def timed_validation(handler, link, client):
+    """Valida o link pelo circuit breaker do host.
 
-            # Add validation tasks for new links
-            if "qiwi.gg" in link:
-                tasks.append(is_valid_qiwi_link(link, client))
-                link_mapping[len(tasks) - 1] = link
-            elif "datanodes.to" in link:
-                tasks.append(is_valid_datanodes_link(link, client))
-                link_mapping[len(tasks) - 1] = link
-            elif "pixeldrain.com" in link:
-                tasks.append(is_valid_pixeldrain_link(link, client))
-                link_mapping[len(tasks) - 1] = link
-            elif "mediafire.com" in link:
-                tasks.append(validate_mediafire_link(client, link))
-                link_mapping[len(tasks) - 1] = link
-            elif "gofile.io" in link:
-                tasks.append(validate_gofile_link_api(link))
-                link_mapping[len(tasks) - 1] = link
-            elif is_valid_link(link):
-                valid_links.append(link)
-
-        # Process validation tasks
-        if tasks:
-            results = await asyncio.gather(*tasks)
-            for task_index, (is_valid, file_size) in enumerate(results):
-                link = link_mapping[task_index]
-                if is_valid:
-                    print(f"{Fore.GREEN}[VALID LINK] {link} - {file_size}")
-                    game["fileSize"] = file_size
-                    valid_links.append(link)
-                    # Save valid link immediately
-                    save_progress({**valid_links_dict, link: file_size}, invalid_links_dict, current_index)
-                else:
-                    print(f"{Fore.RED}[INVALID LINK] {link}")
-                    invalid_links.append(link)
-                    # Save invalid link immediately
-                    save_progress(valid_links_dict, {**invalid_links_dict, link: ""}, current_index)
+    Com o host fora do ar o breaker abre e a validação levanta
+    HostUnavailable na hora (status desconhecido), sem esperar timeouts.
+    """
+    return await guarded(handler.name, lambda: run_validation(handler, link, client))
+
+async def run_validation(handler, link, client):
+    """Valida o link no host dele, respeitando o limite de concorrência e registrando o tempo gasto.
+
+    Com TIERED_PROBES, tenta antes a sonda barata do host e só escala para o
+    validador completo quando ela não consegue decidir.
+    """
+    async with handler.limiter():
+        if TIERED_PROBES and handler.probe is not None:
+            with metrics.timer("validator_tier_seconds", tier=f"{handler.name}_probe"), \
+                    tracing.span("probe", "validate", tier=handler.name, link=link):
+                try:
+                    result = await handler.probe(link, client)
+                except Exception:
+                    result = None
+            metrics.inc("validator_probes_total", host=handler.name,
+                        outcome="escalated" if result is None else "valid" if result[0] else "invalid")
+            if result is not None:
+                return result
+        with metrics.timer("validator_tier_seconds", tier=handler.name), \
+                tracing.span("validate", "validate", tier=handler.name, link=link):
+            proxy = PROXY_POOL.choose(handler.name, link) if PROXY_POOL is not None and handler.proxied else None
+            if proxy is None:
+                return await handler.validator(link, client)
+            start = time()
+            try:
+                result = await handler.validator(link, PROXY_POOL.client(proxy, follow_redirects=True))
+            except HostUnavailable:
+                PROXY_POOL.report(proxy, False)
+                return await handler.validator(link, client)
+            if result[0]:
+                PROXY_POOL.report(proxy, True, time() - start)
+                return result
+            # Inválido pelo proxy: confirma sem proxy, para um proxy ruim não invalidar o link
+            direct = await handler.validator(link, client)
+            PROXY_POOL.report(proxy, not direct[0])
+            return direct
+
+async def validate_cached(handler, link, client):
+    """Valida pelo LINK_CACHE; retorna (None, "") quando o host está fora do ar.
+
+    Só aqui o resultado vira None: o que o validador devolver sem levantar
+    HostUnavailable é válido ou inválido, como o LINK_CACHE já grava.
+    """
+    try:
+        is_valid, file_size = await LINK_CACHE.validate(link, lambda: timed_validation(handler, link, client))
+    except HostUnavailable:
+        return None, ""
+    return bool(is_valid), file_size
+
+def is_usable_link(link):
+    """Link que basta para manter um jogo (1fichier sozinho não basta)."""
+    return "1fichier.com" not in link
 
-                # Log progress
-                print(f"{Fore.CYAN}Progress: Validated {task_index + 1}/{len(tasks)} links for game {current_index + 1}/{total_games}")
+async def validate_until_first_valid(tasks, link_mapping, valid_links, record_result):
+    """Valida os links ao mesmo tempo e para no primeiro válido utilizável, cancelando o resto.
 
-    game["uris"] = valid_links
+    Retorna os links que ficaram sem verificação.
+    """
+    if any(is_usable_link(link) for link in valid_links):
+        # Um link do cache já basta: nenhuma requisição é feita
+        for task in tasks:
+            task.close()
+        return [link_mapping[task_index] for task_index in range(len(tasks))]
+
+    pending = {asyncio.ensure_future(task): task_index for task_index, task in enumerate(tasks)}
+    checked = 0
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                task_index = pending.pop(future)
+                is_valid, file_size = future.result()
+                checked += 1
+                record_result(task_index, is_valid, file_size, checked)
+            if any(is_usable_link(link) for link in valid_links):
+                break
+    finally:
+        for future in pending:
+            future.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    return [link_mapping[task_index] for task_index in pending.values()]
+
+async def validate_links(game, total_games, current_index, client, first_valid=False):
+    """Valida os links de um GameRecord e atualiza o tamanho do arquivo.
+
+    Os resultados vêm do/entram no LINK_CACHE; um link que já está sendo
+    validado por outra task não é validado de novo. Com `first_valid`, para
+    no primeiro link válido (fora o 1fichier) e mantém os links que não
+    chegaram a ser verificados, marcados em `game.unchecked`. Links de hosts
+    fora do ar (status desconhecido) também são mantidos e ficam em
+    `game.unknown`.
+    """
+    valid_links = []
+    invalid_links = []
+    unknown_links = []
+    tasks = []
+    link_mapping = {}  # Mapeia índices para links para exibir logs
+    for index, link in enumerate(game.uris):
+        # Skip links already validated
+        cached = LINK_CACHE.lookup(link)
+        if cached is not None and cached[0]:
+            metrics.inc("validator_links_total", result="cached_valid")
+            log_event(logger, "CACHED_VALID", "[SKIPPED] %s - Already in valid_links.json", link, link=link)
+            valid_links.append(link)
+            continue
+        if cached is not None and cached[0] is None:
+            metrics.inc("validator_links_total", result="cached_unknown")
+            unknown_links.append(link)
+            continue
+        if cached is not None:
+            metrics.inc("validator_links_total", result="cached_invalid")
+            log_event(logger, "CACHED_INVALID", "[SKIPPED] %s - Already in invalid_links.json", link, link=link)
+            invalid_links.append(link)
+            continue
+
+        # Add validation tasks for new links
+        handler = hosts.classify(link)
+        if handler is None:
+            continue
+        if handler.validator is None:
+            valid_links.append(link)  # Host suportado sem validação (1fichier)
+            continue
+        tasks.append(validate_cached(handler, link, client))
+        link_mapping[len(tasks) - 1] = link
+
+    def record_result(task_index, is_valid, file_size, checked):
+        link = link_mapping[task_index]
+        metrics.inc("validator_links_total", result="unknown" if is_valid is None else
+                    "valid" if is_valid else "invalid")
+        if is_valid is None:
+            log_event(logger, "UNKNOWN_LINK", "[UNKNOWN LINK] %s - host unavailable", link, link=link)
+            unknown_links.append(link)
+        elif is_valid:
+            log_event(logger, "VALID_LINK", "[VALID LINK] %s - %s", link, file_size, link=link, size=file_size)
+            game.size_bytes = parse_size(file_size)
+            valid_links.append(link)
+        else:
+            log_event(logger, "INVALID_LINK", "[INVALID LINK] %s", link, link=link)
+            invalid_links.append(link)
+
+        # Log progress
+        log_event(logger, "LINK_PROGRESS", "Progress: Validated %s/%s links for game %s/%s",
+                  checked, len(tasks), current_index + 1, total_games)
+
+    # Process validation tasks
+    unchecked_links = []
+    if tasks and first_valid:
+        unchecked_links = await validate_until_first_valid(tasks, link_mapping, valid_links, record_result)
+        for link in unchecked_links:
+            metrics.inc("validator_links_total", result="unchecked")
+            log_event(logger, "UNCHECKED_LINK", "[UNCHECKED LINK] %s - kept without validation", link, link=link)
+    elif tasks:
+        results = await asyncio.gather(*tasks)
+        for task_index, (is_valid, file_size) in enumerate(results):
+            record_result(task_index, is_valid, file_size, task_index + 1)
+
+    if unchecked_links or unknown_links:
+        # Os links não verificados continuam no jogo, na ordem original
+        kept = set(valid_links) | set(unchecked_links) | set(unknown_links)
+        valid_links = [link for link in game.uris if link in kept]
+    game.unknown = tuple(unknown_links)
+    game.unchecked = tuple(unchecked_links)
     if len(valid_links) == 1 and "1fichier.com" in valid_links[0]:
-        game["uris"] = []
+        valid_links = []
+    game.set_uris(valid_links)
     # Log game validation summary with correct count
-    print(f"{Fore.BLUE}{current_index + 1}/{total_games} games validated")
+    log_event(logger, "GAME_VALIDATED", "%s/%s games validated", current_index + 1, total_games,
+              title=game.title, valid_links=len(valid_links))
     return game
 
 def decide_game_to_keep(existing_game, new_game):
-    """Decide qual jogo manter entre dois duplicados."""
-    existing_links = [link for link in existing_game["uris"] if is_valid_link(link)]
-    new_links = [link for link in new_game["uris"] if is_valid_link(link)]
+    """Decide qual jogo manter entre dois duplicados (GameRecord)."""
+    existing_links = [link for link in existing_game.uris if is_valid_link(link)]
+    new_links = [link for link in new_game.uris if is_valid_link(link)]
 
     # Priorizar jogos com links válidos
     if not new_links and existing_links:
@@ -357,20 +472,14 @@ def decide_game_to_keep(existing_game, new_game):
         return new_game
 
     # Priorizar jogos com versão multiplayer
-    existing_is_multiplayer = "multiplayer" in existing_game["title"].lower() or "0xdeadcode" in existing_game["title"].lower()
-    new_is_multiplayer = "multiplayer" in new_game["title"].lower() or "0xdeadcode" in new_game["title"].lower()
-
-    if existing_is_multiplayer and not new_is_multiplayer:
+    if existing_game.multiplayer and not new_game.multiplayer:
         return existing_game
-    if new_is_multiplayer and not existing_is_multiplayer:
+    if new_game.multiplayer and not existing_game.multiplayer:
         return new_game
 
     # Priorizar jogos mais novos
-    existing_date = datetime.fromisoformat(existing_game["uploadDate"]) if existing_game.get("uploadDate") else None
-    new_date = datetime.fromisoformat(new_game["uploadDate"]) if new_game.get("uploadDate") else None
-
-    if existing_date and new_date:
-        return new_game if new_date > existing_date else existing_game
+    if existing_game.upload_ts and new_game.upload_ts:
+        return new_game if new_game.upload_ts > existing_game.upload_ts else existing_game
 
     return existing_game
 
@@ -393,83 +502,234 @@ class ProgressTracker:
         eta = str(timedelta(seconds=math.ceil(eta_seconds)))
         
         percent = (self.current / self.total) * 100
-        print(f"{Fore.CYAN}Progress: {percent:.1f}% ({self.current}/{self.total}) - ETA: {eta}")
-
-async def process_duplicates(games):
-    """Processa duplicatas com processamento em paralelo e tracking de progresso."""
-    # Load previous progress
-    valid_links_dict, invalid_links_dict, last_processed = load_progress()
-    
-    grouped_games = {}
+        log_event(logger, "PROGRESS", "Progress: %.1f%% (%s/%s) - ETA: %s", percent, self.current, self.total, eta,
+                  current=self.current, total=self.total, eta_seconds=math.ceil(eta_seconds))
+
+# Validadores de cada host; os lambdas resolvem o nome na hora da chamada
+hosts.set_validator("qiwi", lambda link, client: is_valid_qiwi_link(link, client),
+                    probe=lambda link, client: probes.probe_page(client, link, probes.QIWI_RULE))
+hosts.set_validator("datanodes", lambda link, client: is_valid_datanodes_link(link, client),
+                    probe=lambda link, client: probes.probe_page(client, link, probes.DATANODES_RULE))
+hosts.set_validator("pixeldrain", lambda link, client: is_valid_pixeldrain_link(link, client))
+# O MediaFire manda arquivos removidos para error.php: detectável sem abrir o Selenium
+hosts.set_validator("mediafire", lambda link, client: validate_mediafire_link(client, link),
+                    probe=lambda link, client: probes.probe_redirect(client, link, "error.php"))
+# A API do Gofile é acessada pelo Tor, que tem o próprio breaker
+hosts.set_validator("gofile", lambda link, client: guarded("tor", lambda: validate_gofile_link_api(link)))
+
+async def validate_candidate(game, client, tracker):
+    validated = await validate_links(game, total_games=tracker.total, current_index=tracker.current,
+                                     client=client, first_valid=FIRST_VALID)
+    tracker.update()
+    return validated
+
+async def first_accepted(candidates, accepted, client, tracker):
+    """Valida os candidatos em ordem de preferência e retorna o primeiro aceito (ou None).
+
+    Com SPECULATIVE_CANDIDATES = K, os K próximos candidatos são validados
+    ao mesmo tempo; o vencedor só é decidido quando todos os anteriores já
+    terminaram, então o resultado é o mesmo da validação em série, e as
+    validações restantes são canceladas.
+    """
+    window = max(1, SPECULATIVE_CANDIDATES)
+    in_flight = {}
+    try:
+        for index in range(len(candidates)):
+            for ahead in range(index, min(index + window, len(candidates))):
+                if ahead not in in_flight:
+                    in_flight[ahead] = asyncio.ensure_future(
+                        validate_candidate(candidates[ahead], client, tracker))
+            validated = await in_flight.pop(index)
+            if accepted(index, validated):
+                return validated
+        return None
+    finally:
+        for future in in_flight.values():
+            future.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight.values(), return_exceptions=True)
+
+class GroupUndecided(Exception):
+    """Um candidato ficou só com links de status desconhecido antes de aparecer uma cópia válida."""
+
+def decided(accepted):
+    """Envolve o critério de aceite: um candidato sem nenhum link confirmado, mas com links
+    de hosts fora do ar, interrompe a escolha em vez de ser descartado."""
+    def check(index, game):
+        if game.unknown and all(link in game.unknown for link in game.uris):
+            raise GroupUndecided()
+        return accepted(index, game)
+    return check
+
+async def decide_game_group(group, client, tracker):
+    """Escolhe o jogo mantido de um grupo de duplicatas. Retorna (mantidos, removidos).
+
+    Se a escolha esbarra num candidato de status desconhecido (host fora do
+    ar) antes de achar uma cópia válida, os links do grupo são restaurados e
+    GroupUndecided é levantada.
+    """
+    # Sort games by upload date (newest first)
+    sorted_games = sorted(group, key=attrgetter("upload_ts"), reverse=True)
+    # Links antes da validação: os candidatos especulativos ainda não decididos não podem influenciar
+    original_uris = [game.uris for game in sorted_games]
+    try:
+        return await choose_kept_game(group, sorted_games, original_uris, client, tracker)
+    except GroupUndecided:
+        for game, uris in zip(sorted_games, original_uris):
+            game.set_uris(uris)
+        metrics.inc("validator_groups_total", outcome="undecided")
+        log_event(logger, "UNDECIDED", "Keeping group %s unchanged: host unavailable", sorted_games[0].title,
+                  title=sorted_games[0].title, size=len(group))
+        raise
+
+async def validate_game_group(group, client, tracker):
+    """Como decide_game_group, mas um grupo sem decisão é mantido sem mudanças."""
+    try:
+        return await decide_game_group(group, client, tracker)
+    except GroupUndecided:
+        return list(group), []
+
+async def choose_kept_game(group, sorted_games, original_uris, client, tracker):
+    # Prioritize multiplayer versions
+    multiplayer_games = [g for g in sorted_games if g.multiplayer]
+    if multiplayer_games:
+        # Validate multiplayer games first
+        validated = await first_accepted(multiplayer_games, decided(lambda index, game: bool(game.uris)),
+                                         client, tracker)
+        if validated is not None:
+            return [validated], [g for g in group if g is not validated]
+        # If no valid multiplayer game, remove all
+        return [], list(group)
+
+    def accepted(index, game):
+        if not game.uris:
+            return False
+        # Check if the game has only 1fichier links
+        if len(game.uris) == 1 and "1fichier.com" in game.uris[0]:
+            # Skip if there are other games with valid links besides 1fichier
+            return not any(
+                position != index and any(is_usable_link(link) for link in uris)
+                for position, uris in enumerate(
+                    [g.uris for g in sorted_games[:index]] + original_uris[index:]))
+        return True
+
+    # Validate non-multiplayer games
+    validated = await first_accepted(sorted_games, decided(accepted), client, tracker)
+    if validated is not None:
+        return [validated], [g for g in group if g is not validated]
+
+    # If no valid game, remove all
+    return [], list(group)
+
+def group_value(key, group, validated_at, now):
+    """Valor esperado de validar o grupo: tempo desde a última validação vezes o número de
+    cópias do título (popularidade). Grupos nunca validados vêm antes de todos os outros."""
+    return (now - validated_at.get(key, 0)) * len(group)
+
+def load_validated_groups():
+    return load_json(VALIDATED_GROUPS_JSON).get("groups", {})
+
+async def process_duplicates(games, group_filter=None):
+    """Processa duplicatas com processamento em paralelo e tracking de progresso.
+
+    Retorna {chave do grupo: (jogos mantidos, jogos removidos)}, já como
+    dicts do JSON; internamente cada jogo é um GameRecord. `group_filter`
+    recebe a chave de cada grupo e permite validar só uma parte do catálogo.
+
+    Com DEADLINE, os grupos mais valiosos (group_value) são validados
+    primeiro e os que não couberem no tempo são mantidos sem mudanças.
+    """
+    import httpx
     tracker = ProgressTracker(len(games))
-    tracker.current = last_processed  # Resume from last position
+    tracker.current = open_link_cache()  # Resume from last position
     
-    # Group games by normalized title
-    for game in games:
-        normalized_title = normalize_title(game["title"])
-        if normalized_title not in grouped_games:
-            grouped_games[normalized_title] = []
-        grouped_games[normalized_title].append(game)
-
-    valid_games = []
-    removed_games = []
+    with tracing.profile("group_titles"):
+        records = [GameRecord.from_dict(game) for game in games]
+        source = {id(record): game for record, game in zip(records, games)}
+        grouped_games = group_games(records, get_title=attrgetter("title"))
+    if group_filter is not None:
+        grouped_games = {key: group for key, group in grouped_games.items() if group_filter(key)}
+    validated_at = load_validated_groups()
+    if DEADLINE is not None:
+        now = time()
+        grouped_games = dict(sorted(grouped_games.items(), reverse=True,
+                                    key=lambda item: group_value(item[0], item[1], validated_at, now)))
+
+    decisions = {}
+    undecided = set()  # Grupos mantidos sem decisão: não contam como validados
     
-    async def process_game_group(group_games):
-        nonlocal valid_games, removed_games
+    async def process_game_group(key, group_games):
         async with tracker.semaphore:
-            # Sort games by upload date (newest first)
-            sorted_games = sorted(
-                group_games,
-                key=lambda g: datetime.fromisoformat(g.get("uploadDate", "1970-01-01T00:00:00")),
-                reverse=True
-            )
-
-            # Prioritize multiplayer versions
-            multiplayer_games = [g for g in sorted_games if "multiplayer" in g["title"].lower() or "0xdeadcode" in g["title"].lower()]
-            if multiplayer_games:
-                # Validate multiplayer games first
-                for game in multiplayer_games:
-                    validated = await validate_links(game, total_games=len(games), current_index=tracker.current)
-                    tracker.update()
-                    if validated["uris"]:
-                        valid_games.append(validated)
-                        removed_games.extend([g for g in group_games if g != validated])
-                        return
-                # If no valid multiplayer game, remove all
-                removed_games.extend(group_games)
-                return
-
-            # Validate non-multiplayer games
-            for game in sorted_games:
-                validated = await validate_links(game, total_games=len(games), current_index=tracker.current)
-                tracker.update()
-                if validated["uris"]:
-                    # Check if the game has only 1fichier links
-                    if len(validated["uris"]) == 1 and "1fichier.com" in validated["uris"][0]:
-                        # Skip if there are other games with valid links besides 1fichier
-                        other_valid_games = [
-                            g for g in sorted_games if g != game and any("1fichier.com" not in link for link in g["uris"])
-                        ]
-                        if other_valid_games:
-                            continue
-                    valid_games.append(validated)
-                    removed_games.extend([g for g in group_games if g != validated])
-                    return
-
-            # If no valid game, remove all
-            removed_games.extend(group_games)
+            with metrics.timer("validator_group_seconds"), \
+                    tracing.span("group", "validate", title=group_games[0].title, size=len(group_games)):
+                try:
+                    kept, removed = await decide_game_group(group_games, client, tracker)
+                except GroupUndecided:
+                    kept, removed = list(group_games), []
+                    undecided.add(key)
+            decisions[key] = ([game.to_dict() for game in kept], [game.to_dict() for game in removed])
+
+    async def flush_periodically():
+        while True:
+            await asyncio.sleep(CACHE_FLUSH_INTERVAL)
+            flush_link_cache(tracker.current)
 
     # Process groups in batches
-    tasks = []
-    for group in grouped_games.values():
-        tasks.append(process_game_group(group))
-        if len(tasks) >= BATCH_SIZE:
-            await asyncio.gather(*tasks)
-            tasks = []
-    
-    if tasks:
-        await asyncio.gather(*tasks)
+    flusher = asyncio.ensure_future(flush_periodically())
+    try:
+        with tracing.profile("validate"):
+            # Um cliente para a execução inteira: validações compartilhadas entre grupos sobrevivem ao grupo que as iniciou
+            async with httpx.AsyncClient(follow_redirects=True,
+                                         event_hooks=metrics.httpx_event_hooks("validator")) as client:
+                tasks = []
+                for key, group in grouped_games.items():
+                    if DEADLINE is not None and not DEADLINE.accepting():
+                        break
+                    tasks.append(process_game_group(key, group))
+                    if len(tasks) >= BATCH_SIZE:
+                        await finish_within(DEADLINE, asyncio.gather(*tasks))
+                        tasks = []
+
+                if tasks:
+                    await finish_within(DEADLINE, asyncio.gather(*tasks))
+    finally:
+        flusher.cancel()
+        flush_link_cache(tracker.current)
+
+    now = time()
+    validated_at.update((key, now) for key in decisions if key not in undecided)
+    save_json(VALIDATED_GROUPS_JSON, {"groups": validated_at})
+    skipped = [key for key in grouped_games if key not in decisions]
+    if skipped:
+        # Grupos que não couberam no orçamento: os dicts originais, sem passar pela validação
+        metrics.inc("validator_groups_total", len(skipped), outcome="skipped")
+        logger.warning("Time budget: keeping %s unvalidated groups unchanged", len(skipped))
+        for key in skipped:
+            decisions[key] = ([source[id(game)] for game in grouped_games[key]], [])
+
+    return decisions
+
+def open_link_cache():
+    """Cria o LINK_CACHE a partir do progresso salvo e retorna o último índice processado."""
+    global LINK_CACHE
+    valid_links_dict, invalid_links_dict, last_processed = load_progress()
+    LINK_CACHE = LinkCache(valid_links_dict, invalid_links_dict)
+    return last_processed
+
+def flush_link_cache(current_index):
+    """Grava o LINK_CACHE em disco se ele mudou desde a última gravação."""
+    if LINK_CACHE is not None and LINK_CACHE.dirty:
+        LINK_CACHE.dirty = False
+        save_progress(LINK_CACHE.valid, LINK_CACHE.invalid, current_index)
 
+def flatten_decisions(decisions):
+    """Junta as decisões por grupo em (jogos válidos, jogos removidos), em ordem de chave."""
+    valid_games = []
+    removed_games = []
+    for key in sorted(decisions):
+        kept, removed = decisions[key]
+        valid_games.extend(kept)
+        removed_games.extend(removed)
     return valid_games, removed_games
 
 class DriverPool:
@@ -481,6 +741,10 @@ class DriverPool:
             self.pool.put(driver)
         
     def _create_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
         chrome_options = Options()
         chrome_options.add_argument('--headless')
         chrome_options.add_argument('--no-sandbox')
@@ -500,30 +764,45 @@ class DriverPool:
             driver = self.pool.get()
             driver.quit()
 
-# Inicializar o pool de WebDrivers
-driver_pool = DriverPool(size=3)
+# O pool de WebDrivers só é criado no primeiro uso, para que importar o módulo
+# (benchmarks, ferramentas auxiliares) não abra instâncias do Chrome.
+driver_pool = None
+driver_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    global driver_pool
+    with driver_pool_lock:  # check_mediafire_link roda em threads do executor
+        if driver_pool is None:
+            driver_pool = DriverPool(size=3)
+    return driver_pool
 
 def rotate_tor_identity():
     """Solicita um novo ip ao Tor enviando o sinal NEWNYM."""
+    from stem import Signal
+    from stem.control import Controller
     try:
         with Controller.from_port(port=9051) as controller:
             controller.authenticate()  # Ajuste se for necessário senha
             controller.signal(Signal.NEWNYM)
-            print(f"{Fore.BLUE}[TOR] New tor identity issued.")
+            log_event(logger, "TOR", "[TOR] New tor identity issued.")
     except Exception:
-        print(f"{Fore.RED}[TOR ERROR] Failed to rotate Tor identity")
+        logger.error("[TOR ERROR] Failed to rotate Tor identity")
 
 async def validate_gofile_link_tor(link: str, retries: int = 3) -> Tuple[bool, str]:
     """Valida um link do Gofile usando Tor com IP rotativo.
     Usa BeautifulSoup para scraping da página para extrair o tamanho do arquivo (GB ou MB)
     e rejeita links com palavras indesejadas como 'torrent', 'this content does not exist' ou 'cold'."""
+    import httpx
+    from bs4 import BeautifulSoup
+    from httpx_socks import AsyncProxyTransport
     proxy_url = "socks5://127.0.0.1:9050"
     transport = AsyncProxyTransport.from_url(proxy_url)
     attempt = 0
     while attempt < retries:
         try:
             rotate_tor_identity()
-            async with httpx.AsyncClient(transport=transport, follow_redirects=True) as client:
+            async with httpx.AsyncClient(transport=transport, follow_redirects=True,
+                                         event_hooks=metrics.httpx_event_hooks("validator")) as client:
                 response = await client.get(link, timeout=10)
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.text, 'html.parser')
@@ -536,21 +815,23 @@ async def validate_gofile_link_tor(link: str, retries: int = 3) -> Tuple[bool, s
                     if not file_size:
                         return False, ""
                     return True, file_size
-                else:
-                    return False, ""
-        except Exception:
+                check_status(response.status_code)
+                return False, ""
+        except Exception as e:
             if "Proxy connection timed out" in str(e):
                 await asyncio.sleep(2 ** attempt)
                 attempt += 1
             else:
+                raise_if_host_error(e)
                 return False, ""
-    return False, ""
+    raise HostUnavailable("Tor proxy connection timed out")
 
 WT = "4fd6sg89d7s6"  # Constante para uso na API do Gofile
 GOFILE_TOKEN = None
 
 async def authorize_gofile():
     """Authorize with Gofile API and store the token globally."""
+    import httpx
     global GOFILE_TOKEN
     try:
         async with httpx.AsyncClient(timeout=10) as client:
@@ -593,9 +874,11 @@ async def cleanup_gofile_timeouts(max_age_hours=24):
             with open(GOFILE_TIMEOUTS_JSON, "w", encoding="utf-8") as f:
                 json.dump(data, f, ensure_ascii=False, indent=4)
         except Exception as e:
-            print(f"{Fore.RED}Error cleaning up timeouts: {str(e)}")
+            logger.error("Error cleaning up timeouts: %s", e)
 
 async def validate_gofile_link_api(link: str, retries: int = 3) -> Tuple[bool, str]:
+    import httpx
+    from httpx_socks import AsyncProxyTransport
     await cleanup_gofile_timeouts()
     m = re.search(r"gofile\.io/d/([^/?]+)", link)
     if not m:
@@ -610,13 +893,18 @@ async def validate_gofile_link_api(link: str, retries: int = 3) -> Tuple[bool, s
     headers = {**HEADERS, "Authorization": f"Bearer {GOFILE_TOKEN}"}
     transport = AsyncProxyTransport.from_url("socks5://127.0.0.1:9050")
     last_error = ""
+    host_error = False  # A última tentativa falhou por rede/Tor/status do servidor, não pelo arquivo
     
     # Add rate limiting delay
     await asyncio.sleep(1)
     
     for attempt in range(retries):
+        if attempt:
+            metrics.inc("validator_retries_total", host="gofile.io")
+        host_error = False
         try:
-            async with httpx.AsyncClient(timeout=15, transport=transport) as client:
+            async with httpx.AsyncClient(timeout=15, transport=transport,
+                                         event_hooks=metrics.httpx_event_hooks("validator")) as client:
                 response = await client.get(api_url, headers=headers)
                 
             if response.status_code == 200:
@@ -640,24 +928,18 @@ async def validate_gofile_link_api(link: str, retries: int = 3) -> Tuple[bool, s
                                 if size_bytes and str(size_bytes).isdigit():
                                     bytes_val = int(size_bytes)
                                     if bytes_val > 0:
-                                        if bytes_val < 1024:
-                                            size_str = f"{bytes_val} B"
-                                        elif bytes_val < 1024 ** 2:
-                                            size_str = f"{(bytes_val / 1024):.2f} KB"
-                                        elif bytes_val < 1024 ** 3:
-                                            size_str = f"{(bytes_val / (1024 ** 2)):.2f} MB"
-                                        else:
-                                            size_str = f"{(bytes_val / (1024 ** 3)):.2f} GB"
-                                        return True, size_str
+                                        return True, format_size(bytes_val)
                 
                 except json.JSONDecodeError:
                     last_error = "Invalid JSON response"
                     continue
                     
             last_error = f"Status code {response.status_code}"
+            host_error = response.status_code in HOST_ERROR_STATUSES
             
         except Exception as e:
             last_error = str(e)
+            host_error = is_host_error(e)
             if "timed out" in last_error.lower():
                 await asyncio.sleep(2 ** attempt)
                 continue
@@ -667,32 +949,35 @@ async def validate_gofile_link_api(link: str, retries: int = 3) -> Tuple[bool, s
             await asyncio.sleep(2 ** attempt)
             
     save_gofile_timeout(link, last_error)
+    if host_error:
+        raise HostUnavailable(last_error)
     return False, ""
 
 def log_game_status(status, page, game_title, error=""):
     # Updated log output with colorama stamps for all statuses.
     if status == "NEW":
-        print(f"{Fore.GREEN}[VALID] Page {page}: {game_title} - New game added")
+        log_event(logger, "NEW", "[VALID] Page %s: %s - New game added", page, game_title)
     elif status == "UPDATED":
-        print(f"{Fore.YELLOW}[UPDATED] Page {page}: {game_title}")
+        log_event(logger, "UPDATED", "[UPDATED] Page %s: %s", page, game_title)
     elif status == "IGNORED":
-        print(f"{Fore.CYAN}[SKIPPED] Page {page}: {game_title} - Duplicate or ignored")
+        log_event(logger, "IGNORED", "[SKIPPED] Page %s: %s - Duplicate or ignored", page, game_title)
     elif status == "NO_LINKS":
-        print(f"{Fore.RED}[INVALID] Page {page}: {game_title} - No links found")
+        log_event(logger, "NO_LINKS", "[INVALID] Page %s: %s - No links found", page, game_title)
     elif status == "ERROR":
-        print(f"{Fore.MAGENTA}[ERROR] Page {page}: {game_title} - {error}")
+        log_event(logger, "ERROR", "[ERROR] Page %s: %s - %s", page, game_title, error, level=logging.ERROR)
 
 def save_progress(valid_links, invalid_links, current_index):
     """Save validation progress to files."""
     try:
-        with open(VALID_LINKS_JSON, "w", encoding="utf-8") as f:
-            json.dump(valid_links, f, ensure_ascii=False, indent=4)
-        with open(INVALID_LINKS_JSON, "w", encoding="utf-8") as f:
-            json.dump(invalid_links, f, ensure_ascii=False, indent=4)
-        with open(PROGRESS_JSON, "w", encoding="utf-8") as f:
-            json.dump({"last_index": current_index}, f)
+        with metrics.timer("validator_disk_seconds", op="save_progress"), tracing.span("save", "save"):
+            with open(VALID_LINKS_JSON, "w", encoding="utf-8") as f:
+                json.dump(valid_links, f, ensure_ascii=False, indent=4)
+            with open(INVALID_LINKS_JSON, "w", encoding="utf-8") as f:
+                json.dump(invalid_links, f, ensure_ascii=False, indent=4)
+            with open(PROGRESS_JSON, "w", encoding="utf-8") as f:
+                json.dump({"last_index": current_index}, f)
     except Exception as e:
-        print(f"{Fore.RED}Error saving progress: {str(e)}")
+        logger.error("Error saving progress: %s", e)
 
 def load_progress():
     """Load validation progress from files."""
@@ -711,24 +996,180 @@ def load_progress():
             with open(PROGRESS_JSON, "r", encoding="utf-8") as f:
                 last_index = json.load(f)["last_index"]
     except Exception as e:
-        print(f"{Fore.YELLOW}Warning loading progress: {str(e)}")
+        logger.warning("Warning loading progress: %s", e)
         
     return valid_links, invalid_links, last_index
 
-async def main():
-    # Carregar o JSON original
-    shisuy_data = load_json(SHISUY_SOURCE_JSON)
-    games = shisuy_data.get("downloads", [])
+def shard_of(key, shard_count):
+    """Shard de um grupo de títulos; estável entre processos e máquinas (ao contrário de hash())."""
+    return int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16) % shard_count
+
+def shard_prefix(index, count):
+    return os.path.join(VALIDATION_SHARDS_DIR, f"shard-{index}-of-{count}")
+
+def use_shard_cache(index, count):
+    """Aponta o cache de validação para arquivos do shard, semeados com o cache principal."""
+    global VALID_LINKS_JSON, INVALID_LINKS_JSON, PROGRESS_JSON, VALIDATED_GROUPS_JSON
+    os.makedirs(VALIDATION_SHARDS_DIR, exist_ok=True)
+    prefix = shard_prefix(index, count)
+    shard_files = [(VALID_LINKS_JSON, f"{prefix}.valid_links.json"), (INVALID_LINKS_JSON, f"{prefix}.invalid_links.json"),
+                   (VALIDATED_GROUPS_JSON, f"{prefix}.validated_groups.json")]
+    for shared_file, shard_file in shard_files:
+        if not os.path.exists(shard_file) and os.path.exists(shared_file):
+            shutil.copyfile(shared_file, shard_file)
+    VALID_LINKS_JSON, INVALID_LINKS_JSON, VALIDATED_GROUPS_JSON = (shard_file for _, shard_file in shard_files)
+    PROGRESS_JSON = f"{prefix}.progress.json"
+
+async def run_validation_shard(games, index, count):
+    """Valida só os grupos do shard `index` e grava as decisões e o cache em um arquivo próprio."""
+    use_shard_cache(index, count)
+    decisions = await process_duplicates(games, group_filter=lambda key: shard_of(key, count) == index)
+    valid_links, invalid_links, _ = load_progress()
+    save_json(f"{shard_prefix(index, count)}.json", {
+        "valid_links": valid_links,
+        "invalid_links": invalid_links,
+        "decisions": {key: {"keep": kept, "removed": removed} for key, (kept, removed) in decisions.items()},
+    })
+    logger.info("Shard %s/%s finished: %s groups", index, count, len(decisions))
+
+def merge_validation_shards(count):
+    """Combina os arquivos dos shards no cache de validação e retorna (válidos, removidos)."""
+    valid_links, invalid_links, decisions = {}, {}, {}
+    validated_at = load_validated_groups()
+    for index in range(count):
+        with open(f"{shard_prefix(index, count)}.json", "r", encoding="utf-8") as f:
+            shard = json.load(f)
+        for key, validated in load_json(f"{shard_prefix(index, count)}.validated_groups.json").get("groups", {}).items():
+            validated_at[key] = max(validated, validated_at.get(key, 0))
+        valid_links.update(shard["valid_links"])
+        invalid_links.update(shard["invalid_links"])
+        for key, decision in shard["decisions"].items():
+            decisions[key] = (decision["keep"], decision["removed"])
+    # Um link validado como válido em qualquer shard prevalece
+    for link in valid_links:
+        invalid_links.pop(link, None)
+    with open(VALID_LINKS_JSON, "w", encoding="utf-8") as f:
+        json.dump(valid_links, f, ensure_ascii=False, indent=4)
+    with open(INVALID_LINKS_JSON, "w", encoding="utf-8") as f:
+        json.dump(invalid_links, f, ensure_ascii=False, indent=4)
+    save_json(VALIDATED_GROUPS_JSON, {"groups": validated_at})
+    return flatten_decisions(decisions)
+
+def run_shard_workers(count, args):
+    """Executa um processo por shard e espera todos terminarem."""
+    workers = []
+    for index in range(count):
+        command = [sys.executable, os.path.abspath(__file__), "--shard", f"{index}/{count}",
+                   "--log-level", args.log_level, "--log-sample", str(args.log_sample)]
+        if args.tiered:
+            command.append("--tiered")
+        if args.speculative:
+            command += ["--speculative", str(args.speculative)]
+        if args.first_valid:
+            command.append("--first-valid")
+        if args.log_json:
+            command.append("--log-json")
+        if args.proxies:
+            command += ["--proxies", args.proxies]
+        if DEADLINE is not None:
+            command += ["--time-budget", str(max(1, int(DEADLINE.remaining())))]
+        workers.append(subprocess.Popen(command))
+    failed = [index for index, worker in enumerate(workers) if worker.wait() != 0]
+    if failed:
+        raise RuntimeError(f"Validation shards failed: {failed}")
+
+async def setup_proxy_pool(source):
+    global PROXY_POOL
+    PROXY_POOL = await open_pool(source)
+
+def parse_shard(value):
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected INDEX/COUNT, e.g. 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError("INDEX must be between 0 and COUNT - 1")
+    return index, count
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Valida os links do shisuyssource.json e remove duplicatas.")
+    parser.add_argument("--metrics-file", help="Grava as métricas no formato texto do Prometheus.")
+    parser.add_argument("--summary-file", help="Grava um resumo JSON da execução.")
+    add_logging_arguments(parser)
+    tracing.add_tracing_arguments(parser)
+    parser.add_argument("--speculative", type=int, default=0, metavar="K",
+                        help="Valida até K cópias de um grupo ao mesmo tempo (o resultado é o mesmo da validação em série).")
+    parser.add_argument("--first-valid", action="store_true",
+                        help="Para no primeiro link válido de cada cópia; os links não verificados continuam "
+                             "no jogo sem validação.")
+    parser.add_argument("--tiered", action="store_true",
+                        help="Tenta sondas baratas (início da página, HEAD) antes da validação completa.")
+    parser.add_argument("--proxies", metavar="SOURCE",
+                        help="Espalha as validações por proxies: \"proxyscrape\" ou um arquivo com um por linha.")
+    add_time_budget_argument(parser)
+    shard = parser.add_mutually_exclusive_group()
+    shard.add_argument("--shard", type=parse_shard, metavar="INDEX/COUNT",
+                       help="Valida só os grupos deste shard e grava o resultado em validation_shards/.")
+    shard.add_argument("--merge-shards", type=int, metavar="COUNT",
+                       help="Combina os resultados de COUNT shards no cache e no shisuyssource.json.")
+    shard.add_argument("--shard-workers", type=int, metavar="COUNT",
+                       help="Executa COUNT processos de shard e combina os resultados.")
+    return parser.parse_args(argv)
+
+async def main(argv=None):
+    global TIERED_PROBES, SPECULATIVE_CANDIDATES, FIRST_VALID, DEADLINE
+    args = parse_args(argv)
+    if args.time_budget:
+        DEADLINE = Deadline(args.time_budget)
+    TIERED_PROBES = args.tiered
+    SPECULATIVE_CANDIDATES = args.speculative
+    FIRST_VALID = args.first_valid
+    setup_logging_from_args(args)
+    tracing.setup_tracing_from_args(args)
+    monitor = tracing.TRACER.start_monitor()
+    if args.proxies and not args.shard_workers and not args.merge_shards:
+        await setup_proxy_pool(args.proxies)
+    if args.shard:
+        shisuy_data = load_json(SHISUY_SOURCE_JSON)
+        await run_validation_shard(shisuy_data.get("downloads", []), *args.shard)
+        if monitor:
+            monitor.cancel()
+        if PROXY_POOL is not None:
+            await PROXY_POOL.aclose()
+        tracing.write_trace_from_args(args)
+        return
+
+    if args.shard_workers:
+        run_shard_workers(args.shard_workers, args)
+        valid_games, removed_games = merge_validation_shards(args.shard_workers)
+    elif args.merge_shards:
+        valid_games, removed_games = merge_validation_shards(args.merge_shards)
+    else:
+        # Carregar o JSON original
+        shisuy_data = load_json(SHISUY_SOURCE_JSON)
+        games = shisuy_data.get("downloads", [])
 
-    # Processar duplicatas
-    valid_games, removed_games = await process_duplicates(games)
+        # Processar duplicatas
+        valid_games, removed_games = flatten_decisions(await process_duplicates(games))
 
     # Salvar resultados
-    save_json(SOURCE_JSON, {"downloads": valid_games})
-    save_json(BLACKLIST_JSON, {"removed": removed_games})
+    with tracing.span("save_results", "save"), tracing.profile("save"):
+        save_json(SOURCE_JSON, {"downloads": valid_games})
+        save_json(BLACKLIST_JSON, {"removed": removed_games})
     total_valid = len(valid_games)
     total_removed = len(removed_games)
-    print(f"Summary: Validated = {total_valid} games; Removed = {total_removed} games.")
+    logger.info("Summary: Validated = %s games; Removed = %s games.", total_valid, total_removed)
+
+    if args.metrics_file:
+        metrics.REGISTRY.write_prometheus(args.metrics_file)
+    if args.summary_file:
+        metrics.REGISTRY.write_summary(args.summary_file, tool="validator",
+                                       validated_games=total_valid, removed_games=total_removed)
+    if monitor:
+        monitor.cancel()
+    if PROXY_POOL is not None:
+        await PROXY_POOL.aclose()
+    tracing.write_trace_from_args(args)
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,102 @@
+"""Agendamento adaptativo das categorias do crawl.
+
+A cada execução o scraper registra, por categoria, quantos jogos novos
+apareceram e em que página estava o mais profundo deles. Essas observações
+viram duas médias móveis (EWMA) persistidas em SCHEDULE_JSON: a taxa de
+jogos novos por hora e a profundidade útil. Com elas o plano de uma execução
+decide quais categorias já valem uma nova visita, até que página ir em cada
+uma e em que ordem gastar o orçamento de requisições, começando pelas
+categorias com mais jogos novos esperados.
+"""
+import json
+import math
+import os
+import time
+
+SCHEDULE_JSON = "crawl_schedule.json"
+EWMA_ALPHA = 0.3           # Peso da observação mais recente nas médias
+MIN_REVISIT_HOURS = 1      # Nenhuma categoria é visitada mais de uma vez por hora
+MAX_REVISIT_HOURS = 24 * 7  # Toda categoria é revisitada ao menos uma vez por semana
+DEPTH_MARGIN = 1.5         # Folga sobre a profundidade média em que aparecem jogos novos
+MIN_DEPTH = 2
+INITIAL_RATE = 1.0         # Jogos novos/hora assumidos até a segunda visita (revisita logo)
+DEFAULT_PROBE_PAGES = 5    # Profundidade de uma categoria sem histórico quando há orçamento
+
+
+class CrawlScheduler:
+    def __init__(self, path=SCHEDULE_JSON):
+        self.path = path
+        self.categories = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.categories = json.load(f).get("categories", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def revisit_hours(self, stats):
+        """Intervalo entre visitas: o tempo esperado até aparecer um jogo novo."""
+        rate = stats.get("new_per_hour", 0)
+        if rate <= 0:
+            return MAX_REVISIT_HOURS
+        return min(MAX_REVISIT_HOURS, max(MIN_REVISIT_HOURS, 1 / rate))
+
+    def depth(self, stats):
+        return max(MIN_DEPTH, math.ceil(stats.get("depth", 0) * DEPTH_MARGIN) + 1)
+
+    def plan(self, categories, budget=None, now=None):
+        """Retorna [(categoria, máximo de páginas ou None)] na ordem de visita.
+
+        Categorias nunca vistas são percorridas inteiras (None) e vêm
+        primeiro; as demais só entram quando o intervalo de revisita venceu.
+        `budget` limita o total de páginas de listagem da execução; com ele,
+        uma categoria nunca vista recebe só DEFAULT_PROBE_PAGES páginas, para
+        não gastar o orçamento inteiro e deixar as seguintes sem nada.
+        """
+        now = now or time.time()
+        candidates = []
+        for category in categories:
+            stats = self.categories.get(category)
+            if stats is None:
+                candidates.append((math.inf, category, None))
+                continue
+            elapsed = (now - stats["last_crawled"]) / 3600
+            if elapsed < self.revisit_hours(stats):
+                continue
+            expected = stats.get("new_per_hour", 0) * min(elapsed, MAX_REVISIT_HOURS)
+            candidates.append((expected, category, self.depth(stats)))
+        # sort estável: empates mantêm a ordem original de BASE_URLS
+        candidates.sort(key=lambda candidate: -candidate[0])
+
+        plan = []
+        remaining = budget
+        for _, category, max_pages in candidates:
+            if remaining is not None:
+                if remaining <= 0:
+                    break
+                max_pages = min(DEFAULT_PROBE_PAGES if max_pages is None else max_pages, remaining)
+                remaining -= max_pages
+            plan.append((category, max_pages))
+        return plan
+
+    def record(self, category, new_items, deepest_new_page, max_pages=None, now=None):
+        """Atualiza as médias da categoria com o resultado de uma visita limitada a `max_pages`."""
+        now = now or time.time()
+        if max_pages and deepest_new_page >= max_pages:
+            # Ainda havia jogos novos na última página permitida: explorar mais fundo na próxima
+            deepest_new_page = max_pages * 2
+        stats = self.categories.get(category)
+        if stats is None:
+            # Primeira visita: não há intervalo para estimar a taxa, só a profundidade
+            self.categories[category] = {"new_per_hour": INITIAL_RATE, "depth": deepest_new_page,
+                                         "last_crawled": now}
+            return
+        hours = max((now - stats["last_crawled"]) / 3600, MIN_REVISIT_HOURS)
+        stats["new_per_hour"] += EWMA_ALPHA * (new_items / hours - stats["new_per_hour"])
+        stats["depth"] += EWMA_ALPHA * (deepest_new_page - stats["depth"])
+        stats["last_crawled"] = now
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"categories": self.categories}, f, indent=4, sort_keys=True)
+        os.replace(tmp_path, self.path)
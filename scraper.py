@@ -1,12 +1,28 @@
-import cloudscraper
 import asyncio
-from bs4 import BeautifulSoup
 import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
 from datetime import datetime, timedelta
 import re
-from colorama import Fore, init
-
-init(autoreset=True)
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+import hosts
+import metrics
+import tracing
+from archive import PageArchive
+from proxy_pool import ProxyPool, open_pool
+from retry_scheduler import RetryScheduler
+from scheduler import SCHEDULE_JSON, CrawlScheduler
+from time_budget import Deadline, add_time_budget_argument, finish_within
+from update_signals import UpdateSignals, page_modified_time
+from work_queue import DEFAULT_LEASE_SECONDS, WorkQueue, worker_id
+from log_config import add_logging_arguments, get_logger, log_event, setup_logging_from_args
+
+logger = get_logger("scraper")
 
 # Reorganizar BASE_URLS para colocar latest-updates primeiro
 BASE_URLS = ["https://repack-games.com/category/latest-updates/"] + [
@@ -24,7 +40,6 @@ JSON_FILENAME = "shisuyssource.json"
 BLACKLIST_JSON = "blacklist.json"  # Use blacklist.json instead of invalid_games.json
 MAX_GAMES = 1000000 
 CONCURRENT_REQUESTS = 1000000
-REGEX_TITLE = r"(?:\(.*?\)|\s*(Free Download|v\d+(\.\d+)*[a-zA-Z0-9\-]*|Build \d+|P2P|GOG|Repack|Edition.*|FLT|TENOKE)\s*)"
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -35,19 +50,28 @@ HEADERS = {
 }
 
 processed_games_count = 0
+ARCHIVE = None  # PageArchive onde o HTML das páginas de jogos é guardado (--archive)
+NEW_GAME_HOOK = None  # Chamado com cada jogo novo ou atualizado (--validate)
+UPDATE_SIGNALS = None  # UpdateSignals dos jogos conhecidos (--detect-updates)
+DEADLINE = None  # Deadline da execução (--time-budget)
+PENDING_BLACKLIST = None  # Workers de shard: entradas novas da blacklist, gravadas pelo merge
+PROXY_POOL = None  # ProxyPool (--proxies) pelo qual as páginas são buscadas
+PROXY_SESSIONS = {}  # proxy -> sessão do cloudscraper (os cookies do Cloudflare valem para um IP)
+BLOCKED_STATUSES = frozenset({403, 407, 429, 503})  # Respostas que contam como falha do proxy
 
 class GameLimitReached(Exception):
     pass
 
-def normalize_title(title):
-    return re.sub(REGEX_TITLE, "", title).strip()
+class FetchFailed(Exception):
+    """A página de um jogo não pôde ser baixada (vai para o RetryScheduler)."""
 
 def save_data(json_filename, data):
-    with open(json_filename, "w", encoding="utf-8") as json_file:
+    with metrics.timer("scraper_disk_seconds", op="save_data"), tracing.span("save", "save", file=json_filename), \
+            open(json_filename, "w", encoding="utf-8") as json_file:
         json.dump(data, json_file, ensure_ascii=False, indent=4)
 
-def parse_relative_date(date_str):
-    now = datetime.now()
+def parse_relative_date(date_str, now=None):
+    now = now or datetime.now()
     try:
         if "hour" in date_str:
             result_date = now - timedelta(hours=int(re.search(r'(\d+)', date_str).group(1)))
@@ -67,24 +91,29 @@ def parse_relative_date(date_str):
 
 def log_game_status(status, page, game_title):
     global processed_games_count
+    metrics.inc("scraper_games_total", status=status)
     if status == "NEW":
         processed_games_count += 1
-        print(f"{Fore.GREEN}[NEW GAME] Page {page}: {game_title} - Games Processed: {processed_games_count}")
+        log_event(logger, "NEW", "[NEW GAME] Page %s: %s - Games Processed: %s", page, game_title,
+                  processed_games_count, page=page, title=game_title)
     elif status == "UPDATED":
-        print(f"{Fore.YELLOW}[UPDATED] Page {page}: {game_title}")
+        log_event(logger, "UPDATED", "[UPDATED] Page %s: %s", page, game_title, page=page, title=game_title)
     elif status == "IGNORED":
-        print(f"{Fore.CYAN}[IGNORED] Page {page}: {game_title}")
+        log_event(logger, "IGNORED", "[IGNORED] Page %s: %s", page, game_title, page=page, title=game_title)
     elif status == "NO_LINKS":
-        print(f"{Fore.RED}[NO LINKS] Page {page}: {game_title}")
+        log_event(logger, "NO_LINKS", "[NO LINKS] Page %s: %s", page, game_title, page=page, title=game_title)
 
 def load_blacklist():
     """Load invalid games from BLACKLIST_JSON."""
     try:
         with open(BLACKLIST_JSON, "r", encoding="utf-8") as f:
             data = json.load(f)
-            return {game.get("repackLinkSource") for game in data.get("removed", []) if game.get("repackLinkSource")}
+            blacklist = {game.get("repackLinkSource") for game in data.get("removed", []) if game.get("repackLinkSource")}
     except (FileNotFoundError, json.JSONDecodeError):
-        return set()
+        blacklist = set()
+    if PENDING_BLACKLIST:
+        blacklist |= PENDING_BLACKLIST
+    return blacklist
 
 def save_blacklist(blacklist):
     """Save invalid games to BLACKLIST_JSON."""
@@ -92,20 +121,65 @@ def save_blacklist(blacklist):
         with open(BLACKLIST_JSON, "w", encoding="utf-8") as f:
             json.dump({"removed": [{"repackLinkSource": link} for link in blacklist]}, f, ensure_ascii=False, indent=4)
     except Exception as e:
-        print(f"{Fore.RED}Error saving blacklist: {str(e)}")
+        logger.error("Error saving blacklist: %s", e)
+
+def blacklist_games(blacklist, links):
+    """Adiciona links à blacklist e grava. Num worker de shard o arquivo é compartilhado com os
+    outros workers: as entradas ficam em PENDING_BLACKLIST e vão no resultado da unidade."""
+    blacklist.update(links)
+    if PENDING_BLACKLIST is not None:
+        PENDING_BLACKLIST.update(links)
+    else:
+        save_blacklist(blacklist)
+
+def proxy_session(scraper, host, url):
+    """Sessão e proxy para buscar `url`: sem --proxies (ou sem proxies vivos), a sessão do crawl."""
+    proxy = PROXY_POOL.choose(host, url) if PROXY_POOL is not None else None
+    if proxy is None:
+        return scraper, None
+    session = PROXY_SESSIONS.get(proxy)
+    if session is None:
+        import cloudscraper
+        session = PROXY_SESSIONS[proxy] = cloudscraper.create_scraper()
+        session.proxies.update(ProxyPool.requests_proxies(proxy))
+    return session, proxy
+
+async def setup_proxy_pool(source):
+    global PROXY_POOL
+    PROXY_POOL = await open_pool(source)
 
 async def fetch_page(scraper, url, retries=3):
     """Fetch a page with retries in case of temporary failures."""
+    host = metrics.host_of(url)
     for attempt in range(retries):
+        if attempt:
+            metrics.inc("scraper_retries_total", host=host)
+        session, proxy = proxy_session(scraper, host, url)
+        start = time.perf_counter()
         try:
-            response = scraper.get(url, headers=HEADERS, timeout=10)  # Reduzido timeout para 10 segundos
+            with tracing.span("fetch", "fetch", url=url, host=host, attempt=attempt + 1):
+                response = session.get(url, headers=HEADERS, timeout=10)  # Reduzido timeout para 10 segundos
+            metrics.observe("scraper_request_seconds", time.perf_counter() - start, host=host)
+            if proxy is not None:
+                PROXY_POOL.report(proxy, response.status_code not in BLOCKED_STATUSES, time.perf_counter() - start)
+            metrics.inc("scraper_requests_total", host=host, status=response.status_code)
+            metrics.inc("scraper_bytes_total", len(response.content), host=host)
             if response.status_code == 200:
                 return response.text
-            print(f"Attempt {attempt + 1} failed for {url} with status {response.status_code}")
+            log_event(logger, "RETRY", "Attempt %s failed for %s with status %s", attempt + 1, url,
+                      response.status_code, level=logging.WARNING, url=url, status=response.status_code)
         except Exception as e:
-            print(f"Attempt {attempt + 1} failed for {url}: {str(e)}")
+            metrics.observe("scraper_request_seconds", time.perf_counter() - start, host=host)
+            metrics.inc("scraper_requests_total", host=host, status="error")
+            if proxy is not None:
+                PROXY_POOL.report(proxy, False)
+            log_event(logger, "RETRY", "Attempt %s failed for %s: %s", attempt + 1, url, e,
+                      level=logging.WARNING, url=url, error=str(e))
+        metrics.inc("scraper_backoff_seconds_total", 2 ** attempt, host=host)
         await asyncio.sleep(2 ** attempt)  # Exponential backoff
-    print(f"Failed to fetch {url} after {retries} retries")
+    metrics.inc("scraper_failed_fetches_total", host=host)
+    log_event(logger, "FETCH_FAILED", "Failed to fetch %s after %s retries", url, retries,
+              level=logging.ERROR, url=url)
     return None
 
 def mark_special_categories(title, url):
@@ -126,8 +200,36 @@ def normalize_special_titles(title):
         title = title.replace("0xdeadc0de", "Multiplayer")       
     return title
 
-def is_valid_qiwi_link(link):
-    return "qiwi.gg" in link and "/file/" in link and "/folder/" not in link
+# Regras aplicadas já na listagem, antes de buscar a página do jogo
+REJECTED_TITLE_MARKERS = ("FULL UNLOCKED", "CRACKSTATUS")  # Nunca entram no catálogo (vão para a blacklist)
+NON_GAME_PATHS = ("/category/", "/tag/", "/page/")  # Links da listagem que não são páginas de jogos
+
+class ListingFilter:
+    """As regras da listagem compiladas numa única expressão.
+
+    A expressão é testada uma vez por item contra "URL\ntexto do link": as
+    regras de título só casam na segunda linha e as de categoria (caminho
+    da URL) só na primeira; o grupo que casou diz qual regra rejeitou.
+    """
+
+    def __init__(self, title_markers=REJECTED_TITLE_MARKERS, url_patterns=NON_GAME_PATHS):
+        rules = []
+        if title_markers:
+            rules.append(rf"(?P<title>\n.*(?:{'|'.join(map(re.escape, title_markers))}))")
+        if url_patterns:
+            rules.append(rf"(?P<category>^[^\n]*(?:{'|'.join(map(re.escape, url_patterns))}))")
+        self.pattern = re.compile("|".join(rules), re.IGNORECASE) if rules else None
+
+    def match(self, url, text=""):
+        """Nome da regra que rejeita o item ("title" ou "category"), ou None."""
+        found = self.pattern.search(f"{url}\n{text}") if self.pattern is not None else None
+        return found.lastgroup if found else None
+
+LISTING_FILTER = ListingFilter()
+
+def is_rejected_title(title):
+    """Títulos que nunca entram no catálogo (vão para a blacklist)."""
+    return LISTING_FILTER.match("", title) == "title"
 
 def is_deadcode_version(title):
     title_lower = title.lower()
@@ -141,20 +243,17 @@ def find_duplicate_game(data, repack_link_source):
             return i, game, "IGNORE"
     return None, None, "NEW"
 
-def is_valid_datanodes_link(link):
-    """Verifica se o link é válido para datanodes.to."""
-    return "datanodes.to" in link  # Removida a verificação de '/file/'
+def filter_download_links(hrefs):
+    """Filtra os links de download suportados e ordena pela hierarquia de hosts (hosts.py)."""
+    return hosts.select_download_links(hrefs)
 
-async def fetch_game_details(scraper, game_url):
-    blacklist = load_blacklist()  # Load blacklist to skip games
-    if game_url in blacklist:
-        print(f"{Fore.CYAN}[IGNORED] Game '{game_url}' is in the blacklist.")
-        return None, None, [], None, None
-
-    page_content = await fetch_page(scraper, game_url)
-    if not page_content:
-        return None, None, [], None, None
+def extract_game_details(page_content, game_url, fetched_at=None):
+    """Extrai título, tamanho, links e data de upload do HTML da página de um jogo.
 
+    `fetched_at` é o momento do download, usado como referência das datas
+    relativas ("3 days ago") quando a página vem do arquivo local.
+    """
+    from bs4 import BeautifulSoup  # Importado sob demanda (ver cli.py)
     soup = BeautifulSoup(page_content, 'html.parser')
     title = soup.find('h1', class_='entry-title').get_text(strip=True) if soup.find('h1', class_='entry-title') else "Unknown Title"
     
@@ -163,7 +262,7 @@ async def fetch_game_details(scraper, game_url):
     date_element = soup.select_one('.time-article.updated a')
     if date_element and date_element.text.strip():
         relative_date_str = date_element.text.strip()
-        upload_date = parse_relative_date(relative_date_str)
+        upload_date = parse_relative_date(relative_date_str, fetched_at)
     else:
         upload_date = None
 
@@ -172,43 +271,62 @@ async def fetch_game_details(scraper, game_url):
     if size_element:
         file_size = size_element.strip()
 
-    all_links = []
-    for tag in soup.find_all('a', href=True):
-        href = tag['href']
-        if ("1fichier.com" in href or "gofile.io" in href or "pixeldrain.com" in href or 
-            "mediafire.com" in href or "datanodes.to" in href):
-            all_links.append(href)
-        elif "qiwi.gg" in href and is_valid_qiwi_link(href):
-            all_links.append(href)
-
-    # Ordenar os links de acordo com a hierarquia
-    priority_order = ["1fichier", "datanodes", "gofile", "mediafire", "qiwi", "pixeldrain"]
-    filtered_links = {key: None for key in priority_order}
-
-    for link in all_links:
-        if "1fichier.com" in link:
-            filtered_links["1fichier"] = link
-        elif "datanodes.to" in link:
-            filtered_links["datanodes"] = link
-        elif "mediafire.com" in link:
-            filtered_links["mediafire"] = link
-        elif "qiwi.gg" in link:
-            filtered_links["qiwi"] = link
-        elif "gofile.io" in link:
-            filtered_links["gofile"] = link
-        elif "pixeldrain.com" in link:
-            filtered_links["pixeldrain"] = link
-
-    # Remover entradas vazias e manter a ordem
-    download_links = [filtered_links[key] for key in priority_order if filtered_links[key] is not None]
+    hrefs = [tag['href'] for tag in soup.find_all('a', href=True)]
+    download_links = filter_download_links(hrefs)
 
     return title, file_size, download_links, upload_date, game_url
 
+async def fetch_game_details(scraper, game_url):
+    blacklist = load_blacklist()  # Load blacklist to skip games
+    if game_url in blacklist:
+        log_event(logger, "IGNORED", "[IGNORED] Game '%s' is in the blacklist.", game_url, url=game_url)
+        return None, None, [], None, None
+
+    page_content = await download_game_page(scraper, game_url)
+    with metrics.timer("scraper_parse_seconds", stage="details"), \
+            tracing.span("parse_details", "parse", url=game_url):
+        return extract_game_details(page_content, game_url)
+
+async def download_game_page(scraper, game_url):
+    page_content = await fetch_page(scraper, game_url)
+    if not page_content:
+        raise FetchFailed("page fetch failed")
+    if ARCHIVE is not None:
+        with metrics.timer("scraper_disk_seconds", op="archive"), tracing.span("archive", "save", url=game_url):
+            ARCHIVE.store(game_url, page_content)
+    return page_content
+
+async def fetch_game_update(scraper, game_url):
+    """Baixa de novo a página de um jogo conhecido: (detalhes, data de modificação da página)."""
+    page_content = await download_game_page(scraper, game_url)
+    with metrics.timer("scraper_parse_seconds", stage="details"), \
+            tracing.span("parse_details", "parse", url=game_url):
+        return extract_game_details(page_content, game_url), page_modified_time(page_content)
+
+def parse_listing(page_content):
+    """Retorna (link, texto do link, data do item) dos jogos listados em uma página de categoria.
+
+    A data é só o atributo `datetime` absoluto: o texto exibido no site é
+    relativo ("3 days ago") e muda a cada execução sem o jogo mudar.
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(page_content, 'html.parser')
+    listing = []
+    for article in soup.find_all('div', class_='articles-content'):
+        for li in article.find_all('li'):
+            a_tag = li.find('a', href=True)
+            if a_tag and 'href' in a_tag.attrs:
+                stamp = li.select_one("[datetime]")
+                listing.append((a_tag['href'], a_tag.get_text(" ", strip=True) or a_tag.get("title", ""),
+                                stamp["datetime"].strip() if stamp else ""))
+    return listing
+
 async def fetch_last_page_num(scraper, base_url):
     page_content = await fetch_page(scraper, base_url)
     if not page_content:
         return 1
 
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(page_content, 'html.parser')
     last_page_tag = soup.find('a', class_='last', string='Last »')
     if last_page_tag:
@@ -217,7 +335,8 @@ async def fetch_last_page_num(scraper, base_url):
             return int(match.group(1))
     return 1
 
-async def process_page(scraper, page_url, data, page_num, retry_queue, existing_links):
+async def process_page(scraper, page_url, data, page_num, retries, existing_links):
+    """Processa uma página de listagem e retorna quantos jogos novos ela trouxe."""
     global processed_games_count
     if processed_games_count >= MAX_GAMES:
         raise GameLimitReached()
@@ -226,133 +345,224 @@ async def process_page(scraper, page_url, data, page_num, retry_queue, existing_
 
     page_content = await fetch_page(scraper, page_url)
     if not page_content:
-        return
+        return 0
 
-    soup = BeautifulSoup(page_content, 'html.parser')
-    articles = soup.find_all('div', class_='articles-content')
-    if not articles:
-        return
+    with metrics.timer("scraper_parse_seconds", stage="listing"), \
+            tracing.span("parse_listing", "parse", url=page_url):
+        listing = parse_listing(page_content)
+    if not listing:
+        return 0
 
     remaining_games = MAX_GAMES - processed_games_count
     tasks = []
+    game_urls = []
+    update_candidates = []
+    rejected = []
+    ranked = "latest-updates" in page_url  # Só nessa listagem a posição indica atualização
     
-    for article in articles:
+    for position, (game_url, link_text, stamp) in enumerate(listing):
         if len(tasks) >= remaining_games:
             break
-        
-        for li in article.find_all('li'):
-            if len(tasks) >= remaining_games:
-                break
-                
-            a_tag = li.find('a', href=True)
-            if a_tag and 'href' in a_tag.attrs:
-                game_url = a_tag['href']
-                # Skip games already in the blacklist or JSON
-                if game_url in existing_links or game_url in blacklist:
-                    print(f"{Fore.CYAN}[SKIPPED] Page {page_num}: {game_url} already in JSON or blacklist.")
-                    continue
-                tasks.append(fetch_game_details(scraper, game_url))
 
-    games = await asyncio.gather(*tasks, return_exceptions=True)
-    for game in games:
-        if isinstance(game, Exception):
-            print(f"{Fore.RED}Exception occurred while fetching game details: {game}")
-            continue
-            
-        if game is None or not isinstance(game, tuple) or len(game) != 5:
-            print(f"{Fore.RED}Invalid game data received")
+        if UPDATE_SIGNALS is not None and game_url in existing_links and game_url not in blacklist:
+            rank = (page_num, position) if ranked else None
+            reason = UPDATE_SIGNALS.listing_change(game_url, link_text, stamp, rank)
+            if reason is not None:
+                update_candidates.append((game_url, link_text, stamp, rank, reason))
+                continue
+
+        # Skip games already in the blacklist or JSON
+        if game_url in existing_links or game_url in blacklist:
+            metrics.inc("scraper_games_total", status="SKIPPED")
+            log_event(logger, "SKIPPED", "[SKIPPED] Page %s: %s already in JSON or blacklist.",
+                      page_num, game_url, page=page_num, url=game_url)
             continue
 
-        if processed_games_count >= MAX_GAMES:
-            break
+        # Regras de título e categoria pelo texto da listagem: evita buscar a página do jogo
+        rule = LISTING_FILTER.match(game_url, link_text)
+        if rule is not None:
+            metrics.inc("scraper_games_total", status="PREFILTERED")
+            metrics.inc("scraper_prefiltered_total", rule=rule)
+            log_event(logger, "PREFILTERED", "[PREFILTERED] Page %s: %s (%s rule)", page_num, link_text or game_url,
+                      rule, page=page_num, url=game_url, rule=rule)
+            if rule == "title":
+                rejected.append(game_url)
+            continue
+        tasks.append(fetch_game_details(scraper, game_url))
+        game_urls.append(game_url)
 
-        title, _, links, upload_date, repack_link_source = game
+    if rejected:
+        blacklist_games(blacklist, rejected)
 
-        if not title:  # Add check for None/empty title
-            print(f"{Fore.RED}[ERROR] Game with empty title skipped")
+    games = await asyncio.gather(*tasks, return_exceptions=True)
+    new_games = 0
+    for game_url, game in zip(game_urls, games):
+        if isinstance(game, FetchFailed):
+            # Só o jogo que falhou é tentado de novo, mais tarde e sem segurar o resto da categoria
+            retries.schedule(game_url, (data, page_num))
             continue
-
-        # Verificar duplicatas pelo link imediatamente
-        duplicate_index, existing_game, action = find_duplicate_game(data, repack_link_source)
-        
-        if action == "IGNORE":
-            log_game_status("IGNORED", page_num, title)
+        if isinstance(game, Exception):
+            # Erro de parse ou bug: tentar de novo daria o mesmo resultado
+            metrics.inc("scraper_games_total", status="ERROR")
+            logger.error("Exception occurred while fetching game details for %s: %r", game_url, game,
+                         exc_info=game)
             continue
-
-        title = normalize_special_titles(title)
-        if not links:
-            log_game_status("NO_LINKS", page_num, title)
+        if processed_games_count >= MAX_GAMES:
+            break
+        if add_game(game, data, page_num, blacklist):
+            new_games += 1
+
+    if update_candidates:
+        await refresh_known_games(scraper, update_candidates, data, page_num)
+    return new_games
+
+async def refresh_known_games(scraper, candidates, data, page_num):
+    """Baixa de novo as páginas dos jogos conhecidos cujos sinais na listagem mudaram."""
+    results = await asyncio.gather(*(fetch_game_update(scraper, candidate[0]) for candidate in candidates),
+                                   return_exceptions=True)
+    for (game_url, link_text, stamp, rank, reason), result in zip(candidates, results):
+        if isinstance(result, Exception):
+            # Os sinais antigos ficam: a página é conferida de novo na próxima execução
+            logger.warning("Update check failed for %s: %s", game_url, result)
             continue
+        UPDATE_SIGNALS.record_listing(game_url, link_text, stamp, rank)
+        details, modified = result
+        apply_update(game_url, details, modified, data, page_num, reason)
+
+def apply_update(game_url, details, modified, data, page_num, reason):
+    """Atualiza a entrada do catálogo se a página trouxe uma versão nova. Retorna se atualizou."""
+    title, _, links, upload_date, _ = details
+    _, entry, _ = find_duplicate_game(data, game_url)
+    if entry is None or not title or not links:
+        return False
+    changed = UPDATE_SIGNALS.page_changed(game_url, modified, links, entry.get("uris", []))
+    UPDATE_SIGNALS.record_page(game_url, modified, links)
+    title = normalize_special_titles(title)
+    if not changed or is_rejected_title(title):
+        metrics.inc("scraper_games_total", status="UNCHANGED")
+        return False
+
+    previous_title = entry["title"]
+    entry.update({"title": title, "uris": links, "fileSize": "", "uploadDate": upload_date or entry.get("uploadDate")})
+    metrics.inc("scraper_updates_total", signal=reason)
+    log_game_status("UPDATED", page_num, title)
+    if NEW_GAME_HOOK is not None:
+        NEW_GAME_HOOK(entry, previous_title)
+    return True
+
+def add_game(game, data, page_num, blacklist):
+    """Adiciona ao catálogo o resultado de fetch_game_details, se for um jogo novo e aceito."""
+    if game is None or not isinstance(game, tuple) or len(game) != 5:
+        logger.error("Invalid game data received")
+        return False
+
+    title, _, links, upload_date, repack_link_source = game
+
+    if not title:  # Add check for None/empty title
+        logger.error("[ERROR] Game with empty title skipped")
+        return False
+
+    # Verificar duplicatas pelo link imediatamente
+    duplicate_index, existing_game, action = find_duplicate_game(data, repack_link_source)
+    
+    if action == "IGNORE":
+        log_game_status("IGNORED", page_num, title)
+        return False
+
+    title = normalize_special_titles(title)
+    if not links:
+        log_game_status("NO_LINKS", page_num, title)
+        return False
+
+    if is_rejected_title(title):
+        blacklist_games(blacklist, [repack_link_source])  # Add ignored games to the blacklist
+        log_event(logger, "BLACKLISTED", "Ignoring game with title: %s", title, title=title)
+        return False
+
+    # Adicionar novo jogo
+    new_game = {
+        "title": title,
+        "uris": links,
+        "fileSize": "",
+        "uploadDate": upload_date,
+        "repackLinkSource": repack_link_source
+    }
+    data["downloads"].append(new_game)
+    log_game_status("NEW", page_num, title)
+    if NEW_GAME_HOOK is not None:
+        NEW_GAME_HOOK(new_game)
+    return True
+
+def game_retries(scraper):
+    """RetryScheduler que busca de novo a página de um jogo e o adiciona ao catálogo de origem."""
+    async def retry(game_url, payload):
+        data, page_num = payload
+        if processed_games_count >= MAX_GAMES:
+            return
+        game = await fetch_game_details(scraper, game_url)
+        add_game(game, data, page_num, load_blacklist())
+    return RetryScheduler(retry, retry_on=FetchFailed)
+
+async def process_pages(scraper, base_url, pages, data, retries, existing_links):
+    """Processa as páginas de uma categoria em lotes paralelos de PAGE_SEMAPHORE_LIMIT.
+
+    Retorna (jogos novos, página mais profunda com jogo novo), ou None se o
+    orçamento de tempo acabou antes da última página.
+    """
+    new_games = deepest_new_page = 0
+    for i in range(0, len(pages), PAGE_SEMAPHORE_LIMIT):
+        if processed_games_count >= MAX_GAMES:
+            break
+        if DEADLINE is not None and not DEADLINE.accepting():
+            return None
+            
+        batch = pages[i:i + PAGE_SEMAPHORE_LIMIT]
+        tasks = []
+        
+        for page_num in batch:
+            page_url = f"{base_url}/page/{page_num}"
+            tasks.append(process_page(scraper, page_url, data, page_num, retries, existing_links))
+        
+        if tasks:
+            for page_num, page_new_games in zip(batch, await asyncio.gather(*tasks)):
+                if page_new_games:
+                    new_games += page_new_games
+                    deepest_new_page = max(deepest_new_page, page_num)
+            
+        logger.info("Processed pages %s to %s of %s", i + 1, min(i + PAGE_SEMAPHORE_LIMIT, len(pages)), len(pages))
+    return new_games, deepest_new_page
 
-        if "FULL UNLOCKED" in title.upper() or "CRACKSTATUS" in title.upper():
-            blacklist.add(repack_link_source)  # Add ignored games to the blacklist
-            save_blacklist(blacklist)
-            print(f"Ignoring game with title: {title}")
-            continue
+async def process_category(scraper, base_url, data, page_semaphore, game_semaphore, existing_links,
+                           retries, max_pages=None):
+    """Processa até `max_pages` páginas da categoria (todas se None).
 
-        # Adicionar novo jogo
-        data["downloads"].append({
-            "title": title,
-            "uris": links,
-            "fileSize": "",
-            "uploadDate": upload_date,
-            "repackLinkSource": repack_link_source
-        })
-        log_game_status("NEW", page_num, title)
-
-    # Adicionar jogos que falharam para a fila de retries
-    for game in games:
-        if isinstance(game, Exception) or game is None:
-            retry_queue.append(page_url)
-
-async def retry_failed_games(scraper, retry_queue, data):
-    """Processa novamente os jogos que falharam."""
-    while retry_queue:
-        page_url = retry_queue.pop(0)
-        print(f"{Fore.YELLOW}Retrying failed game: {page_url}")
-        try:
-            await process_page(scraper, page_url, data, page_num=0, retry_queue=[])
-        except Exception as e:
-            print(f"{Fore.RED}Retry failed for {page_url}: {e}")
+    Os jogos que falharem vão para `retries` e são tentados de novo em
+    paralelo com o resto do crawl.
 
-async def process_category(scraper, base_url, data, page_semaphore, game_semaphore, existing_links):
+    Retorna (jogos novos, página mais profunda com jogo novo), ou None se a
+    categoria não foi processada até o fim.
+    """
     global processed_games_count
-    retry_queue = []  # Fila para jogos que falharam
 
     if processed_games_count >= MAX_GAMES:
-        return
+        return None
 
     try:
         last_page_num = await fetch_last_page_num(scraper, base_url)
+        if max_pages:
+            last_page_num = min(last_page_num, max_pages)
         pages = list(range(1, last_page_num + 1))
         
-        print(f"\nProcessing category: {base_url}")
-        print(f"Total pages to process: {len(pages)}")
+        logger.info("Processing category: %s", base_url)
+        logger.info("Total pages to process: %s", len(pages))
         
-        # Processa páginas em paralelo
-        for i in range(0, len(pages), PAGE_SEMAPHORE_LIMIT):
-            if processed_games_count >= MAX_GAMES:
-                break
-                
-            batch = pages[i:i + PAGE_SEMAPHORE_LIMIT]
-            tasks = []
-            
-            for page_num in batch:
-                page_url = f"{base_url}/page/{page_num}"
-                tasks.append(process_page(scraper, page_url, data, page_num, retry_queue, existing_links))  # Adicionado retry_queue
-            
-            if tasks:
-                await asyncio.gather(*tasks)
-                
-            print(f"Processed pages {i+1} to {min(i+PAGE_SEMAPHORE_LIMIT, len(pages))} of {len(pages)}")
-
-        # Processar jogos que falharam
-        await retry_failed_games(scraper, retry_queue, data)
+        return await process_pages(scraper, base_url, pages, data, retries, existing_links)
 
     except GameLimitReached:
-        return
+        return None
     except Exception as e:
-        print(f"Error processing category {base_url}: {str(e)}")
+        logger.error("Error processing category %s: %s", base_url, e)
+        return None
 
 async def cleanup():
     tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
@@ -361,6 +571,11 @@ async def cleanup():
     if tasks:
         await asyncio.gather(*tasks, return_exceptions=True)
 
+# Crawl distribuído (--shard-*)
+SHARD_PAGES_PER_UNIT = 20
+SHARD_RESULTS_DIR = "crawl_shards"
+LEASE_SECONDS = DEFAULT_LEASE_SECONDS
+
 # Ajustar semáforos para melhor performance
 CATEGORY_SEMAPHORE_LIMIT = 1  # Reduzido para processar uma categoria por vez
 PAGE_SEMAPHORE_LIMIT = 5     # Reduzido para processar menos páginas em paralelo
@@ -383,8 +598,23 @@ def load_existing_links(json_filename):
     except (FileNotFoundError, json.JSONDecodeError):
         return set()
 
-async def scrape_games():
-    global processed_games_count
+def save_validated(data, removed_games):
+    """Grava o catálogo validado pelo pipeline; os jogos removidos vão para a blacklist."""
+    if removed_games:
+        blacklist = load_blacklist()
+        blacklist.update(game["repackLinkSource"] for game in removed_games if game.get("repackLinkSource"))
+        save_blacklist(blacklist)
+    save_data(JSON_FILENAME, data)
+
+async def scrape_games(adaptive=False, request_budget=None, validate=False, detect_updates=False):
+    """Executa o crawl. Com `adaptive`, as categorias e a profundidade vêm do CrawlScheduler.
+
+    Com `validate`, cada jogo novo é validado (junto com o seu grupo de
+    duplicatas) durante o crawl, e o catálogo gravado já é o validado. Com
+    `detect_updates`, jogos conhecidos cujos sinais na listagem mudaram são
+    baixados de novo e atualizados.
+    """
+    global processed_games_count, NEW_GAME_HOOK, UPDATE_SIGNALS
     
     # Semáforos para controle de concorrência
     category_semaphore = asyncio.Semaphore(CATEGORY_SEMAPHORE_LIMIT)
@@ -395,19 +625,47 @@ async def scrape_games():
     data = load_existing_data(JSON_FILENAME)
     existing_links = load_existing_links(JSON_FILENAME)  # Carregar links existentes
 
+    # As observações são sempre registradas, para o agendamento adaptativo já ter histórico
+    scheduler = CrawlScheduler(SCHEDULE_JSON)
+    if adaptive:
+        plan = scheduler.plan(BASE_URLS, request_budget)
+        logger.info("Adaptive schedule: %s of %s categories (%s)", len(plan), len(BASE_URLS),
+                    ", ".join(f"{url.rstrip('/').rsplit('/', 1)[-1]}={pages or 'all'}" for url, pages in plan))
+    else:
+        plan = [(base_url, None) for base_url in BASE_URLS]
+    if DEADLINE is not None:
+        # Com o tempo contado, os jogos novos de latest-updates vêm antes de qualquer outra categoria
+        plan.sort(key=lambda step: "latest-updates" not in step[0])
+
+    validation = None
+    retries = None
+    if detect_updates:
+        UPDATE_SIGNALS = UpdateSignals()
+    tracing.TRACER.start_monitor()
     try:
+        if validate:
+            from pipeline import ValidationPipeline  # Importa o validador só neste modo
+            validation = ValidationPipeline(data, save_validated, DEADLINE)
+            await validation.start()
+            NEW_GAME_HOOK = validation.submit
+
+        import cloudscraper
         scraper = cloudscraper.create_scraper()  # Substitui o ClientSession do aiohttp
         category_tasks = []
+        retries = game_retries(scraper)
+        retries.start()
         
         # Processa categorias em paralelo
-        for i in range(0, len(BASE_URLS), CATEGORY_SEMAPHORE_LIMIT):
+        for i in range(0, len(plan), CATEGORY_SEMAPHORE_LIMIT):
             if processed_games_count >= MAX_GAMES:
                 break
+            if DEADLINE is not None and not DEADLINE.accepting():
+                break
                 
-            batch = BASE_URLS[i:i + CATEGORY_SEMAPHORE_LIMIT]
+            batch = plan[i:i + CATEGORY_SEMAPHORE_LIMIT]
             tasks = []
             
-            for base_url in batch:
+            for base_url, max_pages in batch:
                 async with category_semaphore:
                     tasks.append(
                         process_category(
@@ -416,31 +674,318 @@ async def scrape_games():
                             data,
                             page_semaphore=None,  # Semáforos não são mais necessários
                             game_semaphore=None,
-                            existing_links=existing_links  # Passar links existentes
+                            existing_links=existing_links,  # Passar links existentes
+                            retries=retries,
+                            max_pages=max_pages
                         )
                     )
             
             if tasks:
-                await asyncio.gather(*tasks)
+                stage = "crawl_" + "_".join(url.rstrip("/").rsplit("/", 1)[-1] for url, _ in batch)
+                with tracing.span(stage, "crawl"), tracing.profile(stage):
+                    observations = await finish_within(DEADLINE, asyncio.gather(*tasks), [None] * len(tasks))
+                for (base_url, max_pages), observed in zip(batch, observations):
+                    if observed is not None:
+                        scheduler.record(base_url, *observed, max_pages=max_pages)
+                scheduler.save()
+                if UPDATE_SIGNALS is not None:
+                    UPDATE_SIGNALS.save()
                     
-            save_data(JSON_FILENAME, data)
-            print(f"\nScraping finished. Total games processed: {processed_games_count}")
+            if validation is not None:
+                validation.flush()
+            else:
+                save_data(JSON_FILENAME, data)
+            logger.info("Scraping finished. Total games processed: %s", processed_games_count)
+
+        # Retentativas que ainda não venceram; as outras já rodaram junto com o crawl
+        if retries.pending():
+            logger.info("Waiting for %s pending retries", retries.pending())
+            await finish_within(DEADLINE, retries.drain())
+            if validation is not None:
+                validation.flush()
+            else:
+                save_data(JSON_FILENAME, data)
     
     except Exception as e:
-        print(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
     finally:
+        if retries is not None:
+            await retries.close()
+        if UPDATE_SIGNALS is not None:
+            UPDATE_SIGNALS.save()
+            UPDATE_SIGNALS = None
+        NEW_GAME_HOOK = None
+        if validation is not None:
+            # Os grupos que ainda estão na fila são validados antes de terminar
+            await validation.close()
         await cleanup()
 
-def main():
+def reextract_entry(job):
+    """Re-extrai um jogo a partir do arquivo local (executado nos processos do pool).
+
+    Retorna None se a página arquivada falta, está corrompida ou não pôde ser
+    extraída: quem chama registra a URL e segue com o resto do catálogo.
+    """
+    archive_dir, entry = job
+    try:
+        page_content = PageArchive(archive_dir).load(entry["sha256"])
+        return extract_game_details(page_content, entry["url"], datetime.fromisoformat(entry["fetched_at"]))
+    except Exception:
+        return None
+
+def reextract_catalog(archive_dir, workers=None):
+    """Reconstrói as entradas do catálogo a partir das páginas arquivadas, sem acessar a rede."""
+    entries = PageArchive(archive_dir).latest()
+    data = load_existing_data(JSON_FILENAME)
+    blacklist = load_blacklist()
+    games_by_source = {game.get("repackLinkSource"): game for game in data["downloads"]}
+    jobs = [(archive_dir, entry) for url, entry in entries.items() if url not in blacklist]
+    logger.info("Re-extracting %s archived pages", len(jobs))
+
+    updated = added = failed = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for (_, entry), details in zip(jobs, executor.map(reextract_entry, jobs, chunksize=64)):
+            if details is None:
+                failed += 1
+                metrics.inc("scraper_games_total", status="ERROR")
+                logger.error("Could not re-extract %s from the archive: skipping it", entry["url"])
+                continue
+            title, _, links, upload_date, repack_link_source = details
+            title = normalize_special_titles(title)
+            if not links or is_rejected_title(title):
+                continue
+            game = games_by_source.get(repack_link_source)
+            if game is None:
+                game = {"title": title, "uris": links, "fileSize": "", "uploadDate": upload_date,
+                        "repackLinkSource": repack_link_source}
+                data["downloads"].append(game)
+                games_by_source[repack_link_source] = game
+                added += 1
+            else:
+                game.update({"title": title, "uris": links, "uploadDate": upload_date or game.get("uploadDate")})
+                updated += 1
+
+    save_data(JSON_FILENAME, data)
+    logger.info("Re-extraction finished: %s updated, %s added, %s failed", updated, added, failed)
+
+async def plan_crawl_shards(queue_path):
+    """Divide as categorias em intervalos de páginas e enfileira cada um como uma unidade."""
+    queue = WorkQueue(queue_path)
+    import cloudscraper
+    scraper = cloudscraper.create_scraper()
+    added = 0
+    for base_url in BASE_URLS:
+        last_page_num = await fetch_last_page_num(scraper, base_url)
+        for start in range(1, last_page_num + 1, SHARD_PAGES_PER_UNIT):
+            end = min(start + SHARD_PAGES_PER_UNIT - 1, last_page_num)
+            added += queue.add("crawl", {"category": base_url, "start": start, "end": end})
+    logger.info("Planned %s new crawl units in %s (%s)", added, queue_path, queue.counts())
+    queue.close()
+
+async def keep_lease(queue, unit, owner):
+    """Renova o lease da unidade enquanto o worker estiver trabalhando nela."""
+    while True:
+        await asyncio.sleep(LEASE_SECONDS / 3)
+        if not queue.renew(unit.id, owner, LEASE_SECONDS):
+            logger.warning("Lost lease on crawl unit %s", unit.id)
+            return
+
+async def run_crawl_worker(queue_path):
+    """Processa unidades da fila até ela esvaziar, gravando um arquivo de resultado por unidade.
+
+    O resultado leva os jogos novos e as entradas novas da blacklist da unidade.
+    """
+    global PENDING_BLACKLIST
+    queue = WorkQueue(queue_path)
+    owner = worker_id()
+    results_dir = shard_results_dir(queue_path)
+    os.makedirs(results_dir, exist_ok=True)
+    existing_links = load_existing_links(JSON_FILENAME)
+    import cloudscraper
+    scraper = cloudscraper.create_scraper()
+
+    while DEADLINE is None or DEADLINE.accepting():
+        unit = queue.claim(owner, kind="crawl", lease_seconds=LEASE_SECONDS)
+        if unit is None:
+            break
+        category, start, end = unit.payload["category"], unit.payload["start"], unit.payload["end"]
+        logger.info("[%s] Crawling %s pages %s-%s (attempt %s)", owner, category, start, end, unit.attempts)
+        renewer = asyncio.ensure_future(keep_lease(queue, unit, owner))
+        data = {"downloads": []}
+        PENDING_BLACKLIST = set()
+        retries = game_retries(scraper)
+        retries.start()
+        try:
+            observed = await finish_within(DEADLINE, process_pages(scraper, category, list(range(start, end + 1)),
+                                                                   data, retries, existing_links))
+            await finish_within(DEADLINE, retries.drain())
+            if observed is None or retries.pending():
+                # Cortada pelo orçamento de tempo: a unidade volta para a fila e é refeita depois
+                queue.release(unit.id, owner)
+                continue
+            result_file = f"unit-{unit.id}.json"
+            data["blacklisted"] = sorted(PENDING_BLACKLIST)
+            save_data(os.path.join(results_dir, result_file), data)
+            queue.complete(unit.id, owner, {"file": result_file, "games": len(data["downloads"])})
+        except Exception as e:
+            logger.error("Crawl unit %s failed: %s", unit.id, e)
+            queue.release(unit.id, owner)
+        finally:
+            renewer.cancel()
+            await retries.close()
+    logger.info("[%s] No more crawl units: %s", owner, queue.counts())
+    queue.close()
+
+def shard_results_dir(queue_path):
+    return os.path.join(os.path.dirname(os.path.abspath(queue_path)), SHARD_RESULTS_DIR)
+
+def merge_crawl_shards(queue_path):
+    """Junta os resultados das unidades concluídas no catálogo, sem duplicar repackLinkSource,
+    e as entradas novas da blacklist no BLACKLIST_JSON (gravado só aqui, por um processo)."""
+    queue = WorkQueue(queue_path)
+    results_dir = shard_results_dir(queue_path)
+    data = load_existing_data(JSON_FILENAME)
+    known_links = {game.get("repackLinkSource") for game in data["downloads"]}
+    blacklisted = set()
+    added = 0
+    for result in queue.results("crawl"):
+        shard = load_existing_data(os.path.join(results_dir, result["file"]))
+        blacklisted.update(shard.get("blacklisted", []))
+        for game in shard["downloads"]:
+            if game.get("repackLinkSource") in known_links:
+                continue
+            known_links.add(game.get("repackLinkSource"))
+            data["downloads"].append(game)
+            added += 1
+    save_data(JSON_FILENAME, data)
+    blacklist = load_blacklist()
+    new_entries = blacklisted - blacklist
+    if new_entries:
+        save_blacklist(blacklist | new_entries)
+    logger.info("Merged %s new games and %s blacklist entries from crawl shards (%s)", added, len(new_entries),
+                queue.counts())
+    queue.close()
+
+def run_sharded_crawl(args):
+    """Planeja (se a fila estiver vazia), executa N workers locais e junta os resultados.
+
+    Uma fila em que todas as unidades já terminaram é de um ciclo anterior:
+    os resultados são juntados e a fila é planejada de novo.
+    """
+    queue = WorkQueue(args.shard_queue)
+    counts = queue.counts()
+    if counts and not counts.get("pending") and not counts.get("leased"):
+        queue.close()
+        merge_crawl_shards(args.shard_queue)
+        queue = WorkQueue(args.shard_queue)
+        queue.clear("crawl")
+        shutil.rmtree(shard_results_dir(args.shard_queue), ignore_errors=True)
+        logger.info("Previous crawl cycle finished (%s): planning a new one", counts)
+    planned = bool(queue.counts())
+    queue.close()
+    if not planned:
+        asyncio.run(plan_crawl_shards(args.shard_queue))
+
+    command = [sys.executable, os.path.abspath(__file__), "--shard-worker", "--shard-queue", args.shard_queue,
+               "--log-level", args.log_level, "--log-sample", str(args.log_sample)]
+    if args.log_json:
+        command.append("--log-json")
+    if args.archive:
+        command += ["--archive", args.archive]
+    if args.proxies:
+        command += ["--proxies", args.proxies]
+    if DEADLINE is not None:
+        command += ["--time-budget", str(max(1, int(DEADLINE.remaining())))]
+    workers = [subprocess.Popen(command) for _ in range(args.shard_workers)]
+    for worker in workers:
+        worker.wait()
+    merge_crawl_shards(args.shard_queue)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scraper do repack-games.com.")
+    parser.add_argument("--metrics-file", help="Grava as métricas no formato texto do Prometheus.")
+    parser.add_argument("--summary-file", help="Grava um resumo JSON da execução.")
+    add_logging_arguments(parser)
+    tracing.add_tracing_arguments(parser)
+    parser.add_argument("--archive", help="Guarda o HTML das páginas de jogos neste diretório.")
+    parser.add_argument("--reextract", action="store_true",
+                        help="Reconstrói o catálogo a partir de --archive, sem acessar a rede.")
+    parser.add_argument("--workers", type=int, help="Processos usados pelo --reextract.")
+    parser.add_argument("--adaptive", action="store_true",
+                        help=f"Escolhe categorias e profundidade pela taxa de novidades em {SCHEDULE_JSON}.")
+    parser.add_argument("--request-budget", type=int, metavar="PAGES",
+                        help="Máximo de páginas de listagem por execução (com --adaptive).")
+    parser.add_argument("--validate", action="store_true",
+                        help="Valida cada jogo novo (e o seu grupo de duplicatas) durante o crawl.")
+    parser.add_argument("--detect-updates", action="store_true",
+                        help="Baixa de novo jogos conhecidos cujos sinais na listagem mudaram e atualiza as entradas.")
+    parser.add_argument("--proxies", metavar="SOURCE",
+                        help="Espalha as requisições por proxies: \"proxyscrape\" ou um arquivo com um por linha.")
+    add_time_budget_argument(parser)
+    shard = parser.add_argument_group("sharded crawl")
+    shard.add_argument("--shard-queue", help="Fila SQLite compartilhada pelos workers.")
+    shard_mode = shard.add_mutually_exclusive_group()
+    shard_mode.add_argument("--shard-plan", action="store_true", help="Enfileira as unidades de trabalho.")
+    shard_mode.add_argument("--shard-worker", action="store_true", help="Processa unidades até a fila esvaziar.")
+    shard_mode.add_argument("--shard-merge", action="store_true", help="Junta os resultados no catálogo.")
+    shard_mode.add_argument("--shard-workers", type=int, metavar="N",
+                            help="Planeja, executa N workers locais e junta os resultados.")
+    args = parser.parse_args(argv)
+    if args.reextract and not args.archive:
+        parser.error("--reextract requires --archive")
+    sharded = args.shard_plan or args.shard_worker or args.shard_merge or args.shard_workers
+    if sharded and not args.shard_queue:
+        parser.error("sharded crawl modes require --shard-queue")
+    return args
+
+def write_metrics(args):
+    """Exporta as métricas coletadas, se solicitado na linha de comando."""
+    try:
+        if args.metrics_file:
+            metrics.REGISTRY.write_prometheus(args.metrics_file)
+        if args.summary_file:
+            metrics.REGISTRY.write_summary(args.summary_file, tool="scraper", games_processed=processed_games_count)
+    except Exception as e:
+        logger.error("Error writing metrics: %s", e)
+
+def main(argv=None):
+    global ARCHIVE, DEADLINE
+    args = parse_args(argv)
+    if args.time_budget:
+        DEADLINE = Deadline(args.time_budget)
+    setup_logging_from_args(args)
+    tracing.setup_tracing_from_args(args)
+    if args.reextract:
+        reextract_catalog(args.archive, args.workers)
+        write_metrics(args)
+        return
+    if args.shard_merge:
+        merge_crawl_shards(args.shard_queue)
+        return
+    if args.shard_workers:
+        run_sharded_crawl(args)
+        return
+    if args.archive:
+        ARCHIVE = PageArchive(args.archive)
+
+    if args.shard_plan:
+        coroutine = plan_crawl_shards(args.shard_queue)
+    elif args.shard_worker:
+        coroutine = run_crawl_worker(args.shard_queue)
+    else:
+        coroutine = scrape_games(args.adaptive, args.request_budget, args.validate, args.detect_updates)
+
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     
     try:
-        loop.run_until_complete(scrape_games())
+        if args.proxies:
+            loop.run_until_complete(setup_proxy_pool(args.proxies))
+        loop.run_until_complete(coroutine)
     except KeyboardInterrupt:
-        print("\nScript interrupted by user.")
+        logger.warning("Script interrupted by user.")
     except Exception as e:
-        print(f"\nUnexpected error: {str(e)}")
+        logger.error("Unexpected error: %s", e)
     finally:
         pending = asyncio.all_tasks(loop)
         for task in pending:
@@ -452,7 +997,9 @@ def main():
             pass
             
         loop.close()
-        print("Script terminated.")
+        write_metrics(args)
+        tracing.write_trace_from_args(args)
+        logger.info("Script terminated.")
         
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,21 @@
+import benchmark
+
+SIZES = [10_000, 100_000]
+
+
+def results(reference, measured):
+    return {
+        "reference.linear[10000]": reference[0], "reference.linear[100000]": reference[1],
+        "catalog.dedupe.group_games_exact[10000]": measured[0],
+        "catalog.dedupe.group_games_exact[100000]": measured[1],
+    }
+
+
+def test_linear_code_slowed_by_cache_is_not_flagged():
+    # Tempos reais: a referência e o agrupamento exato crescem ~26x de 10k para 100k
+    assert benchmark.check_scaling(results((0.0047, 0.123), (0.016, 0.42)), SIZES) == []
+
+
+def test_quadratic_growth_is_flagged():
+    problems = benchmark.check_scaling(results((0.0047, 0.123), (0.016, 1.6)), SIZES)
+    assert len(problems) == 1 and "group_games_exact" in problems[0]
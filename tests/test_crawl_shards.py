@@ -0,0 +1,49 @@
+import json
+import os
+
+import scraper
+from work_queue import WorkQueue
+
+REJECTED = ("Some Game FULL UNLOCKED", "", ["https://qiwi.gg/file/a"], None, "https://repack-games.com/rejected/")
+ACCEPTED = ("Other Game", "", ["https://qiwi.gg/file/b"], None, "https://repack-games.com/other/")
+
+
+def test_worker_blacklist_entries_are_merged_by_one_writer(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper, "JSON_FILENAME", str(tmp_path / "catalog.json"))
+    monkeypatch.setattr(scraper, "BLACKLIST_JSON", str(tmp_path / "blacklist.json"))
+    scraper.save_blacklist({"https://repack-games.com/old/"})
+    queue_path = str(tmp_path / "queue.sqlite")
+
+    # Worker: o jogo rejeitado não é gravado no arquivo compartilhado, vai no resultado da unidade
+    monkeypatch.setattr(scraper, "PENDING_BLACKLIST", set())
+    data = {"downloads": []}
+    assert not scraper.add_game(REJECTED, data, 1, scraper.load_blacklist())
+    assert scraper.add_game(ACCEPTED, data, 1, scraper.load_blacklist())
+    assert "https://repack-games.com/rejected/" in scraper.load_blacklist()
+    monkeypatch.setattr(scraper, "PENDING_BLACKLIST", None)
+    assert scraper.load_blacklist() == {"https://repack-games.com/old/"}
+
+    queue = WorkQueue(queue_path)
+    queue.add("crawl", {"category": "c", "start": 1, "end": 1})
+    unit = queue.claim("worker", kind="crawl")
+    results_dir = scraper.shard_results_dir(queue_path)
+    os.makedirs(results_dir)
+    data["blacklisted"] = ["https://repack-games.com/rejected/"]
+    scraper.save_data(os.path.join(results_dir, "unit-1.json"), data)
+    queue.complete(unit.id, "worker", {"file": "unit-1.json", "games": 1})
+    queue.close()
+
+    scraper.merge_crawl_shards(queue_path)
+    assert scraper.load_blacklist() == {"https://repack-games.com/old/", "https://repack-games.com/rejected/"}
+    with open(scraper.JSON_FILENAME, encoding="utf-8") as f:
+        assert [game["title"] for game in json.load(f)["downloads"]] == ["Other Game"]
+
+
+def test_cleared_queue_accepts_the_same_units_again(tmp_path):
+    queue = WorkQueue(str(tmp_path / "queue.sqlite"))
+    payload = {"category": "c", "start": 1, "end": 20}
+    assert queue.add("crawl", payload)
+    assert not queue.add("crawl", payload)
+    queue.clear("crawl")
+    assert queue.counts() == {}
+    assert queue.add("crawl", payload)
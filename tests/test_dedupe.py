@@ -0,0 +1,80 @@
+import itertools
+import random
+
+import pytest
+
+from dedupe import SIMILARITY_THRESHOLD, DuplicateIndex, group_games, normalize_title, signature, trigrams
+
+DUPLICATES = [
+    ("Baldur's Gate 3", "Baldurs Gate 3"),
+    ("Assassin's Creed Unity", "Assassins Creed Unity"),
+    ("Assassin’s Creed Unity", "Assassins Creed Unity"),
+    ("Hollow Knight: Silksong", "Hollow Knight Silksong"),
+    ("Cyberpunk 2077 (v2.1 & ALL DLC)", "Cyberpunk 2077 Free Download"),
+    ("The Witcher 3 Wild Hunt GOTY Edition", "The Witcher 3: Wild Hunt"),
+    ("Stardew Valley v1.6.8", "Stardew Valley (Build 15028)"),
+    ("Red Dead Redemption 2 Ultimate Edition", "Red Dead Redemption 2"),
+    ("Sid Meiers Civilization VI", "Sid Meier's Civilization VI"),
+]
+
+DISTINCT = [
+    ("Dark Souls II", "Dark Souls III"),
+    ("Half-Life", "Half-Life 2"),
+    ("Resident Evil 4", "Resident Evil 5"),
+    ("Hitman 3", "Hitman 3 VR"),
+    ("Left 4 Dead 2", "Left 4 Dead 2 Multiplayer"),
+    ("Far Cry 5", "Far Cry 6"),
+    ("Tomb Raider", "Rise of the Tomb Raider"),
+    ("Fallout 4", "Fallout 76"),
+]
+
+
+def grouped(titles):
+    return sorted(sorted(group) for group in group_games(titles, get_title=lambda title: title).values())
+
+
+@pytest.mark.parametrize("first, second", DUPLICATES)
+def test_near_duplicates_merge(first, second):
+    assert grouped([first, second]) == [sorted([first, second])]
+
+
+@pytest.mark.parametrize("first, second", DISTINCT)
+def test_sequels_and_versions_stay_apart(first, second):
+    assert grouped([first, second]) == sorted([[first], [second]])
+
+
+def test_apostrophes_are_removed_not_split():
+    assert normalize_title("Baldur's Gate 3") == normalize_title("Baldur’s Gate 3") == "baldurs gate 3"
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+
+def test_prefix_filter_finds_every_pair_above_threshold():
+    rng = random.Random(7)
+    words = ["dark", "souls", "knight", "hollow", "racing", "farm", "zombie", "island", "city", "legend"]
+    titles = set()
+    for _ in range(400):
+        title = " ".join(rng.sample(words, rng.randint(2, 4)))
+        # Erros de digitação pequenos: pares logo acima e logo abaixo do limiar
+        for _ in range(rng.randint(0, 2)):
+            position = rng.randrange(len(title))
+            title = title[:position] + rng.choice("aeiost") + title[position + 1:]
+        titles.add(title + rng.choice(["", " 2", " vr"]))
+    titles = sorted(titles)
+
+    index = DuplicateIndex()
+    for title in titles:
+        index.add(title, title)
+
+    keys = {title: normalize_title(title) for title in titles}
+    pairs = 0
+    for a, b in itertools.combinations(titles, 2):
+        key_a, key_b = keys[a], keys[b]
+        if signature(key_a.split()) != signature(key_b.split()):
+            continue
+        if jaccard(trigrams(key_a), trigrams(key_b)) >= SIMILARITY_THRESHOLD:
+            pairs += 1
+            assert index.find(key_a) == index.find(key_b), (a, b)
+    assert pairs  # O teste só vale se houver pares acima do limiar
@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Importados só dentro das funções que os usam; a carga dos módulos não pode puxá-los
+HEAVY_MODULES = ("cloudscraper", "bs4", "httpx", "httpx_socks", "selenium", "webdriver_manager", "stem")
+
+
+@pytest.mark.parametrize("module", ["cli", "scraper", "rework_scraper", "pipeline"])
+def test_import_does_not_load_heavy_dependencies(module):
+    # Interpretador novo: no processo do pytest outros testes já podem ter importado essas dependências
+    check = f"import sys, {module}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", check], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == []
@@ -0,0 +1,36 @@
+import io
+import logging
+
+import pytest
+
+import log_config
+
+
+@pytest.fixture
+def stream():
+    stream = io.StringIO()
+    yield stream
+    log_config.shutdown_logging()
+    logging.getLogger(log_config.LOGGER_NAME).handlers[:] = []
+
+
+def test_records_after_shutdown_are_written(stream):
+    log_config.setup_logging(summary_interval=0, stream=stream)
+    logger = log_config.get_logger("test")
+    logger.info("Crawl finished.")
+
+    log_config.shutdown_logging()
+    logger.info("Script terminated.")
+    log_config.shutdown_logging()  # O atexit pode chamar de novo
+
+    assert stream.getvalue().splitlines() == ["Crawl finished.", "Script terminated."]
+
+
+def test_sampling_still_applies_after_shutdown(stream):
+    log_config.setup_logging(sample_rate=2, summary_interval=0, stream=stream)
+    log_config.shutdown_logging()
+    logger = log_config.get_logger("test")
+    for index in range(4):
+        log_config.log_event(logger, "SKIPPED", "skipped %s", index)
+
+    assert stream.getvalue().splitlines() == ["skipped 0", "skipped 2"]
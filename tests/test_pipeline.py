@@ -0,0 +1,48 @@
+import asyncio
+
+import rework_scraper
+from pipeline import ValidationPipeline
+
+
+def game(title, link):
+    return {"title": title, "uris": [link], "fileSize": "", "uploadDate": None}
+
+
+def test_groups_merged_during_validation_are_not_validated_twice_at_once(monkeypatch):
+    running = []
+    overlaps = []
+    validated = []
+
+    async def validate_game_group(records, client, tracker):
+        titles = {record.title for record in records}
+        if any(titles & other for other in running):
+            overlaps.append(titles)
+        running.append(titles)
+        await asyncio.sleep(0.05)
+        running.remove(titles)
+        validated.append(sorted(titles))
+        return list(records), []
+
+    monkeypatch.setattr(rework_scraper, "validate_game_group", validate_game_group)
+    monkeypatch.setattr(rework_scraper, "flush_link_cache", lambda current: None)
+
+    async def main():
+        data = {"downloads": [game("Zombie Farm Racing", "https://qiwi.gg/file/a")]}
+        pipeline = ValidationPipeline(data, lambda data, removed: None)
+        pipeline.queue = asyncio.Queue()
+        pipeline.tracker = rework_scraper.ProgressTracker(0)
+        pipeline.tasks = [asyncio.ensure_future(pipeline.worker()) for _ in range(4)]
+
+        pipeline.submit(data["downloads"][0])
+        await asyncio.sleep(0.01)  # O primeiro grupo está em validação
+        # Mesmo título com outra grafia: une o grupo em validação a uma raiz nova ("zombie farm racin" < ...)
+        for title, link in (("Zombie Farm Racin", "https://qiwi.gg/file/b"),
+                            ("Zombie Farm Racing!", "https://qiwi.gg/file/c")):
+            data["downloads"].append(game(title, link))
+            pipeline.submit(data["downloads"][-1])
+        await pipeline.close()
+
+    asyncio.run(main())
+    assert overlaps == []
+    assert validated[0] == ["Zombie Farm Racing"]
+    assert validated[-1] == ["Zombie Farm Racin", "Zombie Farm Racing", "Zombie Farm Racing!"]
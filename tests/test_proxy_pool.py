@@ -0,0 +1,60 @@
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from proxy_pool import ProxyPool
+
+
+class StandInProxy(BaseHTTPRequestHandler):
+    """Responde 204 a qualquer GET: para uma URL http, o proxy recebe a URL completa."""
+
+    def do_GET(self):
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def proxy_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInProxy)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_probe_all_keeps_only_live_proxies_and_choose_sticks(proxy_server, tmp_path):
+    alive = [f"http://127.0.0.1:{proxy_server}", f"http://localhost:{proxy_server}"]
+    proxies_file = tmp_path / "proxies.txt"
+    proxies_file.write_text(f"# proxies\n127.0.0.1:{proxy_server}\n{alive[1]}\n\n127.0.0.1:{closed_port()}\n",
+                            encoding="utf-8")
+
+    async def run():
+        pool = await ProxyPool.load(str(proxies_file), lanes=4)
+        assert len(pool.proxies) == 3
+        await pool.probe_all(url=f"http://127.0.0.1:{proxy_server}/generate_204", timeout=5)
+        return pool
+
+    pool = asyncio.run(run())
+
+    assert sorted(pool.proxies) == sorted(alive)
+    chosen = pool.choose("example.com", "https://example.com/a")
+    assert chosen in alive
+    assert pool.choose("example.com", "https://example.com/a") == chosen
+    pool.evict(chosen)
+    assert pool.choose("example.com", "https://example.com/a") != chosen
+    for url in list(pool.proxies):
+        pool.evict(url)
+    assert pool.choose("example.com", "https://example.com/a") is None
@@ -0,0 +1,27 @@
+import pytest
+
+from records import GameRecord, parse_size
+
+GAMES = [
+    {"title": "Game", "uris": ["https://qiwi.gg/file/a"], "fileSize": "1.82 GB",
+     "uploadDate": "2024-05-01T10:20:30", "repackLinkSource": "https://repack-games.com/game/"},
+    {"title": "Game", "uris": [], "fileSize": "", "uploadDate": None},
+    {"title": "Game", "uris": [], "fileSize": "1,5 GB", "uploadDate": "2024-05-01T10:20:30+02:00"},
+    {"title": "Game", "uris": [], "fileSize": "700MB", "uploadDate": "not a date", "extra": {"a": 1}},
+    {"title": "Game", "uris": ["https://gofile.io/d/x"]},
+]
+
+
+@pytest.mark.parametrize("game", GAMES)
+def test_round_trip_keeps_the_json(game):
+    assert GameRecord.from_dict(game).to_dict() == game
+
+
+def test_changed_fields_are_formatted():
+    record = GameRecord.from_dict(GAMES[1])
+    record.size_bytes = parse_size("2.50 GB")
+    record.set_uris(["https://qiwi.gg/file/b"])
+    game = record.to_dict()
+    assert game["fileSize"] == "2.50 GB"
+    assert game["uploadDate"] is None
+    assert game["uris"] == ["https://qiwi.gg/file/b"]
@@ -0,0 +1,44 @@
+import json
+
+import scraper
+from archive import PageArchive
+
+GAME_URL = "https://repack-games.com/some-game/"
+PAGE = ('<html><body><h1 class="entry-title">Some Game</h1>'
+        '<a href="https://qiwi.gg/file/abc-Game">Download</a></body></html>')
+
+
+def rebuild(tmp_path, monkeypatch, downloads, store):
+    monkeypatch.setattr(scraper, "JSON_FILENAME", str(tmp_path / "catalog.json"))
+    monkeypatch.setattr(scraper, "BLACKLIST_JSON", str(tmp_path / "blacklist.json"))
+    scraper.save_data(scraper.JSON_FILENAME, {"downloads": downloads})
+    archive_dir = str(tmp_path / "archive")
+    store(PageArchive(archive_dir))
+    scraper.reextract_catalog(archive_dir, workers=1)
+    with open(scraper.JSON_FILENAME, encoding="utf-8") as f:
+        return json.load(f)["downloads"]
+
+
+def test_page_without_date_keeps_the_existing_upload_date(tmp_path, monkeypatch):
+    existing = {"title": "Some Game", "uris": [], "fileSize": "1 GB", "uploadDate": "2024-05-01T00:00:00",
+                "repackLinkSource": GAME_URL}
+
+    downloads = rebuild(tmp_path, monkeypatch, [existing], lambda archive: archive.store(GAME_URL, PAGE))
+
+    assert downloads[0]["uris"] == ["https://qiwi.gg/file/abc-Game"]
+    assert downloads[0]["uploadDate"] == "2024-05-01T00:00:00"
+
+
+def test_missing_or_corrupt_archived_pages_are_skipped(tmp_path, monkeypatch):
+    def store(archive):
+        archive.store(GAME_URL, PAGE)
+        corrupt = archive.store("https://repack-games.com/corrupt/", PAGE.replace("Some Game", "Corrupt"))
+        with open(archive.object_path(corrupt), "wb") as f:
+            f.write(b"not gzip")
+        with open(archive.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"url": "https://repack-games.com/missing/", "sha256": "0" * 64,
+                                "fetched_at": "2024-05-01T00:00:00"}) + "\n")
+
+    downloads = rebuild(tmp_path, monkeypatch, [], store)
+
+    assert [game["repackLinkSource"] for game in downloads] == [GAME_URL]
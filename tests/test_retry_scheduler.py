@@ -0,0 +1,33 @@
+import asyncio
+
+from retry_scheduler import RetryScheduler
+
+
+class Flaky(Exception):
+    pass
+
+
+def run_retries(error):
+    calls = []
+
+    async def handler(url, payload):
+        calls.append(url)
+        raise error
+
+    async def run():
+        retries = RetryScheduler(handler, max_attempts=3, base_delay=0.001, max_delay=0.001, retry_on=Flaky)
+        retries.start()
+        retries.schedule("https://example.com/game")
+        await retries.drain()
+        await retries.close()
+
+    asyncio.run(run())
+    return calls
+
+
+def test_retryable_error_is_retried_until_abandoned():
+    assert len(run_retries(Flaky("page fetch failed"))) == 2
+
+
+def test_other_errors_are_not_retried():
+    assert len(run_retries(ValueError("parse error"))) == 1
@@ -0,0 +1,15 @@
+from scheduler import DEFAULT_PROBE_PAGES, CrawlScheduler
+
+CATEGORIES = [f"https://repack-games.com/category/{name}/" for name in ("latest-updates", "action", "racing")]
+
+
+def test_unknown_categories_share_the_budget(tmp_path):
+    scheduler = CrawlScheduler(str(tmp_path / "schedule.json"))
+    plan = scheduler.plan(CATEGORIES, budget=12)
+    assert plan == [(CATEGORIES[0], DEFAULT_PROBE_PAGES), (CATEGORIES[1], DEFAULT_PROBE_PAGES),
+                    (CATEGORIES[2], 12 - 2 * DEFAULT_PROBE_PAGES)]
+
+
+def test_unknown_categories_are_crawled_whole_without_budget(tmp_path):
+    scheduler = CrawlScheduler(str(tmp_path / "schedule.json"))
+    assert scheduler.plan(CATEGORIES) == [(category, None) for category in CATEGORIES]
@@ -0,0 +1,24 @@
+from scraper import parse_listing
+from update_signals import UpdateSignals
+
+URL = "https://repack-games.com/game-1/"
+
+
+def listing(date_html):
+    return (f'<div class="articles-content"><ul><li><a href="{URL}">Game 1 v1.2</a>{date_html}</li></ul></div>')
+
+
+def test_relative_dates_are_not_update_signals(tmp_path):
+    signals = UpdateSignals(str(tmp_path / "signals.json"))
+    for shown in ("3 days ago", "4 days ago", "1 week ago"):
+        [(url, text, stamp)] = parse_listing(listing(f'<span class="time-article">{shown}</span>'))
+        assert stamp == ""
+        assert signals.listing_change(url, text, stamp) is None
+
+
+def test_absolute_date_change_is_an_update_signal(tmp_path):
+    signals = UpdateSignals(str(tmp_path / "signals.json"))
+    [(url, text, stamp)] = parse_listing(listing('<time datetime="2026-10-01T10:00:00">3 days ago</time>'))
+    assert signals.listing_change(url, text, stamp) is None  # Primeira vez: vira a referência
+    [(url, text, stamp)] = parse_listing(listing('<time datetime="2026-10-18T09:00:00">1 hour ago</time>'))
+    assert signals.listing_change(url, text, stamp) == "stamp"
@@ -0,0 +1,94 @@
+import asyncio
+
+import circuit_breaker
+import hosts
+import rework_scraper
+from circuit_breaker import HostUnavailable
+from link_cache import LinkCache
+from records import GameRecord
+
+DEAD = "https://www.mediafire.com/file/dead/game.rar/file"
+DOWN = "https://www.mediafire.com/file/down/game.rar/file"
+
+
+def test_dead_mediafire_file_is_invalid(monkeypatch):
+    monkeypatch.setattr(rework_scraper, "check_mediafire_link", lambda link: None)
+    assert asyncio.run(rework_scraper.validate_mediafire_link(None, DEAD)) == (False, "")
+
+
+def test_dead_link_is_dropped_and_unavailable_host_is_unknown(monkeypatch):
+    async def validator(link, client):
+        if link == DOWN:
+            raise HostUnavailable("Status code 503")
+        return False, ""
+
+    monkeypatch.setattr(hosts.HANDLERS["mediafire"], "validator", validator)
+    monkeypatch.setattr(circuit_breaker, "BREAKERS", {})
+    monkeypatch.setattr(rework_scraper, "LINK_CACHE", LinkCache({}, {}))
+    game = GameRecord.from_dict({"title": "Game", "uris": [DEAD, DOWN], "uploadDate": None, "fileSize": ""})
+
+    asyncio.run(rework_scraper.validate_links(game, 1, 0, client=None))
+
+    assert game.uris == [DOWN]
+    assert game.unknown == (DOWN,)
+    assert rework_scraper.LINK_CACHE.lookup(DEAD) == (False, "")
+    assert rework_scraper.LINK_CACHE.lookup(DOWN) == (None, "")
+
+
+def links_game(monkeypatch, checked):
+    async def validator(link, client):
+        await asyncio.sleep(0.05 if link == DEAD else 0)  # O link morto responde por último
+        checked.append(link)
+        return link != DEAD, "1 GB"
+
+    monkeypatch.setattr(hosts.HANDLERS["mediafire"], "validator", validator)
+    monkeypatch.setattr(circuit_breaker, "BREAKERS", {})
+    monkeypatch.setattr(rework_scraper, "LINK_CACHE", LinkCache({}, {}))
+    return GameRecord.from_dict({"title": "Game", "uris": [DOWN, DEAD], "uploadDate": None, "fileSize": ""})
+
+
+def test_speculative_candidates_still_check_every_link(monkeypatch):
+    checked = []
+    game = links_game(monkeypatch, checked)
+    monkeypatch.setattr(rework_scraper, "SPECULATIVE_CANDIDATES", 3)
+    tracker = rework_scraper.ProgressTracker(1)
+
+    validated = asyncio.run(rework_scraper.validate_candidate(game, None, tracker))
+
+    assert sorted(checked) == sorted([DOWN, DEAD])
+    assert validated.uris == [DOWN]
+    assert validated.unchecked == ()
+
+
+def test_first_valid_marks_links_it_did_not_check(monkeypatch):
+    checked = []
+    game = links_game(monkeypatch, checked)
+    rework_scraper.LINK_CACHE.record(DOWN, True, "1 GB")
+
+    asyncio.run(rework_scraper.validate_links(game, 1, 0, client=None, first_valid=True))
+
+    assert checked == []
+    assert game.uris == [DOWN, DEAD]
+    assert game.unchecked == (DEAD,)
+
+
+def test_undecided_groups_are_not_stamped_as_validated(monkeypatch, tmp_path):
+    async def decide_game_group(group, client, tracker):
+        if group[0].title == "Down Game":
+            raise rework_scraper.GroupUndecided()
+        return list(group), []
+
+    validated_groups = tmp_path / "validated_groups.json"
+    monkeypatch.setattr(rework_scraper, "decide_game_group", decide_game_group)
+    monkeypatch.setattr(rework_scraper, "VALIDATED_GROUPS_JSON", str(validated_groups))
+    monkeypatch.setattr(rework_scraper, "open_link_cache", lambda: 0)
+    monkeypatch.setattr(rework_scraper, "flush_link_cache", lambda current_index: None)
+    games = [{"title": "Down Game", "uris": [DOWN]}, {"title": "Other Title", "uris": [DEAD]}]
+
+    decisions = asyncio.run(rework_scraper.process_duplicates(games))
+
+    stamped = rework_scraper.load_json(str(validated_groups))["groups"]
+    assert len(decisions) == 2
+    assert len(stamped) == 1
+    assert [key for key in decisions if key not in stamped] == \
+        [key for key, (kept, _) in decisions.items() if kept[0]["title"] == "Down Game"]
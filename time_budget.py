@@ -0,0 +1,79 @@
+"""Orçamento de tempo das execuções agendadas (--time-budget).
+
+Os workflows rodam o scraper e o validador com `continue-on-error`: uma
+execução que estoura o limite do CI é morta e perde tudo o que não foi
+gravado. Com um orçamento, o trabalho é ordenado pelo valor esperado e o
+Deadline diz quando parar de pegar trabalho novo (faltando `reserve`
+segundos); o que já está em andamento tem até FLUSH_MARGIN segundos antes
+do fim para terminar, e então é cancelado para os resultados serem
+gravados dentro do prazo.
+"""
+import argparse
+import asyncio
+import logging
+import re
+import time
+
+import metrics
+from log_config import get_logger, log_event
+
+RESERVE_FRACTION = 0.1  # Parte final do orçamento sem trabalho novo, só para esvaziar
+MIN_RESERVE = 60  # Segundos
+FLUSH_MARGIN = 15  # Segundos antes do fim em que o trabalho em andamento é cancelado
+DURATION = re.compile(r"^(\d+(?:\.\d+)?)([smh]?)$")
+UNITS = {"": 1, "s": 1, "m": 60, "h": 3600}
+
+logger = get_logger("time_budget")
+
+
+def parse_duration(value):
+    """Tipo do argparse: "3300", "55m" ou "1.5h" em segundos."""
+    match = DURATION.match(value.strip().lower())
+    if not match or float(match.group(1)) <= 0:
+        raise argparse.ArgumentTypeError("expected a positive duration like 3300, 55m or 1.5h")
+    return float(match.group(1)) * UNITS[match.group(2)]
+
+
+class Deadline:
+    def __init__(self, seconds, reserve=None):
+        self.seconds = seconds
+        self.end = time.monotonic() + seconds
+        self.reserve = min(seconds / 2, max(MIN_RESERVE, seconds * RESERVE_FRACTION)) if reserve is None \
+            else reserve
+        self.closed = False  # Já avisou que parou de aceitar trabalho
+
+    def remaining(self):
+        return self.end - time.monotonic()
+
+    def accepting(self):
+        """Se ainda dá para começar trabalho novo."""
+        if self.remaining() > self.reserve:
+            return True
+        if not self.closed:
+            self.closed = True
+            log_event(logger, "TIME_BUDGET", "Time budget almost spent (%.0fs left): no new work",
+                      self.remaining(), level=logging.WARNING, remaining=round(self.remaining()))
+        return False
+
+    async def finish(self, awaitable, default=None):
+        """Espera `awaitable` até FLUSH_MARGIN segundos antes do fim; depois cancela e retorna `default`."""
+        try:
+            return await asyncio.wait_for(awaitable, max(0.0, self.remaining() - FLUSH_MARGIN))
+        except asyncio.TimeoutError:
+            metrics.inc("time_budget_cancellations_total")
+            log_event(logger, "TIME_BUDGET", "Time budget spent: cancelled in-flight work",
+                      level=logging.WARNING)
+            return default
+
+
+async def finish_within(deadline, awaitable, default=None):
+    """`deadline.finish(awaitable)`, ou só `await awaitable` quando não há orçamento."""
+    if deadline is None:
+        return await awaitable
+    return await deadline.finish(awaitable, default)
+
+
+def add_time_budget_argument(parser):
+    parser.add_argument("--time-budget", type=parse_duration, metavar="DURATION",
+                        help="Termina a execução dentro deste tempo (3300, 55m, 1.5h): o trabalho mais "
+                             "valioso vem primeiro e os resultados são gravados antes do fim.")
@@ -0,0 +1,145 @@
+"""Tracing opcional das etapas do scraper e do validador.
+
+Quando habilitado, cada fetch/parse/validate/save vira um span no formato
+Chrome trace event (abre em chrome://tracing ou ui.perfetto.dev), com uma
+"thread" por task do asyncio para que o entrelaçamento das corrotinas fique
+visível. Um monitor mede o atraso do loop de eventos e marca os travamentos,
+e opcionalmente cada etapa de alto nível gera um dump do cProfile.
+Desabilitado, `span` não faz nada além de um if.
+"""
+import asyncio
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+STALL_THRESHOLD = 0.1  # Segundos de atraso do loop considerados travamento
+MONITOR_INTERVAL = 0.05
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.profile_dir = None
+        self.events = []
+        self.tids = {}
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.profiling = False
+
+    def enable(self, profile_dir=None):
+        self.enabled = True
+        self.profile_dir = profile_dir
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def now_us(self):
+        return (time.perf_counter() - self.origin) * 1e6
+
+    def current_tid(self):
+        """Identificador estável da task atual (ou da thread, fora do loop)."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task is not None else threading.get_ident()
+        with self.lock:
+            tid = self.tids.get(key)
+            if tid is None:
+                tid = self.tids[key] = len(self.tids) + 1
+                name = task.get_name() if task is not None else threading.current_thread().name
+                self.events.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+                                    "args": {"name": name}})
+        return tid
+
+    @contextmanager
+    def span(self, name, category, **args):
+        if not self.enabled:
+            yield
+            return
+        tid = self.current_tid()
+        start = self.now_us()
+        try:
+            yield
+        finally:
+            event = {"name": name, "cat": category, "ph": "X", "ts": start, "dur": self.now_us() - start,
+                     "pid": self.pid, "tid": tid}
+            if args:
+                event["args"] = args
+            with self.lock:
+                self.events.append(event)
+
+    def instant(self, name, category, **args):
+        if not self.enabled:
+            return
+        event = {"name": name, "cat": category, "ph": "i", "s": "g", "ts": self.now_us(),
+                 "pid": self.pid, "tid": self.current_tid(), "args": args}
+        with self.lock:
+            self.events.append(event)
+
+    @contextmanager
+    def profile(self, stage):
+        """Gera PROFILE_DIR/<stage>.prof com o cProfile da etapa.
+
+        O cProfile só permite um profiler ativo por vez, então etapas
+        aninhadas ou concorrentes ficam dentro do dump da etapa externa.
+        """
+        if not self.profile_dir or self.profiling:
+            yield
+            return
+        self.profiling = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self.profiling = False
+            filename = re.sub(r"[^A-Za-z0-9_.-]+", "_", stage).strip("_") or "stage"
+            profiler.dump_stats(os.path.join(self.profile_dir, f"{filename}.prof"))
+
+    async def monitor_event_loop(self):
+        """Marca no trace os momentos em que o loop ficou travado além de STALL_THRESHOLD."""
+        while True:
+            expected = time.perf_counter() + MONITOR_INTERVAL
+            await asyncio.sleep(MONITOR_INTERVAL)
+            lag = time.perf_counter() - expected
+            if lag > STALL_THRESHOLD:
+                self.instant("event_loop_stall", "loop", lag_ms=round(lag * 1000, 1))
+
+    def start_monitor(self):
+        """Inicia o monitor do loop, se o tracing estiver ativo. Retorna a task ou None."""
+        if not self.enabled:
+            return None
+        return asyncio.ensure_future(self.monitor_event_loop())
+
+    def write(self, filename):
+        with self.lock:
+            events = list(self.events)
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+TRACER = Tracer()
+span = TRACER.span
+profile = TRACER.profile
+
+
+def add_tracing_arguments(parser):
+    group = parser.add_argument_group("tracing")
+    group.add_argument("--trace-file", help="Grava um trace no formato Chrome/Perfetto.")
+    group.add_argument("--profile-dir", help="Grava um dump do cProfile por etapa neste diretório.")
+
+
+def setup_tracing_from_args(args):
+    if args.trace_file or args.profile_dir:
+        TRACER.enable(args.profile_dir)
+
+
+def write_trace_from_args(args):
+    if args.trace_file:
+        TRACER.write(args.trace_file)
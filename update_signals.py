@@ -0,0 +1,95 @@
+"""Sinais baratos para detectar atualizações de jogos já conhecidos (--detect-updates).
+
+Um jogo já no catálogo é pulado pelo scraper, então versões novas nunca
+atualizavam `uris`/`uploadDate`. Para não re-crawlear tudo, guardamos por
+página de jogo (repackLinkSource) o que a listagem mostra dela: o texto do
+link, a data absoluta do item (atributo `datetime`; as datas relativas
+exibidas mudam sozinhas) e a posição em "latest-updates" (o site sobe
+para o topo os jogos atualizados). Só quando um desses sinais muda a página
+do jogo é baixada de novo; aí a data de modificação da página e uma
+impressão digital do bloco de links dizem se a entrada realmente mudou.
+"""
+import hashlib
+import json
+import os
+import re
+
+UPDATE_SIGNALS_JSON = "update_signals.json"
+MODIFIED_TIME = re.compile(r"<meta[^>]+property=[\"']article:modified_time[\"'][^>]+content=[\"']([^\"']+)",
+                           re.IGNORECASE)
+
+
+def link_fingerprint(links):
+    """Impressão digital do bloco de links extraído da página (independe da ordem)."""
+    return hashlib.sha1("\n".join(sorted(links)).encode("utf-8")).hexdigest()[:16]
+
+
+def page_modified_time(page_content):
+    """Data de modificação declarada pela página (meta article:modified_time), ou ""."""
+    match = MODIFIED_TIME.search(page_content or "")
+    return match.group(1) if match else ""
+
+
+class UpdateSignals:
+    def __init__(self, path=UPDATE_SIGNALS_JSON):
+        self.path = path
+        self.games = {}
+        self.dirty = False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.games = json.load(f).get("games", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def listing_change(self, url, text, stamp, rank=None):
+        """Qual sinal da listagem mudou ("text", "stamp", "bumped") ou None.
+
+        `rank` é (página, posição) em latest-updates: os itens só descem
+        com o tempo, então subir indica que o jogo foi atualizado. Na
+        primeira vez que um jogo é visto os sinais viram a referência.
+        """
+        stored = self.games.get(url)
+        if stored is None:
+            self.record_listing(url, text, stamp, rank)
+            return None
+        if text and stored.get("text") and text != stored["text"]:
+            return "text"
+        if stamp and stored.get("stamp") and stamp != stored["stamp"]:
+            return "stamp"
+        if rank is not None and stored.get("rank") and list(rank) < stored["rank"]:
+            return "bumped"
+        if rank is not None or text != stored.get("text") or stamp != stored.get("stamp"):
+            self.record_listing(url, text, stamp, rank)  # A posição muda sem indicar atualização
+        return None
+
+    def record_listing(self, url, text, stamp, rank=None):
+        entry = self.games.setdefault(url, {})
+        entry["text"] = text
+        entry["stamp"] = stamp
+        if rank is not None:
+            entry["rank"] = list(rank)
+        self.dirty = True
+
+    def page_changed(self, url, modified, links, current_links):
+        """Se a página baixada de novo traz uma versão diferente da entrada do catálogo."""
+        stored = self.games.get(url, {})
+        if stored.get("fingerprint"):
+            return link_fingerprint(links) != stored["fingerprint"] or \
+                bool(modified and stored.get("modified") and modified != stored["modified"])
+        # Sem referência (jogo anterior a este modo): só um link novo conta como atualização
+        return bool(set(links) - set(current_links))
+
+    def record_page(self, url, modified, links):
+        entry = self.games.setdefault(url, {})
+        entry["modified"] = modified
+        entry["fingerprint"] = link_fingerprint(links)
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"games": self.games}, f, ensure_ascii=False, indent=4, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
@@ -0,0 +1,123 @@
+"""Fila de unidades de trabalho compartilhada entre processos, em SQLite.
+
+Cada unidade (por exemplo, um intervalo de páginas de uma categoria) é
+reivindicada por um worker com um lease. Enquanto trabalha, o worker renova
+o lease; se o processo morrer, o lease expira e outro worker retoma a
+unidade. O arquivo pode ficar em um volume compartilhado entre máquinas,
+por isso o journal padrão (rollback) é usado em vez de WAL, que depende de
+memória compartilhada local.
+"""
+import json
+import os
+import socket
+import sqlite3
+import time
+
+DEFAULT_LEASE_SECONDS = 600
+MAX_ATTEMPTS = 5  # Unidades que falham mais que isso ficam como "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    updated_at REAL
+)
+"""
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkUnit:
+    __slots__ = ("id", "kind", "payload", "attempts")
+
+    def __init__(self, id, kind, payload, attempts):
+        self.id = id
+        self.kind = kind
+        self.payload = payload
+        self.attempts = attempts
+
+
+class WorkQueue:
+    def __init__(self, path, timeout=60):
+        self.path = path
+        # isolation_level=None: as transações são controladas explicitamente com BEGIN IMMEDIATE
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.connection.execute(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def add(self, kind, payload):
+        """Enfileira uma unidade; unidades com o mesmo payload são ignoradas. Retorna True se nova."""
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO units (kind, payload, updated_at) VALUES (?, ?, ?)",
+            (kind, json.dumps(payload, sort_keys=True), time.time()))
+        return cursor.rowcount == 1
+
+    def claim(self, owner, kind=None, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Reivindica a próxima unidade pendente (ou com lease expirado). Retorna None se não houver."""
+        now = time.time()
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.connection.execute(
+                "SELECT id, kind, payload, attempts FROM units "
+                "WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?)) "
+                "AND (? IS NULL OR kind = ?) ORDER BY id LIMIT 1",
+                (now, kind, kind)).fetchone()
+            if row is None:
+                self.connection.execute("COMMIT")
+                return None
+            unit_id, unit_kind, payload, attempts = row
+            if attempts >= MAX_ATTEMPTS:
+                self.connection.execute(
+                    "UPDATE units SET state = 'failed', owner = NULL, updated_at = ? WHERE id = ?", (now, unit_id))
+                self.connection.execute("COMMIT")
+                return self.claim(owner, kind, lease_seconds)
+            self.connection.execute(
+                "UPDATE units SET state = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?", (owner, now + lease_seconds, now, unit_id))
+            self.connection.execute("COMMIT")
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        return WorkUnit(unit_id, unit_kind, json.loads(payload), attempts + 1)
+
+    def renew(self, unit_id, owner, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Estende o lease. Retorna False se a unidade já foi retomada por outro worker."""
+        cursor = self.connection.execute(
+            "UPDATE units SET lease_expires = ?, updated_at = ? WHERE id = ? AND owner = ? AND state = 'leased'",
+            (time.time() + lease_seconds, time.time(), unit_id, owner))
+        return cursor.rowcount == 1
+
+    def complete(self, unit_id, owner, result=None):
+        cursor = self.connection.execute(
+            "UPDATE units SET state = 'done', result = ?, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND owner = ? AND state = 'leased'",
+            (json.dumps(result), time.time(), unit_id, owner))
+        return cursor.rowcount == 1
+
+    def release(self, unit_id, owner):
+        """Devolve a unidade para a fila (falha recuperável)."""
+        self.connection.execute(
+            "UPDATE units SET state = 'pending', owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND owner = ? AND state = 'leased'", (time.time(), unit_id, owner))
+
+    def clear(self, kind=None):
+        """Apaga as unidades (e os resultados) para um novo ciclo; payloads iguais voltam a ser aceitos."""
+        self.connection.execute("DELETE FROM units WHERE ? IS NULL OR kind = ?", (kind, kind))
+
+    def counts(self):
+        return dict(self.connection.execute("SELECT state, COUNT(*) FROM units GROUP BY state").fetchall())
+
+    def results(self, kind=None):
+        rows = self.connection.execute(
+            "SELECT result FROM units WHERE state = 'done' AND (? IS NULL OR kind = ?) ORDER BY id", (kind, kind))
+        return [json.loads(result) for (result,) in rows if result is not None]